@@ -0,0 +1,98 @@
+"""Микробенчмарк разбора страниц каталога: словари против записей.
+
+Запуск:
+    python -m benchmarks.parsing --products 100000
+    python -m benchmarks.parsing --products 100000 --repeat 5 --json out.json
+
+Сравнивает `GoldParser.parse_product` (словарь на товар) с пакетным
+`GoldParser.parse_page` (компактные `ProductRecord`): время разбора
+страницы и память на товар, пока весь каталог удерживается в памяти.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from .stand import PAGE_SIZE, StandServer
+from scraper.parser import GoldParser
+
+Parser = Callable[[list[dict[str, Any]]], list[Any]]
+
+PARSERS: dict[str, Parser] = {
+    "parse_product": lambda raw_page: [
+        GoldParser.parse_product(raw) for raw in raw_page
+    ],
+    "parse_page": GoldParser.parse_page,
+}
+
+
+def make_pages(products: int, page_size: int) -> list[list[dict[str, Any]]]:
+    """Страницы каталога в формате API стенда."""
+    with StandServer(products=products, latency=0) as stand:
+        raw: list[dict[str, Any]] = [stand.product(i) for i in range(products)]
+    return [raw[i : i + page_size] for i in range(0, products, page_size)]
+
+
+def time_per_page(
+    parse: Parser, pages: list[list[dict[str, Any]]], repeat: int
+) -> float:
+    """Лучшее из `repeat` среднее время разбора страницы, мкс."""
+    best: float = float("inf")
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        for raw_page in pages:
+            parse(raw_page)
+        best = min(best, time.perf_counter() - started)
+    return best / len(pages) * 1e6
+
+
+def bytes_per_product(
+    parse: Parser, pages: list[list[dict[str, Any]]], products: int
+) -> float:
+    """Память, удерживаемая разобранным каталогом, байт на товар."""
+    gc.collect()
+    tracemalloc.start()
+    parsed: list[list[Any]] = [parse(raw_page) for raw_page in pages]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return size / products
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк разбора каталога")
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    pages = make_pages(args.products, args.page_size)
+    results: list[dict[str, Any]] = [
+        {
+            "parser": name,
+            "us_per_page": time_per_page(parse, pages, args.repeat),
+            "bytes_per_product": bytes_per_product(
+                parse, pages, args.products
+            ),
+        }
+        for name, parse in PARSERS.items()
+    ]
+
+    print(f"товаров: {args.products}, на странице: {args.page_size}")
+    print(f"{'парсер':<15}{'мкс/страница':>14}{'байт/товар':>12}")
+    for result in results:
+        print(
+            f"{result['parser']:<15}{result['us_per_page']:>14.1f}"
+            f"{result['bytes_per_product']:>12.0f}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
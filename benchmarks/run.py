@@ -0,0 +1,150 @@
+"""Замер пропускной способности GoldScraper на локальном стенде.
+
+Запуск:
+    python -m benchmarks.run --products 480 --latency 0.05
+    python -m benchmarks.run --details api --card-missing-rate 0.2
+
+Каждая стратегия запускается в отдельном процессе против общего
+стенда; результаты выводятся таблицей и при необходимости в JSON.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any
+
+from .stand import StandServer
+
+STRATEGIES: tuple[str, ...] = ("standard", "proxy", "scraperapi", "fallback")
+
+
+def run_scenario(
+    stand: StandServer, strategy: str, args: argparse.Namespace
+) -> dict[str, Any]:
+    """Запускает сценарий в дочернем процессе и читает его результат."""
+    env: dict[str, str] = {
+        **os.environ,
+        "GOLD_APPLE_SITE_URL": stand.url,
+        "SCRAPER_API_URL": f"{stand.url}/scraperapi",
+        "SCRAPER_API_KEY": os.environ.get("SCRAPER_API_KEY", "bench"),
+    }
+    command: list[str] = [
+        sys.executable,
+        "-m",
+        "benchmarks.scenario",
+        "--strategy",
+        strategy,
+        "--details",
+        args.details,
+        "--workers",
+        str(args.workers),
+        "--page-workers",
+        str(args.page_workers),
+        "--rps",
+        str(args.rps),
+    ]
+    completed = subprocess.run(
+        command, env=env, capture_output=True, text=True, check=False
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Сценарий {strategy} завершился с ошибкой:\n{completed.stderr}"
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def format_stage(result: dict[str, Any], stage: str) -> str:
+    stats = result["stages"].get(stage)
+    if not stats:
+        return "-"
+    return f"{stats['p50_ms']:.0f}/{stats['p99_ms']:.0f}"
+
+
+def print_table(results: list[dict[str, Any]]) -> None:
+    columns: tuple[str, ...] = (
+        "стратегия",
+        "товаров",
+        "товаров/с",
+        "catalog p50/p99",
+        "card p50/p99",
+        "browser p50/p99",
+        "write p50/p99",
+        "RSS МБ (py/браузер)",
+    )
+    rows: list[tuple[str, ...]] = [
+        (
+            result["strategy"],
+            str(result["products"]),
+            f"{result['products_per_sec']:.1f}",
+            format_stage(result, "catalog"),
+            format_stage(result, "card"),
+            format_stage(result, "browser"),
+            format_stage(result, "write"),
+            (
+                f"{result['peak_rss_mb']['self']:.0f}/"
+                f"{result['peak_rss_mb']['children']:.0f}"
+            ),
+        )
+        for result in results
+    ]
+    widths: list[int] = [
+        max(len(row[i]) for row in [columns, *rows])
+        for i in range(len(columns))
+    ]
+    for row in [columns, *rows]:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк GoldScraper")
+    parser.add_argument("--products", type=int, default=240)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Средняя задержка ответа стенда, с",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--card-missing-rate",
+        type=float,
+        default=0.0,
+        help="Доля карточек без деталей (уходят в браузер)",
+    )
+    parser.add_argument(
+        "--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES
+    )
+    parser.add_argument(
+        "--details",
+        choices=["api", "browser", "api-only"],
+        default="api-only",
+        help="Режим деталей; api и browser требуют установленный Chromium",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--page-workers", type=int, default=4)
+    parser.add_argument(
+        "--rps", type=float, default=0, help="Лимит запросов/с, 0 - без"
+    )
+    parser.add_argument("--json", help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    with StandServer(
+        products=args.products,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        card_missing_rate=args.card_missing_rate,
+    ) as stand:
+        results: list[dict[str, Any]] = [
+            run_scenario(stand, strategy, args) for strategy in args.strategies
+        ]
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
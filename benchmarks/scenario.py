@@ -0,0 +1,210 @@
+"""Один замер GoldScraper против стенда; запускается из benchmarks.run.
+
+Адреса стенда передаются через переменные окружения
+GOLD_APPLE_SITE_URL и SCRAPER_API_URL, поэтому каждый сценарий
+выполняется в отдельном процессе со своей конфигурацией и RSS.
+"""
+
+import argparse
+import json
+import logging
+import resource
+import statistics
+import tempfile
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+from playwright.async_api import Page as AsyncPage
+
+from scraper.core.async_strategies import (
+    AsyncProxyScraper,
+    AsyncScraperAPIScraper,
+    AsyncStandardScraper,
+)
+from scraper.core.config import SITE_URL
+from scraper.core.headers_manager import HeadersManager
+from scraper.core.proxy_manager import ProxyManager
+from scraper.core.session import SessionStore
+from scraper.core.strategies import (
+    BaseScraper,
+    FallbackScraper,
+    ProxyScraper,
+    ScraperAPIScraper,
+    StandardScraper,
+)
+from scraper.parser import GoldParser
+from scraper.pipeline import CrawlPipeline
+from scraper.scraper import GoldScraper
+from scraper.utils.journal import Journal
+from scraper.utils.writer import CSVWriter
+
+STAGES: tuple[str, ...] = ("catalog", "card", "browser", "write")
+
+
+class StageTimer:
+    """Потокобезопасный сбор длительностей по стадиям."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """p50/p99 в миллисекундах и число замеров по стадиям."""
+        result: dict[str, dict[str, float]] = {}
+        for stage, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered: list[float] = sorted(samples)
+            result[stage] = {
+                "count": len(ordered),
+                "p50_ms": statistics.median(ordered) * 1000,
+                "p99_ms": ordered[int(0.99 * (len(ordered) - 1))] * 1000,
+            }
+        return result
+
+
+class TimedScraper(BaseScraper):
+    """Стратегия-обёртка, замеряющая запросы каталога и карточек."""
+
+    def __init__(self, strategy: BaseScraper, timer: StageTimer) -> None:
+        super().__init__()
+        self.strategy = strategy
+        self.timer = timer
+
+    def request(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> Optional[httpx.Response]:
+        started: float = time.perf_counter()
+        try:
+            return self.strategy.request(url, headers, cookies)
+        finally:
+            stage: str = "card" if "product-card" in url else "catalog"
+            self.timer.add(stage, time.perf_counter() - started)
+
+
+class TimedWriter(CSVWriter):
+    """CSVWriter, замеряющий запись каждой строки."""
+
+    def __init__(self, filename: str, timer: StageTimer) -> None:
+        super().__init__(filename)
+        self.timer = timer
+
+    def append(self, product: dict[str, str]) -> None:
+        started: float = time.perf_counter()
+        super().append(product)
+        self.timer.add("write", time.perf_counter() - started)
+
+
+def stand_proxy_manager() -> ProxyManager:
+    manager = ProxyManager()
+    manager.proxies = [urllib.parse.urlsplit(SITE_URL).netloc]
+    return manager
+
+
+def build_strategy(name: str) -> BaseScraper:
+    if name == "proxy":
+        return ProxyScraper(proxy_manager=stand_proxy_manager())
+    if name == "scraperapi":
+        return ScraperAPIScraper()
+    if name == "fallback":
+        return FallbackScraper(
+            [
+                AsyncStandardScraper(),
+                AsyncProxyScraper(stand_proxy_manager()),
+                AsyncScraperAPIScraper(),
+            ]
+        )
+    return StandardScraper()
+
+
+def time_browser_stage(scraper: GoldScraper, timer: StageTimer) -> None:
+    """Оборачивает получение деталей через браузер замером времени."""
+    fetch_details = scraper.fetch_product_details_async
+
+    async def timed(product_url: str, page: AsyncPage) -> dict[str, str]:
+        started: float = time.perf_counter()
+        try:
+            return await fetch_details(product_url, page)
+        finally:
+            timer.add("browser", time.perf_counter() - started)
+
+    scraper.fetch_product_details_async = timed  # type: ignore[method-assign]
+
+
+def peak_rss_mb() -> dict[str, float]:
+    """Пиковый RSS процесса и дочерних процессов (браузера) в МБ."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {"self": own / 1024, "children": children / 1024}
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    timer = StageTimer()
+    workdir = Path(tempfile.mkdtemp(prefix="goldscraper-bench-"))
+    headers_manager = HeadersManager(
+        session_store=SessionStore(str(workdir / "session.json")),
+        launch_browser=False,
+    )
+    headers_manager.set_cookies({"stand_session": "1"})
+    scraper = GoldScraper(
+        strategy=TimedScraper(build_strategy(args.strategy), timer),
+        category_id="bench",
+        city_id="bench",
+        max_pages=None,
+        requests_per_second=args.rps,
+        page_workers=args.page_workers,
+        headers_manager=headers_manager,
+    )
+    time_browser_stage(scraper, timer)
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        TimedWriter(str(workdir / "products.csv"), timer),
+        details=args.details,
+        workers=args.workers,
+        journal=Journal(str(workdir / "journal.jsonl")),
+    )
+
+    started: float = time.perf_counter()
+    written: int = pipeline.run()
+    elapsed: float = time.perf_counter() - started
+    return {
+        "strategy": args.strategy,
+        "details": args.details,
+        "products": written,
+        "seconds": elapsed,
+        "products_per_sec": written / elapsed if elapsed else 0.0,
+        "stages": timer.summary(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сценарий замера")
+    parser.add_argument(
+        "--strategy",
+        choices=["standard", "proxy", "scraperapi", "fallback"],
+        default="standard",
+    )
+    parser.add_argument(
+        "--details", choices=["api", "browser", "api-only"], default="api-only"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--page-workers", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(json.dumps(run(args), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+__all__ = ["StandServer"]
+
+PAGE_SIZE: int = 24
+COUNTRIES: tuple[str, ...] = ("Франция", "Италия", "Испания", "ОАЭ")
+
+PRODUCT_HTML: str = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{name}</title></head>
+<body>
+<img src="/static/{item_id}.jpg">
+<div class="bOhy3">
+  <button class="ga-tabs-tab" data-panel="0">описание</button>
+  <button class="ga-tabs-tab" data-panel="1">применение</button>
+  <button class="ga-tabs-tab" data-panel="2">Дополнительная информация</button>
+  <div class="kDcPG">{description}</div>
+</div>
+<script>
+const panels = {panels};
+document.querySelectorAll("button.ga-tabs-tab").forEach((button) => {{
+  button.addEventListener("click", () => {{
+    setTimeout(() => {{
+      document.querySelector("div.kDcPG").innerText =
+        panels[button.dataset.panel];
+    }}, {tab_delay});
+  }});
+}});
+</script>
+</body></html>
+"""
+
+
+class StandServer:
+    """Локальная замена Gold Apple для нагрузочных замеров.
+
+    Отдаёт страницы каталога, карточки товаров и HTML-страницы с той же
+    структурой вкладок (`ga-tabs-tab`/`kDcPG`), что и настоящий сайт.
+    Умеет работать как HTTP-прокси и как эмулятор ScraperAPI.
+    """
+
+    def __init__(
+        self,
+        products: int = 240,
+        latency: float = 0.05,
+        error_rate: float = 0.0,
+        card_missing_rate: float = 0.0,
+        tab_delay_ms: int = 50,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.products: int = products
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.card_missing_rate: float = card_missing_rate
+        self.tab_delay_ms: int = tab_delay_ms
+        self.random = random.Random(seed)
+        self.requests: int = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def item_id(self, index: int) -> str:
+        return str(19000000 + index)
+
+    def product(self, index: int) -> dict[str, Any]:
+        """Товар в формате ответа `/front/api/catalog/products`."""
+        item_id: str = self.item_id(index)
+        return {
+            "itemId": item_id,
+            "url": f"/{item_id}-stand-product-{index}",
+            "brand": f"Brand {index % 17}",
+            "name": f"Parfum {index}",
+            "price": {"actual": {"amount": 1000 + index * 7 % 9000}},
+            "reviews": {"rating": round(3 + index % 20 / 10, 1)},
+            "productType": "парфюмерная вода",
+        }
+
+    def usage(self, index: int) -> str:
+        return f"Нанести на запястья. Товар {index}."
+
+    def country(self, index: int) -> str:
+        return COUNTRIES[index % len(COUNTRIES)]
+
+    def catalog_page(self, page: int) -> dict[str, Any]:
+        start: int = (page - 1) * PAGE_SIZE
+        stop: int = min(start + PAGE_SIZE, self.products)
+        return {
+            "data": {
+                "count": self.products,
+                "products": [self.product(i) for i in range(start, stop)],
+            }
+        }
+
+    def product_card(self, index: int) -> dict[str, Any]:
+        if self.random.random() < self.card_missing_rate:
+            return {"data": {"productDescription": []}}
+        return {
+            "data": {
+                "productDescription": [
+                    {"text": "описание", "content": "парфюмерная вода"},
+                    {"text": "применение", "content": self.usage(index)},
+                    {
+                        "text": "Дополнительная информация",
+                        "attributes": [
+                            {
+                                "name": "страна происхождения",
+                                "value": self.country(index),
+                            }
+                        ],
+                    },
+                ]
+            }
+        }
+
+    def product_html(self, index: int) -> str:
+        panels: list[str] = [
+            "парфюмерная вода",
+            self.usage(index),
+            (
+                f"страна происхождения\n{self.country(index)}\n"
+                "изготовитель\nStand Parfums"
+            ),
+        ]
+        return PRODUCT_HTML.format(
+            name=f"Parfum {index}",
+            item_id=self.item_id(index),
+            description=panels[0],
+            panels=json.dumps(panels, ensure_ascii=False),
+            tab_delay=self.tab_delay_ms,
+        )
+
+    def index_from_path(self, path: str) -> Optional[int]:
+        slug: str = path.strip("/").split("-", 1)[0]
+        if not slug.isdigit():
+            return None
+        index: int = int(slug) - 19000000
+        return index if 0 <= index < self.products else None
+
+    def respond(self, target: str) -> tuple[int, str, bytes]:
+        """Формирует ответ (код, тип, тело) на путь запроса."""
+        parts = urllib.parse.urlsplit(target)
+        query: dict[str, str] = dict(urllib.parse.parse_qsl(parts.query))
+        path: str = parts.path
+
+        if path == "/scraperapi":
+            return self.respond(query.get("url", "/"))
+        if path == "/front/api/catalog/products":
+            page: int = int(query.get("pageNumber", "1"))
+            return self._json(self.catalog_page(page))
+        if path == "/front/api/catalog/product-card/base":
+            index = self.index_from_path(query.get("itemId", ""))
+            if index is None:
+                return 404, "application/json", b"{}"
+            return self._json(self.product_card(index))
+        if path == "/parfjumerija":
+            return 200, "text/html; charset=utf-8", b"<html>ok</html>"
+        if path.startswith("/static/"):
+            return 200, "image/jpeg", b"\xff\xd8" + b"\0" * 2048
+        index = self.index_from_path(path)
+        if index is None:
+            return 404, "text/plain", b"not found"
+        html: str = self.product_html(index)
+        return 200, "text/html; charset=utf-8", html.encode("utf-8")
+
+    @staticmethod
+    def _json(payload: dict[str, Any]) -> tuple[int, str, bytes]:
+        body: bytes = json.dumps(payload, ensure_ascii=False).encode()
+        return 200, "application/json", body
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stand = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                with stand._lock:
+                    stand.requests += 1
+                    failed: bool = stand.random.random() < stand.error_rate
+                if stand.latency:
+                    time.sleep(stand.random.expovariate(1 / stand.latency))
+                if failed:
+                    status, content_type, body = 503, "text/plain", b"busy"
+                else:
+                    status, content_type, body = stand.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Set-Cookie", "stand_session=1; Path=/")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальная замена Gold Apple")
+    parser.add_argument("--products", type=int, default=240)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--card-missing-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    stand = StandServer(
+        products=args.products,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        card_missing_rate=args.card_missing_rate,
+        port=args.port,
+    )
+    print(f"Стенд запущен: {stand.url}")
+    stand.serve_forever()
@@ -1,18 +1,51 @@
 import argparse
 import logging
+import os
+import time
+from contextlib import nullcontext
+from typing import Optional
 
-from playwright.sync_api import Page
-from tqdm import tqdm
-
-from scraper.core.browser import BrowserManager
+from scraper.browser_pool import BrowserPool, BrowserPoolSettings
+from scraper.core.browser import RequestBlocker
+from scraper.core.cache import CachedScraper
+from scraper.core.config import (
+    BROWSER_POOL_MAX_NAVIGATIONS,
+    BROWSER_POOL_MAX_RSS_MB,
+    DEFAULT_CATEGORY_ID,
+    DEFAULT_CITY_ID,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_WORKERS,
+    PARQUET_COMPRESSION,
+    PROFILE_DIR,
+    PROFILE_SLOW_SECONDS,
+    PROFILE_TRACE_SAMPLE,
+    SCRAPER_API_RENDER,
+    SNAPSHOT_DB_FILE,
+    STATE_MAX_AGE_DAYS,
+)
+from scraper.core.headers_manager import HeadersManager
+from scraper.core.metrics import metrics
 from scraper.core.strategies import (
-    ProxyScraper,
+    STRATEGY_NAMES,
+    BaseScraper,
+    FallbackScraper,
     ScraperAPIScraper,
-    StandardScraper,
+    build_strategy,
+)
+from scraper.jobs import (
+    CrawlJob,
+    JobScheduler,
+    JobSettings,
+    load_jobs,
+    parse_job,
 )
 from scraper.parser import GoldParser
+from scraper.pipeline import CrawlPipeline
+from scraper.profiling import Profiler
 from scraper.scraper import GoldScraper
-from scraper.utils.writer import CSVWriter
+from scraper.snapshots import SnapshotExtractor, SnapshotStore
+from scraper.utils.state import ProductStateStore
+from scraper.utils.writer import build_writer
 
 
 def setup_logging(verbose: bool) -> None:
@@ -24,19 +57,52 @@ def setup_logging(verbose: bool) -> None:
     )
 
 
+def pages_type(value: str) -> Optional[int]:
+    """Число страниц каталога или `all` для всего каталога."""
+    if value == "all":
+        return None
+    pages: int = int(value)
+    if pages < 1:
+        raise argparse.ArgumentTypeError("Число страниц должно быть >= 1")
+    return pages
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Gold Apple Scraper")
     parser.add_argument(
         "--scraper",
-        choices=["standard", "proxy", "scraperapi"],
+        choices=STRATEGY_NAMES,
         default="standard",
-        help="Тип скрапера (standard, proxy, scraperapi)",
+        help=(
+            "Тип скрапера (standard, proxy, scraperapi или fallback - "
+            "цепочка из всех трёх с хедж-запросами)"
+        ),
+    )
+    parser.add_argument(
+        "--render",
+        choices=["auto", "always", "never"],
+        default=SCRAPER_API_RENDER,
+        help=(
+            "JS-рендеринг в ScraperAPI: auto - только для HTML-страниц, "
+            "always - всегда, never - никогда"
+        ),
     )
     parser.add_argument(
         "--pages",
-        type=int,
+        type=pages_type,
         default=5,
-        help="Количество страниц для парсинга",
+        help="Количество страниц для парсинга или all для всего каталога",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=DEFAULT_REQUESTS_PER_SECOND,
+        help="Ограничение запросов к API в секунду",
+    )
+    parser.add_argument(
+        "--stop-early",
+        action="store_true",
+        help="Остановить обход на странице только из известных товаров",
     )
     parser.add_argument(
         "--limit",
@@ -44,6 +110,163 @@ def main() -> None:
         default=None,
         help="Ограничение на количество товаров для парсинга",
     )
+    parser.add_argument(
+        "--details",
+        choices=["api", "browser", "api-only"],
+        default="api",
+        help=(
+            "Источник деталей: карточка API с запасным браузером, "
+            "только браузер или только API"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Количество параллельных страниц браузера для деталей",
+    )
+    parser.add_argument(
+        "--browser-processes",
+        type=int,
+        default=0,
+        help=(
+            "Число процессов с собственным браузером для деталей; "
+            "0 - страницы --workers в одном браузере"
+        ),
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=BROWSER_POOL_MAX_NAVIGATIONS,
+        help="Пересоздавать контекст браузера процесса через N переходов",
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=BROWSER_POOL_MAX_RSS_MB,
+        help="Перезапускать браузер процесса при превышении памяти, МБ",
+    )
+    parser.add_argument(
+        "--no-block",
+        action="store_true",
+        help="Не блокировать картинки, шрифты и трекеры в браузере",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Кешировать ответы API на диске между запусками",
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=float,
+        default=STATE_MAX_AGE_DAYS,
+        help="Через сколько дней обновлять детали неизменившегося товара",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Запросить детали всех товаров, игнорируя сохранённое состояние",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Продолжить сбор, пропуская товары из журнала прошлого запуска",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet", "sqlite"],
+        default="csv",
+        help=(
+            "Формат вывода: csv, parquet (типизированные колонки) или "
+            "sqlite (накопительная база с историей цен)"
+        ),
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["zstd", "snappy", "gzip", "none"],
+        default=PARQUET_COMPRESSION,
+        help="Сжатие Parquet",
+    )
+    parser.add_argument(
+        "--jobs",
+        help=(
+            "JSON-файл со списком заданий (category_id, city_id, pages) "
+            "для запуска в пуле процессов"
+        ),
+    )
+    parser.add_argument(
+        "--job",
+        action="append",
+        default=[],
+        metavar="КАТЕГОРИЯ[:ГОРОД]",
+        help="Задание категория/город; можно указать несколько раз",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Число процессов для заданий. По умолчанию: число ядер",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        default=".",
+        help=(
+            "Каталог для metrics.prom (Prometheus textfile) и "
+            "metrics.json; в режиме заданий - по файлу на задание"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Профилировать запуск: cProfile и трассы Playwright страниц "
+            "товаров в отдельном каталоге"
+        ),
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=PROFILE_DIR,
+        help="Каталог для результатов профилирования",
+    )
+    parser.add_argument(
+        "--trace-sample",
+        type=float,
+        default=PROFILE_TRACE_SAMPLE,
+        help="Доля страниц товаров, трасса которых сохраняется",
+    )
+    parser.add_argument(
+        "--trace-slow",
+        type=float,
+        default=PROFILE_SLOW_SECONDS,
+        help="Сохранять трассы всех страниц медленнее стольких секунд",
+    )
+    parser.add_argument(
+        "--snapshots",
+        action="store_true",
+        help=(
+            "Браузер только сохраняет сжатые снимки страниц товаров, "
+            "детали извлекаются из них в пуле процессов"
+        ),
+    )
+    parser.add_argument(
+        "--snapshot-file",
+        default=SNAPSHOT_DB_FILE,
+        help="База снимков страниц товаров",
+    )
+    parser.add_argument(
+        "--reextract",
+        action="store_true",
+        help=(
+            "Без обхода сайта заново извлечь детали из сохранённых "
+            "снимков и записать вывод"
+        ),
+    )
+    parser.add_argument(
+        "--extract-processes",
+        type=int,
+        default=None,
+        help="Число процессов извлечения из снимков. По умолчанию: число ядер",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -53,45 +276,159 @@ def main() -> None:
 
     setup_logging(args.verbose)
     logging.info("Запуск программы")
+    jobs: list[CrawlJob] = collect_jobs(args)
+    if jobs and (args.snapshots or args.reextract):
+        parser.error("--snapshots и --reextract не работают с заданиями")
+    if args.browser_processes and (jobs or args.snapshots):
+        parser.error(
+            "--browser-processes не работает с заданиями и --snapshots"
+        )
+    if args.snapshots and args.details == "api-only":
+        parser.error("--snapshots требует браузера: --details api|browser")
+    if args.reextract:
+        run_reextract(args)
+    elif jobs:
+        run_jobs(args, jobs)
+    else:
+        profiler: Optional[Profiler] = None
+        if args.profile:
+            profiler = Profiler(
+                profile_run_dir(args), args.trace_sample, args.trace_slow
+            )
+        with profiler or nullcontext():
+            run_single(args, profiler)
+    logging.info("Программа завершена")
+
 
-    strategy_map = {
-        "standard": StandardScraper,
-        "proxy": ProxyScraper,
-        "scraperapi": ScraperAPIScraper,
-    }
-    strategy = strategy_map[args.scraper]
+def build_blocker(args: argparse.Namespace) -> RequestBlocker:
+    if args.no_block:
+        return RequestBlocker(resource_types=(), blocked_domains=())
+    return RequestBlocker()
+
+
+def profile_run_dir(args: argparse.Namespace) -> str:
+    """Каталог результатов профилирования текущего запуска."""
+    return os.path.join(args.profile_dir, time.strftime("%Y%m%d-%H%M%S"))
+
+
+def collect_jobs(args: argparse.Namespace) -> list[CrawlJob]:
+    """Задания из файла --jobs и аргументов --job."""
+    jobs: list[CrawlJob] = []
+    if args.jobs:
+        jobs.extend(load_jobs(args.jobs, args.pages))
+    jobs.extend(parse_job(value, args.pages) for value in args.job)
+    return jobs
+
+
+def run_jobs(args: argparse.Namespace, jobs: list[CrawlJob]) -> None:
+    """Выполняет несколько заданий в пуле процессов."""
+    settings = JobSettings(
+        scraper=args.scraper,
+        render=args.render,
+        details=args.details,
+        workers=args.workers,
+        requests_per_second=args.rps,
+        limit=args.limit,
+        cache=args.cache,
+        max_age_days=0 if args.full else args.max_age_days,
+        block=not args.no_block,
+        resume=args.resume,
+        stop_early=args.stop_early,
+        metrics_dir=args.metrics_dir,
+        profile_dir=profile_run_dir(args) if args.profile else None,
+        trace_sample=args.trace_sample,
+        trace_slow=args.trace_slow,
+    )
+    writer = build_writer(args.format, args.compression)
+    logging.info(f"Заданий: {len(jobs)}, общий вывод в {writer.filename}")
+    JobScheduler(jobs, settings, writer, args.processes).run()
+
+
+def build_pool(args: argparse.Namespace) -> BrowserPool:
+    """Пул процессов браузера по аргументам командной строки."""
+    return BrowserPool(
+        args.browser_processes,
+        BrowserPoolSettings(
+            block=not args.no_block,
+            max_navigations=args.recycle_after,
+            max_rss_mb=args.max_rss_mb,
+        ),
+    )
+
+
+def build_snapshots(args: argparse.Namespace) -> SnapshotExtractor:
+    return SnapshotExtractor(
+        SnapshotStore(args.snapshot_file), args.extract_processes
+    )
+
+
+def run_reextract(args: argparse.Namespace) -> None:
+    """Извлекает детали из сохранённых снимков без обхода сайта."""
+    writer = build_writer(args.format, args.compression)
+    logging.info(
+        f"Повторное извлечение из {args.snapshot_file} в {writer.filename}"
+    )
+    try:
+        with build_snapshots(args) as snapshots:
+            written: int = snapshots.reextract(writer)
+    finally:
+        metrics.export(args.metrics_dir)
+    logging.info(f"Записано товаров: {written}")
+
+
+def run_single(
+    args: argparse.Namespace, profiler: Optional[Profiler] = None
+) -> None:
+    """Выполняет одно задание в текущем процессе."""
+    base_strategy: BaseScraper = build_strategy(args.scraper, args.render)
+    strategy: BaseScraper = base_strategy
+    if args.cache:
+        strategy = CachedScraper(base_strategy)
     scraper = GoldScraper(
-        strategy=strategy(),
-        category_id="1000000007",
-        city_id="0c5b2444-70a0-4932-980c-b4dc0d3f02b5",
+        strategy=strategy,
+        category_id=DEFAULT_CATEGORY_ID,
+        city_id=DEFAULT_CITY_ID,
         max_pages=args.pages,
+        requests_per_second=args.rps,
+        headers_manager=HeadersManager(launch_browser=False),
+        stop_early=args.stop_early,
     )
     gold_parser = GoldParser()
-    writer = CSVWriter()
+    writer = build_writer(args.format, args.compression)
 
-    with BrowserManager() as browser:
-        logging.info("Сбор списка товаров")
-        raw_products: list[dict] = scraper.fetch_products()
-        products_to_parse = (
-            raw_products[: args.limit] if args.limit else raw_products
-        )
-        logging.info(f"Парсинг {len(products_to_parse)} товаров")
-
-        parsed_products: list[dict] = [
-            gold_parser.parse_product(p) for p in products_to_parse
-        ]
-        page: Page = browser.new_page()
-        for product in tqdm(parsed_products, desc="Парсинг деталей товаров"):
-            details: dict[str, str] = scraper.fetch_product_details(
-                product["link"],
-                page,
-            )
-            product.update(details)
-        page.close()
-
-    logging.info("Запись данных в CSV")
-    writer.write(parsed_products)
-    logging.info("Программа завершена")
+    state = ProductStateStore(
+        max_age_days=0 if args.full else args.max_age_days
+    )
+    snapshots: Optional[SnapshotExtractor] = (
+        build_snapshots(args) if args.snapshots else None
+    )
+    pipeline = CrawlPipeline(
+        scraper,
+        gold_parser,
+        writer,
+        details=args.details,
+        workers=args.workers,
+        limit=args.limit,
+        resume=args.resume,
+        blocker=build_blocker(args),
+        state=state,
+        profiler=profiler,
+        snapshots=snapshots,
+        pool=build_pool(args) if args.browser_processes else None,
+    )
+    logging.info(
+        f"Сбор товаров с записью в {writer.filename} по мере готовности"
+    )
+    try:
+        with state, snapshots or nullcontext():
+            written: int = pipeline.run()
+    finally:
+        metrics.export(args.metrics_dir)
+    logging.info(f"Записано товаров: {written}")
+    if isinstance(strategy, CachedScraper):
+        strategy.log_stats()
+    if isinstance(base_strategy, (FallbackScraper, ScraperAPIScraper)):
+        base_strategy.log_stats()
 
 
 if __name__ == "__main__":
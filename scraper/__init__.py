@@ -1,2 +1,10 @@
+from .browser_pool import *
+from .details import *
+from .extraction import *
+from .jobs import *
 from .parser import *
+from .pipeline import *
+from .profiling import *
+from .record import *
 from .scraper import *
+from .snapshots import *
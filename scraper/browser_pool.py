@@ -0,0 +1,428 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from multiprocessing.context import SpawnProcess
+from typing import Any, Callable, NamedTuple, Optional
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from .core.browser import BrowserManager, RequestBlocker
+from .core.config import (
+    BROWSER_POOL_MAX_ATTEMPTS,
+    BROWSER_POOL_MAX_NAVIGATIONS,
+    BROWSER_POOL_MAX_RSS_MB,
+    BROWSER_POOL_POLL_SECONDS,
+    BROWSER_POOL_STOP_TIMEOUT,
+    PRODUCT_READY_TIMEOUT_MS,
+)
+from .core.metrics import metrics
+from .core.session import SessionStore
+from .extraction import DetailExtractor, merge_details
+
+__all__ = ["BrowserPool", "BrowserPoolSettings", "tree_rss"]
+
+# Сообщения воркеров в общую очередь результатов.
+DONE: str = "done"
+CRASHED: str = "crashed"
+RECYCLED: str = "recycled"
+
+STOP: str = "stop"
+RESTART: str = "restart"
+CONTEXT: str = "context"
+
+
+class BrowserPoolSettings(NamedTuple):
+    """Настройки процессов пула, передаваемые при их запуске."""
+
+    headless: bool = True
+    block: bool = True
+    max_navigations: int = BROWSER_POOL_MAX_NAVIGATIONS
+    max_rss_mb: float = BROWSER_POOL_MAX_RSS_MB
+    session_store: SessionStore = SessionStore()
+
+
+def tree_rss(pid: int) -> Optional[int]:
+    """RSS процесса и всех его потомков в байтах или None вне Linux.
+
+    Chromium и драйвер Playwright - дочерние процессы воркера, поэтому
+    память считается по всему дереву процессов из /proc.
+    """
+    try:
+        entries: list[str] = os.listdir("/proc")
+    except OSError:
+        return None
+    children: dict[int, list[int]] = {}
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as file:
+                stat: bytes = file.read()
+        except OSError:
+            continue
+        parent: int = int(stat[stat.rindex(b")") + 2 :].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+    page_size: int = os.sysconf("SC_PAGE_SIZE")
+    total: int = 0
+    stack: list[int] = [pid]
+    while stack:
+        current: int = stack.pop()
+        try:
+            with open(f"/proc/{current}/statm", "rb") as file:
+                total += int(file.read().split()[1]) * page_size
+        except OSError:
+            pass
+        stack.extend(children.get(current, ()))
+    return total
+
+
+def browser_worker(
+    worker_id: int,
+    inbox: "multiprocessing.Queue[Any]",
+    results: "multiprocessing.Queue[Any]",
+    settings: BrowserPoolSettings,
+) -> None:
+    """Процесс пула: свой Chromium, товары по одному из `inbox`.
+
+    Таймаут загрузки считается ошибкой товара, любая другая ошибка
+    загрузки или извлечения - падением: товар возвращается родителю,
+    контекст пересоздаётся, а отключившийся браузер перезапускается.
+    Браузер перезапускается и при превышении памяти, контекст - каждые
+    `max_navigations` переходов.
+    """
+    blocker = (
+        RequestBlocker()
+        if settings.block
+        else RequestBlocker(resource_types=(), blocked_domains=())
+    )
+    while True:
+        with BrowserManager(
+            settings.headless, blocker, settings.session_store
+        ) as browser:
+            status: str = _serve(worker_id, browser, inbox, results, settings)
+        if status == STOP:
+            return
+
+
+def _serve(
+    worker_id: int,
+    browser: BrowserManager,
+    inbox: "multiprocessing.Queue[Any]",
+    results: "multiprocessing.Queue[Any]",
+    settings: BrowserPoolSettings,
+) -> str:
+    """Обрабатывает товары в одном запуске браузера."""
+    page = browser.new_page()
+    extractor = DetailExtractor()
+    navigations: int = 0
+    max_rss: float = settings.max_rss_mb * 1024 * 1024
+    while (task := inbox.get()) is not None:
+        token, link = task
+        timings: dict[str, float] = {}
+        started: float = time.perf_counter()
+        try:
+            page.goto(link, timeout=60000, wait_until="domcontentloaded")
+            timings["load_page"] = time.perf_counter() - started
+            started = time.perf_counter()
+            details: dict[str, str] = _extract(page, extractor)
+            timings["extract"] = time.perf_counter() - started
+        except PlaywrightTimeoutError:
+            results.put((DONE, worker_id, token, {}, timings, "Timeout"))
+            continue
+        except Exception as err_msg:
+            restart: bool = not browser.is_connected
+            results.put(
+                (
+                    CRASHED,
+                    worker_id,
+                    token,
+                    str(err_msg),
+                    RESTART if restart else CONTEXT,
+                )
+            )
+            if restart:
+                return RESTART
+            page = _recycle(browser)
+            navigations = 0
+            continue
+        results.put((DONE, worker_id, token, details, timings, None))
+        navigations += 1
+        rss: Optional[int] = tree_rss(os.getpid())
+        if rss is not None and rss > max_rss:
+            results.put((RECYCLED, worker_id, RESTART, rss))
+            return RESTART
+        if navigations >= settings.max_navigations:
+            page = _recycle(browser)
+            navigations = 0
+            results.put((RECYCLED, worker_id, CONTEXT, rss))
+    return STOP
+
+
+def _extract(page: Any, extractor: DetailExtractor) -> dict[str, str]:
+    """Детали товара; если вкладки не появились, поля остаются N/A.
+
+    Остальные ошибки пробрасываются: страница или браузер упали, и товар
+    нужно вернуть в работу, а не записывать с пустыми деталями.
+    """
+    try:
+        page.wait_for_selector(
+            extractor.spec.ready_selector, timeout=PRODUCT_READY_TIMEOUT_MS
+        )
+    except PlaywrightTimeoutError:
+        return extractor.postprocess(None)
+    return extractor.extract(page)
+
+
+def _recycle(browser: BrowserManager) -> Any:
+    """Пересоздаёт контекст браузера и возвращает новую страницу."""
+    browser.recycle_context()
+    return browser.new_page()
+
+
+class _WorkerSlot:
+    """Процесс пула и товар, который он сейчас обрабатывает."""
+
+    __slots__ = ("process", "inbox", "product", "attempts", "token", "done")
+
+    def __init__(
+        self, process: SpawnProcess, inbox: "multiprocessing.Queue[Any]"
+    ) -> None:
+        self.process: SpawnProcess = process
+        self.inbox: "multiprocessing.Queue[Any]" = inbox
+        self.product: Optional[dict[str, str]] = None
+        self.attempts: int = 0
+        self.token: int = 0
+        self.done: int = 0
+
+
+class BrowserPool:
+    """Сбор деталей в пуле процессов, у каждого из которых свой Chromium.
+
+    Товары из очереди конвейера раздаются свободным процессам по одному,
+    поэтому родитель всегда знает, что делает каждый процесс. Если
+    процесс или его браузер падает, товар возвращается в работу (не
+    больше `max_attempts` раз), а процесс перезапускается. Страницы и
+    контексты пересоздаются после `max_navigations` переходов, браузер -
+    при превышении `max_rss_mb` памяти всем деревом процессов.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        settings: BrowserPoolSettings = BrowserPoolSettings(),
+        max_attempts: int = BROWSER_POOL_MAX_ATTEMPTS,
+        worker: Callable[..., None] = browser_worker,
+    ) -> None:
+        self.processes: int = max(1, processes or os.cpu_count() or 1)
+        self.settings: BrowserPoolSettings = settings
+        self.max_attempts: int = max_attempts
+        self.worker: Callable[..., None] = worker
+        self.errors: int = 0
+        self.requeued: int = 0
+        self.restarts: int = 0
+        self.context_resets: int = 0
+        self.recycles: int = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._results: "multiprocessing.Queue[Any]" = self._context.Queue()
+        self._slots: dict[int, _WorkerSlot] = {}
+        self._failures: dict[int, int] = {}
+        self._idle: deque[int] = deque()
+        self._retry: deque[tuple[dict[str, str], int]] = deque()
+        self._tokens: int = 0
+
+    async def run(
+        self,
+        products: asyncio.Queue[Optional[dict[str, str]]],
+        on_done: Callable[[dict[str, str], bool], None],
+    ) -> None:
+        """Обрабатывает товары из очереди до None и останавливает пул.
+
+        `on_done` получает товар и признак того, что детали получены.
+        """
+        logging.info(f"Запуск {self.processes} процессов браузера для деталей")
+        for worker_id in range(self.processes):
+            self._start(worker_id)
+        try:
+            await self._dispatch(products, on_done)
+        finally:
+            self._stop()
+        logging.info(
+            f"Пул браузеров: перезапусков {self.restarts}, "
+            f"пересозданий контекста после ошибок {self.context_resets}, "
+            f"пересозданий по лимитам {self.recycles}, "
+            f"возвращено в очередь {self.requeued}"
+        )
+
+    async def _dispatch(
+        self,
+        products: asyncio.Queue[Optional[dict[str, str]]],
+        on_done: Callable[[dict[str, str], bool], None],
+    ) -> None:
+        finished: bool = False
+        while True:
+            while self._idle and self._retry:
+                self._assign(self._idle.popleft(), *self._retry.popleft())
+            while self._idle and not finished and not products.empty():
+                finished = self._take(products.get_nowait())
+            busy: bool = any(
+                slot.product is not None for slot in self._slots.values()
+            )
+            if finished and not busy and not self._retry:
+                return
+            if not busy and not finished and self._idle:
+                finished = self._take(await products.get())
+                continue
+            message = await asyncio.to_thread(self._poll)
+            if message is not None:
+                self._handle(message, on_done)
+            self._check_workers(on_done)
+
+    def _take(self, product: Optional[dict[str, str]]) -> bool:
+        """Отдаёт товар свободному процессу; True - очередь закончилась."""
+        if product is None:
+            return True
+        self._assign(self._idle.popleft(), product, 0)
+        return False
+
+    def _assign(
+        self, worker_id: int, product: dict[str, str], attempts: int
+    ) -> None:
+        self._tokens += 1
+        slot: _WorkerSlot = self._slots[worker_id]
+        slot.product = product
+        slot.attempts = attempts
+        slot.token = self._tokens
+        slot.inbox.put((slot.token, product["link"]))
+
+    def _poll(self) -> Optional[tuple[Any, ...]]:
+        try:
+            return self._results.get(timeout=BROWSER_POOL_POLL_SECONDS)
+        except queue.Empty:
+            return None
+
+    def _handle(
+        self,
+        message: tuple[Any, ...],
+        on_done: Callable[[dict[str, str], bool], None],
+    ) -> None:
+        """Разбирает сообщение воркера о товаре или о пересоздании."""
+        kind, worker_id, *payload = message
+        slot: _WorkerSlot = self._slots[worker_id]
+        if kind == RECYCLED:
+            reason, rss = payload
+            self.recycles += 1
+            metrics.count(f"browser_recycle_{reason}")
+            logging.log(
+                logging.INFO if reason == RESTART else logging.DEBUG,
+                f"Процесс браузера {worker_id}: пересоздание ({reason}), "
+                f"память {(rss or 0) // (1024 * 1024)} МБ",
+            )
+            return
+        token, *result = payload
+        if token != slot.token or slot.product is None:
+            return
+        product, slot.product = slot.product, None
+        self._idle.append(worker_id)
+        if kind == CRASHED:
+            error, reset = result
+            if reset == RESTART:
+                self.restarts += 1
+                metrics.error("browser", "Crashed")
+                logging.warning(
+                    f"Процесс браузера {worker_id}: браузер упал на "
+                    f"{product['link']}: {error}"
+                )
+            else:
+                self.context_resets += 1
+                metrics.error("browser", "PageError")
+                logging.warning(
+                    f"Процесс браузера {worker_id}: ошибка страницы на "
+                    f"{product['link']}, контекст пересоздан: {error}"
+                )
+            self._requeue(product, slot.attempts, on_done)
+            return
+        details, timings, error = result
+        slot.done += 1
+        for stage, seconds in timings.items():
+            metrics.observe(stage, seconds)
+        if error is not None:
+            self.errors += 1
+            metrics.error("load_page", error)
+        merge_details(product, details)
+        on_done(product, error is None)
+
+    def _requeue(
+        self,
+        product: dict[str, str],
+        attempts: int,
+        on_done: Callable[[dict[str, str], bool], None],
+    ) -> None:
+        """Возвращает товар в работу или сдаётся после `max_attempts`."""
+        if attempts + 1 < self.max_attempts:
+            self.requeued += 1
+            self._retry.append((product, attempts + 1))
+            return
+        self.errors += 1
+        metrics.error("browser", "GaveUp")
+        logging.error(
+            f"Товар {product['link']} пропущен после "
+            f"{self.max_attempts} падений браузера"
+        )
+        on_done(product, False)
+
+    def _check_workers(
+        self, on_done: Callable[[dict[str, str], bool], None]
+    ) -> None:
+        """Перезапускает завершившиеся процессы, их товары - в очередь."""
+        for worker_id, slot in list(self._slots.items()):
+            if slot.process.is_alive():
+                continue
+            logging.warning(
+                f"Процесс браузера {worker_id} завершился "
+                f"(код {slot.process.exitcode}), перезапуск"
+            )
+            self.restarts += 1
+            metrics.error("browser", "ProcessDied")
+            failures: int = 0 if slot.done else self._failures[worker_id] + 1
+            if failures >= self.max_attempts:
+                raise RuntimeError(
+                    f"Процесс браузера {worker_id} {failures} раз подряд "
+                    "завершился, не обработав ни одного товара"
+                )
+            self._failures[worker_id] = failures
+            if slot.product is not None:
+                self._requeue(slot.product, slot.attempts, on_done)
+            if worker_id in self._idle:
+                self._idle.remove(worker_id)
+            self._start(worker_id)
+
+    def _start(self, worker_id: int) -> None:
+        inbox: "multiprocessing.Queue[Any]" = self._context.Queue()
+        process = self._context.Process(
+            target=self.worker,
+            args=(worker_id, inbox, self._results, self.settings),
+            name=f"browser-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._slots[worker_id] = _WorkerSlot(process, inbox)
+        self._failures.setdefault(worker_id, 0)
+        self._idle.append(worker_id)
+
+    def _stop(self) -> None:
+        """Останавливает процессы; зависшие завершаются принудительно."""
+        for slot in self._slots.values():
+            if slot.process.is_alive():
+                slot.inbox.put(None)
+        deadline: float = time.monotonic() + BROWSER_POOL_STOP_TIMEOUT
+        for slot in self._slots.values():
+            slot.process.join(max(0.0, deadline - time.monotonic()))
+            if slot.process.is_alive():
+                slot.process.terminate()
+                slot.process.join()
+        self._slots.clear()
+        self._idle.clear()
@@ -1,4 +1,8 @@
+from .async_strategies import *
 from .browser import get_cookies
+from .cache import *
 from .config import *
 from .headers_manager import *
+from .metrics import *
 from .proxy_manager import *
+from .rate_limiter import *
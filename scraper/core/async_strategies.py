@@ -0,0 +1,527 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import time
+from asyncio import FIRST_COMPLETED
+from collections import defaultdict, deque
+from typing import Any, Coroutine, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import (
+    ASYNC_MAX_CONNECTIONS,
+    ASYNC_MAX_CONNECTIONS_PER_HOST,
+    DEFAULT_TIMEOUT,
+    FALLBACK_BUDGETS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    PROXY_RETRIES,
+    PROXY_SCRAPER_TIME_OUT,
+    SCRAPER_API_CONCURRENCY,
+    SCRAPER_API_CREDITS,
+    SCRAPER_API_KEY,
+    SCRAPER_API_NO_RENDER_PREFIXES,
+    SCRAPER_API_RENDER,
+    SCRAPER_API_TIME_OUT,
+    SCRAPER_API_URL,
+)
+from .proxy_manager import ProxyManager, ProxyValidationCache
+
+__all__ = [
+    "AsyncBaseScraper",
+    "AsyncFallbackScraper",
+    "AsyncProxyScraper",
+    "AsyncScraperAPIScraper",
+    "AsyncStandardScraper",
+    "HTTP2_AVAILABLE",
+    "run_sync",
+]
+
+HTTP2_AVAILABLE: bool = importlib.util.find_spec("h2") is not None
+
+T = TypeVar("T")
+
+
+class _LoopThread:
+    """Фоновый event loop, на котором работают синхронные обёртки."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                # После fork поток loop родителя в дочернем процессе не живёт.
+                self._pid = os.getpid()
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="scraper-http-loop",
+                    daemon=True,
+                ).start()
+        return self._loop
+
+
+_loop_thread = _LoopThread()
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Выполняет корутину на общем фоновом loop и ждёт результат.
+
+    Потоки, вызывающие синхронные стратегии, делят один пул соединений,
+    а сетевые ожидания разных потоков перекрываются внутри loop.
+    """
+    future = asyncio.run_coroutine_threadsafe(coroutine, _loop_thread.loop)
+    return future.result()
+
+
+class AsyncBaseScraper:
+    """Базовый класс асинхронных стратегий с пулом keep-alive соединений.
+
+    Экземпляр привязан к event loop, в котором сделан первый запрос.
+    Подклассы реализуют `send`, а `request` превращает ошибку в None.
+    """
+
+    ERROR_MESSAGE: str = "Ошибка запроса"
+
+    def __init__(
+        self,
+        max_connections: int = ASYNC_MAX_CONNECTIONS,
+        max_connections_per_host: int = ASYNC_MAX_CONNECTIONS_PER_HOST,
+        http2: bool = HTTP2_AVAILABLE,
+    ) -> None:
+        self.max_connections: int = max_connections
+        self.max_connections_per_host: int = max_connections_per_host
+        self.http2: bool = http2 and HTTP2_AVAILABLE
+        self._clients: dict[Optional[str], httpx.AsyncClient] = {}
+        self._host_slots: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.max_connections_per_host)
+        )
+
+    async def __aenter__(self) -> "AsyncBaseScraper":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def client(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        """Пул соединений (отдельный на каждый прокси).
+
+        Редиректы выполняются, как в синхронных стратегиях на requests.
+        """
+        if proxy not in self._clients:
+            self._clients[proxy] = httpx.AsyncClient(
+                http2=self.http2,
+                proxy=proxy,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._clients[proxy]
+
+    async def fetch(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> Optional[dict[str, Any]]:
+        """Выполняет запрос и возвращает разобранный JSON."""
+        response = await self.request(url, headers, cookies)
+        if response is None:
+            return None
+        try:
+            return response.json()
+        except ValueError as err_msg:
+            logging.warning(f"Некорректный JSON от {url}: {err_msg}")
+            return None
+
+    async def request(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> Optional[httpx.Response]:
+        """Выполняет запрос; при ошибке возвращает None."""
+        try:
+            return await self.send(url, headers, cookies)
+        except httpx.HTTPError as err_msg:
+            logging.warning(f"{self.ERROR_MESSAGE}: {err_msg}")
+            return None
+
+    async def send(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> httpx.Response:
+        """Выполняет запрос; ошибки HTTP и соединения пробрасываются."""
+        raise NotImplementedError(
+            "Метод send() должен быть реализован в подклассах."
+        )
+
+    async def get(
+        self,
+        url: str,
+        headers: dict[str, str],
+        cookies: dict[str, str],
+        timeout: float,
+        params: Optional[dict[str, str]] = None,
+        proxy: Optional[str] = None,
+    ) -> httpx.Response:
+        """GET с ограничением одновременных соединений на хост."""
+        request_headers: dict[str, str] = dict(headers)
+        if cookies:
+            request_headers["Cookie"] = "; ".join(
+                f"{name}={value}" for name, value in cookies.items()
+            )
+        host: str = urlsplit(url).netloc
+        async with self._host_slots[host]:
+            response = await self.client(proxy).get(
+                url, headers=request_headers, params=params, timeout=timeout
+            )
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+class AsyncStandardScraper(AsyncBaseScraper):
+    """Асинхронный прямой запрос без прокси."""
+
+    async def send(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> httpx.Response:
+        return await self.get(url, headers, cookies, DEFAULT_TIMEOUT)
+
+
+class AsyncProxyScraper(AsyncBaseScraper):
+    """Асинхронный скрапинг через проверенные прокси.
+
+    Результат каждого запроса сообщается в `ProxyManager`; при сбое
+    прокси запрос повторяется через другой прокси до `retries` раз.
+    Пулы соединений прокси, удалённых из `ProxyManager`, закрываются.
+    """
+
+    PROXY_FAILURE_STATUSES: frozenset[int] = frozenset({403, 407, 429})
+
+    def __init__(
+        self,
+        proxy_manager: Optional[ProxyManager] = None,
+        retries: int = PROXY_RETRIES,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        if proxy_manager is None:
+            proxy_manager = ProxyManager(cache=ProxyValidationCache())
+            proxy_manager.fetch_proxies()
+            proxy_manager.start_revalidation()
+        self.proxy_manager = proxy_manager
+        self.retries: int = retries
+
+    async def send(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> httpx.Response:
+        failure: httpx.HTTPError = httpx.ProxyError("Нет рабочих прокси")
+        for _ in range(self.retries):
+            # При пустом пуле get_proxy скачивает и проверяет новые прокси,
+            # поэтому выбор идёт в потоке, не блокируя event loop.
+            proxy = await asyncio.to_thread(self.proxy_manager.get_proxy)
+            if not proxy:
+                logging.error("Нет рабочих прокси!")
+                raise httpx.ProxyError("Нет рабочих прокси")
+            await self._prune_clients()
+            proxy_url: str = self.proxy_url(proxy)
+            started: float = time.monotonic()
+            try:
+                response = await self.get(
+                    url,
+                    headers,
+                    cookies,
+                    PROXY_SCRAPER_TIME_OUT,
+                    proxy=proxy_url,
+                )
+            except httpx.HTTPStatusError as err_msg:
+                if not self.is_proxy_failure(err_msg.response):
+                    self.proxy_manager.report(
+                        proxy, True, time.monotonic() - started
+                    )
+                    raise
+                logging.warning(f"Ошибка прокси ({proxy}): {err_msg}")
+                failure = err_msg
+            except httpx.HTTPError as err_msg:
+                logging.warning(f"Ошибка прокси ({proxy}): {err_msg}")
+                failure = err_msg
+            else:
+                self.proxy_manager.report(
+                    proxy, True, time.monotonic() - started
+                )
+                return response
+            self.proxy_manager.report(proxy, False)
+        raise failure
+
+    @staticmethod
+    def proxy_url(proxy: str) -> str:
+        """Адрес прокси со схемой, как его ждёт httpx."""
+        return proxy if "://" in proxy else f"http://{proxy}"
+
+    async def _prune_clients(self) -> None:
+        """Закрывает пулы соединений прокси, удалённых из ProxyManager."""
+        live: set[str] = {
+            self.proxy_url(proxy) for proxy in self.proxy_manager.proxies
+        }
+        for proxy_url in [url for url in self._clients if url not in live]:
+            await self._clients.pop(proxy_url).aclose()
+
+    @classmethod
+    def is_proxy_failure(cls, response: httpx.Response) -> bool:
+        """Ответ, в котором виноват прокси, а не запрошенный ресурс."""
+        return (
+            response.status_code >= 500
+            or response.status_code in cls.PROXY_FAILURE_STATUSES
+        )
+
+    async def aclose(self) -> None:
+        self.proxy_manager.stop_revalidation()
+        await super().aclose()
+
+
+class AsyncScraperAPIScraper(AsyncBaseScraper):
+    """Асинхронное использование ScraperAPI.
+
+    В режиме `render="auto"` JS-рендеринг запрашивается только для
+    HTML-страниц: JSON-эндпоинты (`SCRAPER_API_NO_RENDER_PREFIXES`)
+    отдаются без него быстрее и дешевле. Число одновременных запросов
+    ограничено тарифом (`concurrency`), остальные ждут в очереди.
+    """
+
+    BASE_URL: str = SCRAPER_API_URL
+    ERROR_MESSAGE: str = "Ошибка ScraperAPI"
+    RENDER_MODES: tuple[str, ...] = ("auto", "always", "never")
+
+    def __init__(
+        self,
+        render: str = SCRAPER_API_RENDER,
+        concurrency: int = SCRAPER_API_CONCURRENCY,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        if render not in self.RENDER_MODES:
+            raise ValueError(f"Неизвестный режим рендеринга: {render}")
+        self.render: str = render
+        self.concurrency: int = concurrency
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.requests: int = 0
+        self.rendered: int = 0
+        self.credits: int = 0
+
+    def needs_render(self, url: str) -> bool:
+        """Нужен ли JS-рендеринг для этого адреса."""
+        if self.render != "auto":
+            return self.render == "always"
+        return not url.startswith(SCRAPER_API_NO_RENDER_PREFIXES)
+
+    async def send(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> httpx.Response:
+        render: bool = self.needs_render(url)
+        params = {
+            "api_key": SCRAPER_API_KEY,
+            "url": url,
+            "keep_headers": "true",
+            "render": str(render).lower(),
+        }
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        try:
+            async with self._slots:
+                response = await self.get(
+                    self.BASE_URL,
+                    headers,
+                    cookies,
+                    SCRAPER_API_TIME_OUT,
+                    params=params,
+                )
+        except httpx.HTTPStatusError as err_msg:
+            if err_msg.response.status_code == 404:
+                self._charge(render)
+            raise
+        self._charge(render)
+        logging.debug(f"Ответ ScraperAPI: {response.text[:200]}")
+        return response
+
+    def _charge(self, render: bool) -> None:
+        """Учитывает кредиты: ScraperAPI списывает их за 200 и 404."""
+        self.requests += 1
+        self.rendered += render
+        self.credits += SCRAPER_API_CREDITS[render]
+
+    def stats(self) -> dict[str, int]:
+        """Оплаченные запросы, из них с рендерингом, и потраченные кредиты."""
+        return {
+            "requests": self.requests,
+            "rendered": self.rendered,
+            "credits": self.credits,
+        }
+
+    def log_stats(self) -> None:
+        logging.info(
+            f"ScraperAPI: запросов {self.requests}, с рендерингом "
+            f"{self.rendered}, потрачено кредитов {self.credits}"
+        )
+
+
+class AsyncFallbackScraper(AsyncBaseScraper):
+    """Цепочка стратегий с бюджетом времени и хедж-запросами.
+
+    Запрос начинается с первого уровня. Если уровень упал на сбое,
+    который может исправить другой маршрут (ошибка соединения или
+    прокси, 5xx, `AsyncProxyScraper.PROXY_FAILURE_STATUSES`), сразу
+    пробуется следующий; остальные ошибки клиента (например, 404)
+    окончательны и не тратят запросы следующих уровней. Если уровень не
+    ответил за перцентиль `hedge_percentile` своих недавних задержек (до
+    набора статистики - за свой бюджет), параллельно отправляется запрос
+    на следующий уровень. Побеждает первый ответ, остальные запросы
+    отменяются. Запрос уровня, не уложившийся в его бюджет, прерывается.
+    """
+
+    def __init__(
+        self,
+        tiers: list[AsyncBaseScraper],
+        budgets: tuple[float, ...] = FALLBACK_BUDGETS,
+        hedge_percentile: float = HEDGE_PERCENTILE,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        window: int = 200,
+    ) -> None:
+        super().__init__()
+        if len(budgets) < len(tiers):
+            budgets = budgets + (budgets[-1],) * (len(tiers) - len(budgets))
+        self.tiers: list[AsyncBaseScraper] = tiers
+        self.budgets: tuple[float, ...] = budgets
+        self.hedge_percentile: float = hedge_percentile
+        self.min_samples: int = min_samples
+        self.latencies: list[deque[float]] = [
+            deque(maxlen=window) for _ in tiers
+        ]
+        self.wins: list[int] = [0] * len(tiers)
+        self.hedged: int = 0
+
+    def hedge_delay(self, index: int) -> float:
+        """Сколько ждать уровень, прежде чем подключить следующий."""
+        samples: list[float] = sorted(self.latencies[index])
+        if len(samples) < self.min_samples:
+            return self.budgets[index]
+        position: int = int(self.hedge_percentile * (len(samples) - 1))
+        return min(samples[position], self.budgets[index])
+
+    async def request(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> Optional[httpx.Response]:
+        running: dict[asyncio.Task, int] = {}
+        try:
+            for index in range(len(self.tiers)):
+                if running:
+                    self.hedged += 1
+                task = asyncio.create_task(
+                    self._request_tier(index, url, headers, cookies)
+                )
+                running[task] = index
+                is_last: bool = index == len(self.tiers) - 1
+                response = await self._first_success(
+                    running, None if is_last else self.hedge_delay(index)
+                )
+                if response is None:
+                    continue
+                if response.is_error:
+                    logging.warning(
+                        f"Ошибка запроса без перехода на следующий уровень: "
+                        f"{response.status_code} {url}"
+                    )
+                    return None
+                return response
+            return None
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _first_success(
+        self, running: dict[asyncio.Task, int], timeout: Optional[float]
+    ) -> Optional[httpx.Response]:
+        """Ждёт первый ответ среди запущенных уровней.
+
+        Ответ может быть окончательной ошибкой клиента. Возвращает None
+        по истечении `timeout` или если все уровни завершились сбоем.
+        """
+        loop = asyncio.get_running_loop()
+        deadline: Optional[float] = (
+            None if timeout is None else loop.time() + timeout
+        )
+        while running:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return None
+            done, _ = await asyncio.wait(
+                running, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            if not done:
+                return None
+            for task in done:
+                index: int = running.pop(task)
+                response = task.result()
+                if response is not None:
+                    self.wins[index] += 1
+                    return response
+        return None
+
+    async def _request_tier(
+        self,
+        index: int,
+        url: str,
+        headers: dict[str, str],
+        cookies: dict[str, str],
+    ) -> Optional[httpx.Response]:
+        """Ответ уровня, ответ с окончательной ошибкой или None при сбое."""
+        started: float = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                self.tiers[index].send(url, headers, cookies),
+                self.budgets[index],
+            )
+        except asyncio.TimeoutError:
+            logging.warning(
+                f"Уровень {index + 1} не уложился в бюджет "
+                f"{self.budgets[index]:.0f} с: {url}"
+            )
+            return None
+        except httpx.HTTPStatusError as err_msg:
+            if AsyncProxyScraper.is_proxy_failure(err_msg.response):
+                logging.warning(f"Уровень {index + 1}: {err_msg}")
+                return None
+            response = err_msg.response
+        except httpx.HTTPError as err_msg:
+            logging.warning(f"Уровень {index + 1}: {err_msg}")
+            return None
+        self.latencies[index].append(time.monotonic() - started)
+        return response
+
+    def stats(self) -> dict[str, Any]:
+        """Ответы по уровням и число хедж-запросов."""
+        return {"wins": list(self.wins), "hedged": self.hedged}
+
+    def log_stats(self) -> None:
+        wins: str = ", ".join(
+            f"{type(tier).__name__}: {count}"
+            for tier, count in zip(self.tiers, self.wins)
+        )
+        logging.info(
+            f"Ответы по уровням ({wins}), хедж-запросов {self.hedged}"
+        )
+        for tier in self.tiers:
+            if isinstance(tier, AsyncScraperAPIScraper):
+                tier.log_stats()
+
+    async def aclose(self) -> None:
+        for tier in self.tiers:
+            await tier.aclose()
@@ -1,20 +1,103 @@
 import logging
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import urlsplit
 
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
+from playwright.async_api import Playwright as AsyncPlaywright
+from playwright.async_api import Route as AsyncRoute
+from playwright.async_api import async_playwright
 from playwright.sync_api import (
     Browser,
     BrowserContext,
     Page,
     Playwright,
+    Route,
     sync_playwright,
 )
 
-from .config import PERFUME_PAGE_URL
+from .config import (
+    ALLOWED_DOMAINS,
+    BLOCKED_DOMAINS,
+    BLOCKED_RESOURCE_TYPES,
+    PERFUME_PAGE_URL,
+)
+from .session import SessionStore
+
+
+class RequestBlocker:
+    """Блокирует ненужные запросы страницы по типу ресурса и домену.
+
+    Если задан список разрешённых доменов, запросы к остальным
+    доменам отклоняются. Сам HTML-документ не блокируется никогда.
+    """
+
+    def __init__(
+        self,
+        resource_types: tuple[str, ...] = BLOCKED_RESOURCE_TYPES,
+        blocked_domains: tuple[str, ...] = BLOCKED_DOMAINS,
+        allowed_domains: tuple[str, ...] = ALLOWED_DOMAINS,
+    ) -> None:
+        self.resource_types: frozenset[str] = frozenset(resource_types)
+        self.blocked_domains: tuple[str, ...] = blocked_domains
+        self.allowed_domains: tuple[str, ...] = allowed_domains
+        self.blocked: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(
+            self.resource_types or self.blocked_domains or self.allowed_domains
+        )
+
+    @staticmethod
+    def _matches(host: str, domains: tuple[str, ...]) -> bool:
+        return any(
+            host == domain or host.endswith(f".{domain}") for domain in domains
+        )
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Решает, нужно ли отклонить запрос."""
+        if resource_type == "document":
+            return False
+        host: str = urlsplit(url).hostname or ""
+        if self.allowed_domains and not self._matches(
+            host, self.allowed_domains
+        ):
+            return True
+        return resource_type in self.resource_types or self._matches(
+            host, self.blocked_domains
+        )
+
+    def handle(self, route: Route) -> None:
+        """Обработчик маршрута для синхронного Playwright."""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route: AsyncRoute) -> None:
+        """Обработчик маршрута для асинхронного Playwright."""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
 
 
 class BrowserManager:
-    def __init__(self, headless: bool = True) -> None:
+    def __init__(
+        self,
+        headless: bool = True,
+        blocker: Optional[RequestBlocker] = None,
+        session_store: Optional[SessionStore] = None,
+    ) -> None:
         self.headless: bool = headless
+        self.blocker: RequestBlocker = blocker or RequestBlocker()
+        self.session_store: SessionStore = session_store or SessionStore()
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: BrowserContext
@@ -22,12 +105,50 @@ class BrowserManager:
     def __enter__(self) -> "BrowserManager":
         self.playwright = sync_playwright().start()
         self.browser = self.playwright.chromium.launch(headless=self.headless)
-        self.context = self.browser.new_context()
+        self.context = self.browser.new_context(
+            storage_state=self.session_store.load()
+        )
+        if self.blocker.enabled:
+            self.context.route("**/*", self.blocker.handle)
         return self
 
     def new_page(self) -> Page:
         return self.context.new_page()
 
+    @property
+    def is_connected(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    def recycle_context(self) -> None:
+        """Пересоздаёт контекст с теми же куками и закрывает его страницы.
+
+        Закрытие контекста освобождает память его процессов отрисовки,
+        которая копится за время работы с одной страницей.
+        """
+        if self.browser is None:
+            raise RuntimeError("Браузер не запущен")
+        state = self.context.storage_state()
+        self.context.close()
+        self.context = self.browser.new_context(storage_state=state)
+        if self.blocker.enabled:
+            self.context.route("**/*", self.blocker.handle)
+
+    def refresh_session(self) -> dict[str, str]:
+        """Получает свежие куки в текущем контексте и сохраняет сессию."""
+        logging.info("Обновление кук в общем браузере...")
+        page: Page = self.context.new_page()
+        try:
+            page.goto(PERFUME_PAGE_URL, timeout=60000)
+            page.wait_for_load_state("networkidle", timeout=15000)
+        except Exception as err_msg:
+            logging.warning(
+                f"Страница для кук загрузилась не полностью: {err_msg}"
+            )
+        finally:
+            page.close()
+        self.session_store.save(self.context.storage_state())
+        return cookies_to_dict(self.context.cookies())
+
     def __exit__(
         self,
         exc_type: Optional[type],
@@ -38,10 +159,92 @@ class BrowserManager:
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
+        if self.blocker.blocked:
+            logging.info(f"Заблокировано запросов: {self.blocker.blocked}")
         logging.info("Браузер Playwright закрыт.")
 
 
-def get_cookies() -> dict[str, str]:
+class AsyncBrowserManager:
+    """Асинхронный браузер Playwright для параллельной работы страниц."""
+
+    def __init__(
+        self,
+        headless: bool = True,
+        blocker: Optional[RequestBlocker] = None,
+        session_store: Optional[SessionStore] = None,
+    ) -> None:
+        self.headless: bool = headless
+        self.blocker: RequestBlocker = blocker or RequestBlocker()
+        self.session_store: SessionStore = session_store or SessionStore()
+        self.playwright: Optional[AsyncPlaywright] = None
+        self.browser: Optional[AsyncBrowser] = None
+        self.context: AsyncBrowserContext
+
+    async def __aenter__(self) -> "AsyncBrowserManager":
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless
+        )
+        self.context = await self.browser.new_context(
+            storage_state=self.session_store.load()
+        )
+        if self.blocker.enabled:
+            await self.context.route("**/*", self.blocker.handle_async)
+        return self
+
+    async def new_page(self) -> AsyncPage:
+        return await self.context.new_page()
+
+    async def new_context(self) -> AsyncBrowserContext:
+        """Отдельный контекст с сессией и блокировкой общего контекста."""
+        if self.browser is None:
+            raise RuntimeError("Браузер не запущен")
+        context: AsyncBrowserContext = await self.browser.new_context(
+            storage_state=await self.context.storage_state()
+        )
+        if self.blocker.enabled:
+            await context.route("**/*", self.blocker.handle_async)
+        return context
+
+    async def refresh_session(self) -> dict[str, str]:
+        """Получает свежие куки в текущем контексте и сохраняет сессию."""
+        logging.info("Обновление кук в общем браузере...")
+        page: AsyncPage = await self.context.new_page()
+        try:
+            await page.goto(PERFUME_PAGE_URL, timeout=60000)
+            await page.wait_for_load_state("networkidle", timeout=15000)
+        except Exception as err_msg:
+            logging.warning(
+                f"Страница для кук загрузилась не полностью: {err_msg}"
+            )
+        finally:
+            await page.close()
+        self.session_store.save(await self.context.storage_state())
+        return cookies_to_dict(await self.context.cookies())
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_value: Optional[Exception],
+        traceback: Optional[object],
+    ) -> None:
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        if self.blocker.blocked:
+            logging.info(f"Заблокировано запросов: {self.blocker.blocked}")
+        logging.info("Асинхронный браузер Playwright закрыт.")
+
+
+def cookies_to_dict(cookies: list[Any]) -> dict[str, str]:
+    """Преобразует куки Playwright в словарь имя -> значение."""
+    return {cookie["name"]: cookie["value"] for cookie in cookies}
+
+
+def get_cookies(
+    session_store: Optional[SessionStore] = None,
+) -> dict[str, str]:
     """Открывает браузер, заходит на сайт и получает свежие куки."""
     with sync_playwright() as p:
         browser: Browser = p.chromium.launch(headless=False)
@@ -52,9 +255,11 @@ def get_cookies() -> dict[str, str]:
             page.goto(PERFUME_PAGE_URL, timeout=60000)
             page.wait_for_timeout(5000)
             cookies = context.cookies()
+            if session_store is not None:
+                session_store.save(context.storage_state())
             browser.close()
             logging.info("Куки обновлены.")
-            return {cookie["name"]: cookie["value"] for cookie in cookies}
+            return cookies_to_dict(cookies)
         except Exception as e:
             logging.error(f"Ошибка при получении кук: {e}")
             browser.close()
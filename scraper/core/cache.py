@@ -0,0 +1,243 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import httpx
+
+from .config import (
+    CACHE_DEFAULT_TTL,
+    CACHE_FILE,
+    CACHE_MAX_BYTES,
+    CACHE_TTLS,
+    SQLITE_TIMEOUT,
+)
+from .strategies import BaseScraper
+
+__all__ = ["CacheEntry", "CachedScraper", "ResponseCache"]
+
+
+class CacheEntry(NamedTuple):
+    """Сохранённый ответ с валидаторами для условного запроса."""
+
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class ResponseCache:
+    """Персистентный кеш ответов в SQLite с вытеснением по LRU."""
+
+    def __init__(
+        self, path: str = CACHE_FILE, max_bytes: int = CACHE_MAX_BYTES
+    ) -> None:
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=SQLITE_TIMEOUT, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+            "ON responses (accessed_at)"
+        )
+        self._connection.commit()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Возвращает запись и отмечает обращение к ней."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, stored_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+            self._connection.commit()
+        return CacheEntry(*row)
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Сохраняет ответ и вытесняет давно неиспользуемые записи."""
+        now: float = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, len(body)),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def touch(self, url: str) -> None:
+        """Продлевает свежесть записи после ответа 304 Not Modified."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+            self._connection.commit()
+
+    def size(self) -> int:
+        """Суммарный размер сохранённых ответов в байтах."""
+        with self._lock:
+            (total,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return total
+
+    def _evict(self) -> None:
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        rows = self._connection.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at"
+        )
+        evicted: list[str] = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append(url)
+            total -= size
+        self._connection.executemany(
+            "DELETE FROM responses WHERE url = ?", [(url,) for url in evicted]
+        )
+        if evicted:
+            logging.debug(f"Из кеша вытеснено записей: {len(evicted)}")
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class CachedScraper(BaseScraper):
+    """Кеширующая обёртка над любой стратегией скрапинга.
+
+    Свежие ответы отдаются из кеша без сети, устаревшие
+    перепроверяются условным запросом по ETag/Last-Modified.
+    Сохраняются только ответы 200 с телом в JSON.
+    """
+
+    def __init__(
+        self,
+        strategy: BaseScraper,
+        cache: Optional[ResponseCache] = None,
+        ttls: Optional[dict[str, int]] = None,
+    ) -> None:
+        super().__init__()
+        self.strategy = strategy
+        self.cache = cache or ResponseCache()
+        self.ttls: dict[str, int] = CACHE_TTLS if ttls is None else ttls
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidated: int = 0
+        self._stats_lock = threading.Lock()
+
+    def ttl_for(self, url: str) -> int:
+        """TTL по самому длинному совпавшему префиксу эндпоинта."""
+        prefixes = [prefix for prefix in self.ttls if url.startswith(prefix)]
+        if not prefixes:
+            return CACHE_DEFAULT_TTL
+        return self.ttls[max(prefixes, key=len)]
+
+    def request(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> Optional[httpx.Response]:
+        entry = self.cache.get(url)
+        if entry and time.time() - entry.stored_at < self.ttl_for(url):
+            self._count("hits")
+            return self._cached_response(url, entry)
+
+        request_headers: dict[str, str] = dict(headers)
+        if entry and entry.etag:
+            request_headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            request_headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.strategy.request(url, request_headers, cookies)
+        if response is not None and response.status_code == 304 and entry:
+            self._count("revalidated")
+            self.cache.touch(url)
+            return self._cached_response(url, entry)
+
+        self._count("misses")
+        if (
+            response is not None
+            and response.status_code == 200
+            and self._is_json(response)
+        ):
+            self.cache.put(
+                url,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        return response
+
+    def stats(self) -> dict[str, int]:
+        """Счётчики обращений к кешу за время работы."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        total: int = sum(stats.values())
+        saved: int = stats["hits"] + stats["revalidated"]
+        logging.info(
+            f"Кеш HTTP: попаданий {stats['hits']}, промахов "
+            f"{stats['misses']}, перепроверено {stats['revalidated']} "
+            f"(без загрузки тела {saved} из {total})"
+        )
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @staticmethod
+    def _is_json(response: httpx.Response) -> bool:
+        """Кешируются только тела, которые `fetch` разберёт как JSON.
+
+        Иначе, например, HTML-заглушка антибота отдавалась бы весь TTL.
+        """
+        try:
+            response.json()
+        except ValueError:
+            logging.debug(f"Ответ не JSON, в кеш не сохранён: {response.url}")
+            return False
+        return True
+
+    @staticmethod
+    def _cached_response(url: str, entry: CacheEntry) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=entry.body,
+            headers={"X-Cache": "HIT"},
+            request=httpx.Request("GET", url),
+        )
@@ -1,14 +1,101 @@
 from decouple import config
 
-PERFUME_PAGE_URL: str = "https://goldapple.ru/parfjumerija"
-GOLD_APPLE_API_URL: str = "https://goldapple.ru/front/api"
+SITE_URL: str = config(
+    "GOLD_APPLE_SITE_URL", default="https://goldapple.ru", cast=str
+)
+PERFUME_PAGE_URL: str = f"{SITE_URL}/parfjumerija"
+GOLD_APPLE_API_URL: str = f"{SITE_URL}/front/api"
 PRODUCT_DETAILS_URL: str = f"{GOLD_APPLE_API_URL}/catalog/product-card/base"
 
 DEFAULT_MAX_PAGES: int = 5
+DEFAULT_CATEGORY_ID: str = "1000000007"
+DEFAULT_CITY_ID: str = "0c5b2444-70a0-4932-980c-b4dc0d3f02b5"
+DEFAULT_WORKERS: int = 4
+DEFAULT_PAGE_WORKERS: int = 4
+DEFAULT_REQUESTS_PER_SECOND: float = 2.0
+PAGE_RETRIES: int = 3
+PAGE_RETRY_BACKOFF: float = 2.0
+
+PRODUCT_READY_SELECTOR: str = "button.ga-tabs-tab"
+PRODUCT_READY_TIMEOUT_MS: int = 15000
+EXTRACTION_TAB_TIMEOUT_MS: int = 3000
+BLOCKED_RESOURCE_TYPES: tuple[str, ...] = ("image", "media", "font")
+BLOCKED_DOMAINS: tuple[str, ...] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mc.yandex.ru",
+    "top-fwz1.mail.ru",
+    "vk.com",
+    "facebook.net",
+    "criteo.com",
+    "criteo.net",
+    "mindbox.ru",
+)
+ALLOWED_DOMAINS: tuple[str, ...] = ()
+
+SESSION_FILE: str = "session_state.json"
+SESSION_TTL: int = 6 * 60 * 60
 
 DEFAULT_TIMEOUT: int = 5
+ASYNC_MAX_CONNECTIONS: int = 100
+ASYNC_MAX_CONNECTIONS_PER_HOST: int = 20
+FALLBACK_BUDGETS: tuple[float, ...] = (5.0, 20.0, 90.0)
+HEDGE_PERCENTILE: float = 0.95
+HEDGE_MIN_SAMPLES: int = 20
 TEMP_FILE: str = "products_temp.json"
+PARQUET_ROW_GROUP_SIZE: int = 10_000
+PARQUET_COMPRESSION: str = "zstd"
+METRICS_PROM_FILE: str = "metrics.prom"
+METRICS_JSON_FILE: str = "metrics.json"
+METRICS_PREFIX: str = "goldscraper"
+METRICS_RESERVOIR: int = 10_000
+PROFILE_DIR: str = "profiles"
+PROFILE_TRACE_SAMPLE: float = 0.05
+PROFILE_SLOW_SECONDS: float = 5.0
+PRODUCTS_DB_FILE: str = "products.sqlite3"
+PRODUCTS_DB_BATCH_SIZE: int = 500
+JOURNAL_FILE: str = "products_journal.jsonl"
+BROWSER_POOL_MAX_NAVIGATIONS: int = 200
+BROWSER_POOL_MAX_RSS_MB: float = 1500
+BROWSER_POOL_MAX_ATTEMPTS: int = 3
+BROWSER_POOL_POLL_SECONDS: float = 0.2
+BROWSER_POOL_STOP_TIMEOUT: float = 10
+SNAPSHOT_DB_FILE: str = "products_snapshots.sqlite3"
+SNAPSHOT_COMPRESSION_LEVEL: int = 6
+SNAPSHOT_COMMIT_EVERY: int = 50
+SNAPSHOT_PENDING_PER_PROCESS: int = 4
+SNAPSHOT_BATCH_SIZE: int = 256
+STATE_DB_FILE: str = "products_state.sqlite3"
+STATE_MAX_AGE_DAYS: float = 30
+STATE_COMMIT_EVERY: int = 100
+SQLITE_TIMEOUT: float = 30
+
+CACHE_FILE: str = "http_cache.sqlite3"
+CACHE_MAX_BYTES: int = 200 * 1024 * 1024
+CACHE_DEFAULT_TTL: int = 60 * 60
+CACHE_TTLS: dict[str, int] = {
+    f"{GOLD_APPLE_API_URL}/catalog/products": 60 * 60,
+    PRODUCT_DETAILS_URL: 24 * 60 * 60,
+}
 
 PROXY_SCRAPER_TIME_OUT: int = 60
+PROXY_RETRIES: int = 3
+PROXY_EWMA_ALPHA: float = 0.3
+PROXY_FAILURE_THRESHOLD: int = 3
+PROXY_COOLDOWN: int = 60
+PROXY_REVALIDATE_INTERVAL: int = 30
+PROXY_VALIDATION_WORKERS: int = 100
+PROXY_CACHE_FILE: str = "proxy_cache.json"
+PROXY_CACHE_TTL: int = 30 * 60
 SCRAPER_API_KEY: str = config("SCRAPER_API_KEY", cast=str)
+SCRAPER_API_URL: str = config(
+    "SCRAPER_API_URL", default="http://api.scraperapi.com", cast=str
+)
 SCRAPER_API_TIME_OUT: int = 90
+SCRAPER_API_RENDER: str = config("SCRAPER_API_RENDER", default="auto")
+SCRAPER_API_CONCURRENCY: int = config(
+    "SCRAPER_API_CONCURRENCY", default=5, cast=int
+)
+SCRAPER_API_NO_RENDER_PREFIXES: tuple[str, ...] = (GOLD_APPLE_API_URL,)
+SCRAPER_API_CREDITS: dict[bool, int] = {False: 1, True: 10}
@@ -1,23 +1,47 @@
 import logging
 import random
+from typing import Optional
 
 import requests
 from fake_useragent import UserAgent
 
 from .browser import get_cookies
 from .config import PERFUME_PAGE_URL
+from .session import SessionStore
 
 
 class HeadersManager:
-    """Генерирует динамические заголовки и обновляет куки через Playwright."""
+    """Генерирует динамические заголовки и обновляет куки через Playwright.
+
+    Куки берутся из сохранённой сессии. Отдельный браузер запускается
+    только если сессии нет и `launch_browser` включён; иначе куки
+    передаются из общего браузера через `set_cookies`.
+    """
 
     INIT_URL = PERFUME_PAGE_URL
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        session_store: Optional[SessionStore] = None,
+        launch_browser: bool = True,
+    ) -> None:
         self.user_agent = UserAgent()
         self.session = requests.Session()
+        self.session_store: SessionStore = session_store or SessionStore()
         self.headers: dict[str, str] = self.generate_headers()
-        self.cookies: dict[str, str] = get_cookies()
+        self.cookies: dict[str, str] = self.session_store.cookies()
+        if self.cookies:
+            logging.info("Используются куки сохранённой сессии")
+        elif launch_browser:
+            self.cookies = get_cookies(self.session_store)
+
+    @property
+    def has_cookies(self) -> bool:
+        return bool(self.cookies)
+
+    def set_cookies(self, cookies: dict[str, str]) -> None:
+        """Устанавливает куки, полученные из общего браузера."""
+        self.cookies = cookies
 
     def generate_headers(self) -> dict[str, str]:
         """Генерирует случайные заголовки, чтобы имитировать браузер."""
@@ -38,7 +62,7 @@ class HeadersManager:
     def update_cookies(self) -> None:
         """Обновляет куки через Playwright при необходимости."""
         logging.info("Обновляю куки...")
-        self.cookies = get_cookies()
+        self.cookies = get_cookies(self.session_store)
         logging.debug(f"Куки обновлены: {self.cookies}")
 
     def get_headers_and_cookies(self) -> tuple[dict[str, str], dict[str, str]]:
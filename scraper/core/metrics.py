@@ -0,0 +1,280 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from .config import (
+    METRICS_JSON_FILE,
+    METRICS_PREFIX,
+    METRICS_PROM_FILE,
+    METRICS_RESERVOIR,
+)
+
+__all__ = ["Histogram", "Metrics", "metrics"]
+
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Длительности одной стадии: счётчик, сумма и выборка для квантилей.
+
+    Выборка ограничена `size` значениями (reservoir sampling), поэтому
+    память не растёт с длиной обхода, а квантили остаются несмещёнными.
+    """
+
+    __slots__ = ("size", "count", "total", "samples", "_random")
+
+    def __init__(self, size: int = METRICS_RESERVOIR) -> None:
+        self.size: int = size
+        self.count: int = 0
+        self.total: float = 0.0
+        self.samples: list[float] = []
+        self._random = random.Random(0)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+            return
+        index: int = self._random.randrange(self.count)
+        if index < self.size:
+            self.samples[index] = seconds
+
+    def quantiles(self) -> dict[float, float]:
+        """p50/p95/p99 по выборке в секундах."""
+        if not self.samples:
+            return {}
+        ordered: list[float] = sorted(self.samples)
+        return {
+            quantile: ordered[int(quantile * (len(ordered) - 1))]
+            for quantile in QUANTILES
+        }
+
+
+class Metrics:
+    """Потокобезопасный реестр метрик обхода.
+
+    Стадии (`fetch`, `page`, `load_page`, `extract`, `write`, ...)
+    отмечаются через `timer`; исключения внутри считаются ошибками
+    стадии по имени типа. В конце запуска метрики выгружаются
+    в текстовый файл Prometheus (для textfile collector) и в JSON.
+    """
+
+    def __init__(self, labels: Optional[dict[str, str]] = None) -> None:
+        self._lock = threading.Lock()
+        self.reset(labels)
+
+    def reset(self, labels: Optional[dict[str, str]] = None) -> None:
+        """Очищает метрики и задаёт общие метки (например, задание)."""
+        with self._lock:
+            self.labels: dict[str, str] = dict(labels or {})
+            self.started: float = time.time()
+            self.histograms: dict[str, Histogram] = {}
+            self.errors: Counter[tuple[str, str]] = Counter()
+            self.bytes: Counter[str] = Counter()
+            self.counters: Counter[str] = Counter()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def error(self, stage: str, kind: str) -> None:
+        with self._lock:
+            self.errors[(stage, kind)] += 1
+
+    def add_bytes(self, stage: str, size: int) -> None:
+        with self._lock:
+            self.bytes[stage] += size
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Замеряет блок; исключение учитывается как ошибка стадии."""
+        started: float = time.perf_counter()
+        try:
+            yield
+        except BaseException as err_msg:
+            self.error(stage, type(err_msg).__name__)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def summary(self) -> dict[str, Any]:
+        """Сводка: квантили стадий в мс, ошибки, байты и товары."""
+        with self._lock:
+            elapsed: float = time.time() - self.started
+            products: int = self.counters["products"]
+            stages: dict[str, dict[str, float]] = {}
+            for stage, histogram in sorted(self.histograms.items()):
+                stages[stage] = {
+                    "count": histogram.count,
+                    "sum_s": histogram.total,
+                    **{
+                        f"p{int(quantile * 100)}_ms": value * 1000
+                        for quantile, value in histogram.quantiles().items()
+                    },
+                }
+            return {
+                "labels": dict(self.labels),
+                "started_at": self.started,
+                "elapsed_s": elapsed,
+                "products": products,
+                "seconds_per_product": (
+                    elapsed / products if products else None
+                ),
+                "stages": stages,
+                "errors": {
+                    f"{stage}:{kind}": count
+                    for (stage, kind), count in sorted(self.errors.items())
+                },
+                "bytes": dict(self.bytes),
+                "counters": dict(self.counters),
+            }
+
+    def prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        summary: dict[str, Any] = self.summary()
+        name: str = f"{METRICS_PREFIX}_stage_seconds"
+        lines: list[str] = [
+            f"# HELP {name} Длительность стадий обхода.",
+            f"# TYPE {name} summary",
+        ]
+        with self._lock:
+            histograms = [
+                (
+                    stage,
+                    histogram.quantiles(),
+                    histogram.total,
+                    histogram.count,
+                )
+                for stage, histogram in sorted(self.histograms.items())
+            ]
+            errors = sorted(self.errors.items())
+            sizes = sorted(self.bytes.items())
+        for stage, quantiles, total, count in histograms:
+            for quantile, value in quantiles.items():
+                labels = self._labels(stage=stage, quantile=str(quantile))
+                lines.append(f"{name}{labels} {value:.6f}")
+            lines.append(f"{name}_sum{self._labels(stage=stage)} {total:.6f}")
+            lines.append(f"{name}_count{self._labels(stage=stage)} {count}")
+        lines.extend(
+            self._family(
+                "errors_total",
+                "counter",
+                "Ошибки стадий по типу.",
+                [
+                    (self._labels(stage=stage, type=kind), count)
+                    for (stage, kind), count in errors
+                ],
+            )
+        )
+        lines.extend(
+            self._family(
+                "bytes_total",
+                "counter",
+                "Полученные байты по стадиям.",
+                [(self._labels(stage=stage), size) for stage, size in sizes],
+            )
+        )
+        lines.extend(
+            self._family(
+                "products_total",
+                "counter",
+                "Записанные товары.",
+                [(self._labels(), summary["products"])],
+            )
+        )
+        lines.extend(
+            self._family(
+                "run_seconds",
+                "gauge",
+                "Длительность запуска.",
+                [(self._labels(), round(summary["elapsed_s"], 6))],
+            )
+        )
+        if summary["seconds_per_product"] is not None:
+            lines.extend(
+                self._family(
+                    "seconds_per_product",
+                    "gauge",
+                    "Время запуска в расчёте на один товар.",
+                    [
+                        (
+                            self._labels(),
+                            round(summary["seconds_per_product"], 6),
+                        )
+                    ],
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+    def export(
+        self,
+        directory: str = ".",
+        prom_file: str = METRICS_PROM_FILE,
+        json_file: str = METRICS_JSON_FILE,
+    ) -> None:
+        """Атомарно записывает файл Prometheus и JSON-сводку."""
+        os.makedirs(directory, exist_ok=True)
+        self._write(os.path.join(directory, prom_file), self.prometheus())
+        self._write(
+            os.path.join(directory, json_file),
+            json.dumps(self.summary(), ensure_ascii=False, indent=2),
+        )
+        logging.info(
+            f"Метрики сохранены в {os.path.join(directory, prom_file)} "
+            f"и {os.path.join(directory, json_file)}"
+        )
+
+    def _labels(self, **labels: str) -> str:
+        merged: dict[str, str] = {**self.labels, **labels}
+        if not merged:
+            return ""
+        pairs: str = ",".join(
+            f'{key}="{self._escape(value)}"' for key, value in merged.items()
+        )
+        return f"{{{pairs}}}"
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace('"', '\\"')
+        )
+
+    @staticmethod
+    def _family(
+        name: str, kind: str, help_text: str, samples: list[tuple[str, Any]]
+    ) -> list[str]:
+        if not samples:
+            return []
+        full_name: str = f"{METRICS_PREFIX}_{name}"
+        return [
+            f"# HELP {full_name} {help_text}",
+            f"# TYPE {full_name} {kind}",
+            *(f"{full_name}{labels} {value}" for labels, value in samples),
+        ]
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        """Пишет через временный файл: коллектор не прочтёт его частично."""
+        temp_path: str = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temp_path, path)
+
+
+metrics = Metrics()
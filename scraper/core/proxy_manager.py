@@ -1,13 +1,130 @@
+import json
 import logging
+import os
 import random
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
 import requests
 
+from .config import (
+    PROXY_CACHE_FILE,
+    PROXY_CACHE_TTL,
+    PROXY_COOLDOWN,
+    PROXY_EWMA_ALPHA,
+    PROXY_FAILURE_THRESHOLD,
+    PROXY_REVALIDATE_INTERVAL,
+    PROXY_VALIDATION_WORKERS,
+)
+
+__all__ = ["ProxyManager", "ProxyStats", "ProxyValidationCache"]
+
+
+class ProxyValidationCache:
+    """Результаты проверки прокси, сохраняемые между запусками.
+
+    Для каждого прокси хранится исход последней проверки и её время;
+    записи старше `ttl` секунд считаются неизвестными.
+    """
+
+    def __init__(
+        self, path: str = PROXY_CACHE_FILE, ttl: int = PROXY_CACHE_TTL
+    ) -> None:
+        self.path: str = path
+        self.ttl: int = ttl
+        self.results: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                results = json.load(file)
+        except (OSError, ValueError) as err_msg:
+            logging.warning(f"Не удалось прочитать кеш прокси: {err_msg}")
+            return
+        now: float = time.time()
+        with self._lock:
+            self.results = {
+                proxy: result
+                for proxy, result in results.items()
+                if now - result.get("checked_at", 0) <= self.ttl
+            }
+
+    def save(self) -> None:
+        """Атомарно записывает кеш через временный файл.
+
+        Кеш сохраняют и проверка пула, и фоновая перепроверка: запись
+        идёт под отдельной блокировкой, чтобы более старый снимок не
+        заменил более новый, а прерванная запись не обрезала файл.
+        """
+        with self._save_lock:
+            with self._lock:
+                payload: str = json.dumps(self.results)
+            temp_path: str = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(payload)
+            os.replace(temp_path, self.path)
+
+    def record(self, proxy: str, ok: bool) -> None:
+        with self._lock:
+            self.results[proxy] = {"ok": ok, "checked_at": time.time()}
+
+    def known(self, ok: Optional[bool] = None) -> list[str]:
+        """Недавно проверенные прокси (только рабочие/нерабочие)."""
+        now: float = time.time()
+        with self._lock:
+            return [
+                proxy
+                for proxy, result in self.results.items()
+                if now - result["checked_at"] <= self.ttl
+                and (ok is None or bool(result["ok"]) == ok)
+            ]
+
+
+class ProxyStats:
+    """Скользящие (EWMA) показатели прокси и состояние предохранителя."""
+
+    __slots__ = ("latency", "success_rate", "failures", "opened_at")
+
+    def __init__(self, latency: float = 1.0) -> None:
+        self.latency: float = latency
+        self.success_rate: float = 1.0
+        self.failures: int = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Предохранитель сработал: прокси не выдаётся краулеру."""
+        return self.opened_at is not None
+
+    @property
+    def score(self) -> float:
+        """Вес при выборе: выше у быстрых и надёжных прокси."""
+        return self.success_rate / max(self.latency, 0.05)
+
+    def update(self, ok: bool, latency: float, alpha: float) -> None:
+        self.success_rate += alpha * (float(ok) - self.success_rate)
+        if ok:
+            self.latency += alpha * (latency - self.latency)
+            self.failures = 0
+        else:
+            self.failures += 1
+
 
 class ProxyManager:
-    """Класс для автоматического получения и проверки бесплатных прокси."""
+    """Класс для автоматического получения и проверки бесплатных прокси.
+
+    Прокси выбираются случайно с весом по EWMA задержки и доли успехов.
+    После `failure_threshold` ошибок подряд предохранитель исключает
+    прокси из выдачи; фоновая перепроверка по истечении `cooldown`
+    возвращает его в пул или удаляет и добирает пул новыми прокси.
+    """
 
     PROXY_SOURCES: list[str] = [
         "https://www.sslproxies.org/",
@@ -15,13 +132,44 @@ class ProxyManager:
         "https://www.proxy-list.download/api/v1/get?type=https",
     ]
 
-    def __init__(self, max_proxies: int = 20, timeout: int = 5) -> None:
+    def __init__(
+        self,
+        max_proxies: int = 20,
+        timeout: int = 5,
+        alpha: float = PROXY_EWMA_ALPHA,
+        failure_threshold: int = PROXY_FAILURE_THRESHOLD,
+        cooldown: float = PROXY_COOLDOWN,
+        validation_workers: int = PROXY_VALIDATION_WORKERS,
+        cache: Optional[ProxyValidationCache] = None,
+    ) -> None:
         self.max_proxies: int = max_proxies
+        self.validation_workers: int = validation_workers
+        self.cache: Optional[ProxyValidationCache] = cache
         self.timeout: int = timeout
+        self.alpha: float = alpha
+        self.failure_threshold: int = failure_threshold
+        self.cooldown: float = cooldown
         self.proxies: list[str] = []
+        self.stats: dict[str, ProxyStats] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._revalidator: Optional[threading.Thread] = None
 
     def fetch_proxies(self) -> None:
-        """Загружает список прокси с разных источников."""
+        """Загружает список прокси с разных источников.
+
+        Сначала используются недавно проверенные прокси из кеша; источники
+        опрашиваются, только если рабочих прокси меньше `max_proxies`.
+        Новые прокси занимают места отключённых предохранителем.
+        """
+        if self.cache is not None:
+            self.add_proxies(self.cache.known(ok=True))
+            if self.free_slots() <= 0:
+                logging.info(
+                    f"Используем {len(self.proxies)} прокси из кеша проверок"
+                )
+                return
+
         logging.info("Загружаем список прокси...")
         raw_proxies: set[str] = set()
 
@@ -37,8 +185,14 @@ class ProxyManager:
             except requests.RequestException as e:
                 logging.warning(f"Ошибка загрузки прокси с {source}: {e}")
 
+        with self._lock:
+            raw_proxies.difference_update(self.proxies)
+        if self.cache is not None:
+            raw_proxies.difference_update(self.cache.known(ok=False))
         logging.info(f"Проверяем {len(raw_proxies)} прокси...")
-        self.proxies = self.validate_proxies(raw_proxies)
+        self.add_proxies(self.validate_proxies(raw_proxies, self.free_slots()))
+        if self.cache is not None:
+            self.cache.save()
         logging.info(f"Доступно {len(self.proxies)} рабочих HTTPS-прокси.")
 
     def extract_proxies(self, text: str) -> set[str]:
@@ -55,24 +209,170 @@ class ProxyManager:
                 timeout=self.timeout,
             )
             response.raise_for_status()
-            return proxy
+            valid: Optional[str] = proxy
         except requests.RequestException:
-            return None
+            valid = None
+        if self.cache is not None:
+            self.cache.record(proxy, valid is not None)
+        return valid
 
-    def validate_proxies(self, proxy_list: set[str]) -> list[str]:
-        """Проверяет список прокси параллельно."""
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            valid_proxies = list(
-                filter(None, executor.map(self.validate_proxy, proxy_list))
-            )
-        return valid_proxies[: self.max_proxies]
+    def validate_proxies(
+        self, proxy_list: set[str], needed: Optional[int] = None
+    ) -> list[str]:
+        """Проверяет список прокси параллельно.
+
+        Проверка прекращается, как только найдено `needed` рабочих прокси
+        (по умолчанию `max_proxies`); оставшиеся задачи отменяются.
+        """
+        needed = self.max_proxies if needed is None else needed
+        valid_proxies: list[str] = []
+        if needed <= 0 or not proxy_list:
+            return valid_proxies
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.validation_workers, len(proxy_list))
+        )
+        try:
+            futures = [
+                executor.submit(self.validate_proxy, proxy)
+                for proxy in proxy_list
+            ]
+            for future in as_completed(futures):
+                proxy = future.result()
+                if proxy:
+                    valid_proxies.append(proxy)
+                if len(valid_proxies) >= needed:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return valid_proxies
+
+    def add_proxies(self, proxies: list[str]) -> None:
+        """Добавляет проверенные прокси, не превышая `max_proxies`.
+
+        В заполненном пуле новый прокси заменяет отключённый
+        предохранителем.
+        """
+        with self._lock:
+            for proxy in proxies:
+                if proxy in self.proxies:
+                    continue
+                if len(self.proxies) >= self.max_proxies:
+                    tripped: Optional[str] = next(
+                        (
+                            known
+                            for known in self.proxies
+                            if self._stats(known).is_open
+                        ),
+                        None,
+                    )
+                    if tripped is None:
+                        break
+                    self._eject(tripped)
+                self.proxies.append(proxy)
+
+    def free_slots(self) -> int:
+        """Сколько рабочих прокси не хватает до `max_proxies`."""
+        return self.max_proxies - len(self.healthy_proxies())
+
+    def healthy_proxies(self) -> list[str]:
+        """Прокси с закрытым предохранителем."""
+        with self._lock:
+            return [
+                proxy
+                for proxy in self.proxies
+                if not self._stats(proxy).is_open
+            ]
 
     def get_proxy(self) -> Optional[str]:
-        """Возвращает случайный рабочий прокси."""
+        """Возвращает рабочий прокси, выбранный с весом по его оценке."""
         if not self.proxies:
             logging.warning("Нет доступных прокси! Обновляем...")
             self.fetch_proxies()
-        return random.choice(self.proxies) if self.proxies else None
+        with self._lock:
+            candidates: list[str] = self.healthy_proxies()
+            if not candidates:
+                logging.warning("Все прокси отключены предохранителем.")
+                return None
+            weights = [self._stats(proxy).score for proxy in candidates]
+            return random.choices(candidates, weights=weights)[0]
+
+    def report(self, proxy: str, ok: bool, latency: float = 0.0) -> None:
+        """Учитывает результат запроса через прокси."""
+        with self._lock:
+            if proxy not in self.proxies:
+                return
+            stats = self._stats(proxy)
+            stats.update(ok, latency, self.alpha)
+            if not ok and stats.failures >= self.failure_threshold:
+                if not stats.is_open:
+                    logging.info(
+                        f"Прокси {proxy} отключён после "
+                        f"{stats.failures} ошибок подряд"
+                    )
+                stats.opened_at = time.monotonic()
+
+    def revalidate(self) -> None:
+        """Перепроверяет отключённые прокси и добирает пул до нормы."""
+        now: float = time.monotonic()
+        with self._lock:
+            due: list[str] = [
+                proxy
+                for proxy in self.proxies
+                if self._stats(proxy).is_open
+                and now - (self._stats(proxy).opened_at or now)
+                >= self.cooldown
+            ]
+        for proxy in due:
+            started: float = time.monotonic()
+            alive: bool = self.validate_proxy(proxy) is not None
+            with self._lock:
+                if alive:
+                    stats = self._stats(proxy)
+                    stats.update(True, time.monotonic() - started, self.alpha)
+                    stats.opened_at = None
+                else:
+                    self._eject(proxy)
+        if due and self.cache is not None:
+            self.cache.save()
+        if len(self.healthy_proxies()) < self.max_proxies // 2:
+            self.fetch_proxies()
+
+    def start_revalidation(
+        self, interval: float = PROXY_REVALIDATE_INTERVAL
+    ) -> None:
+        """Запускает фоновую перепроверку пула."""
+        if self._revalidator is not None:
+            return
+        self._stop.clear()
+        self._revalidator = threading.Thread(
+            target=self._revalidate_loop,
+            args=(interval,),
+            name="proxy-revalidation",
+            daemon=True,
+        )
+        self._revalidator.start()
+
+    def stop_revalidation(self) -> None:
+        """Останавливает перепроверку, не дожидаясь текущей проверки."""
+        self._stop.set()
+        self._revalidator = None
+
+    def _revalidate_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.revalidate()
+            except Exception as err_msg:
+                logging.warning(f"Ошибка перепроверки прокси: {err_msg}")
+
+    def _stats(self, proxy: str) -> ProxyStats:
+        if proxy not in self.stats:
+            self.stats[proxy] = ProxyStats()
+        return self.stats[proxy]
+
+    def _eject(self, proxy: str) -> None:
+        logging.info(f"Прокси {proxy} удалён из пула")
+        self.proxies.remove(proxy)
+        self.stats.pop(proxy, None)
 
 
 if __name__ == "__main__":
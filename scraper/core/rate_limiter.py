@@ -0,0 +1,22 @@
+import threading
+import time
+
+__all__ = ["RateLimiter"]
+
+
+class RateLimiter:
+    """Потокобезопасный ограничитель частоты запросов (запросов в секунду)."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval: float = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: float = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Блокирует поток до наступления следующего разрешённого слота."""
+        with self._lock:
+            now: float = time.monotonic()
+            wait: float = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,62 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Optional
+
+from .config import SESSION_FILE, SESSION_TTL
+
+__all__ = ["SessionStore"]
+
+
+class SessionStore:
+    """Хранит состояние браузера (куки, localStorage) между запусками.
+
+    Файл совместим с `storage_state` Playwright и дополнен временем
+    сохранения, по которому определяется срок годности сессии.
+    """
+
+    def __init__(
+        self, path: str = SESSION_FILE, ttl: int = SESSION_TTL
+    ) -> None:
+        self.path: str = path
+        self.ttl: int = ttl
+
+    def load(self) -> Optional[dict[str, Any]]:
+        """Возвращает сохранённое состояние, если оно ещё действует."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                state: dict[str, Any] = json.load(file)
+        except (OSError, ValueError) as err_msg:
+            logging.warning(f"Не удалось прочитать сессию: {err_msg}")
+            return None
+
+        now: float = time.time()
+        if now - state.pop("saved_at", 0) > self.ttl:
+            logging.info("Сохранённая сессия устарела")
+            return None
+        state["cookies"] = [
+            cookie
+            for cookie in state.get("cookies", [])
+            if cookie.get("expires", -1) <= 0 or cookie["expires"] > now
+        ]
+        if not state["cookies"]:
+            return None
+        return state
+
+    def save(self, state: dict[str, Any]) -> None:
+        """Сохраняет состояние браузера с отметкой времени."""
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(
+                {**state, "saved_at": time.time()}, file, ensure_ascii=False
+            )
+        logging.debug(f"Сессия сохранена в {self.path}")
+
+    def cookies(self) -> dict[str, str]:
+        """Куки действующей сессии в виде имя -> значение."""
+        state = self.load()
+        if state is None:
+            return {}
+        return {cookie["name"]: cookie["value"] for cookie in state["cookies"]}
@@ -1,103 +1,139 @@
 import logging
 from typing import Any, Optional
 
-import requests
-
-from .config import (
-    DEFAULT_TIMEOUT,
-    PROXY_SCRAPER_TIME_OUT,
-    SCRAPER_API_KEY,
-    SCRAPER_API_TIME_OUT,
+import httpx
+
+from .async_strategies import (
+    AsyncBaseScraper,
+    AsyncFallbackScraper,
+    AsyncProxyScraper,
+    AsyncScraperAPIScraper,
+    AsyncStandardScraper,
+    run_sync,
 )
+from .config import SCRAPER_API_RENDER
+from .metrics import metrics
 from .proxy_manager import ProxyManager
 
+STRATEGY_NAMES: tuple[str, ...] = (
+    "standard",
+    "proxy",
+    "scraperapi",
+    "fallback",
+)
+
 
 class BaseScraper:
     """Базовый класс для всех стратегий скрапинга."""
 
-    def __init__(self) -> None:
-        self.session = requests.Session()
-
     def fetch(
         self, url: str, headers: dict[str, str], cookies: dict[str, str]
     ) -> Optional[dict[str, Any]]:
+        """Выполняет запрос и возвращает разобранный JSON."""
+        with metrics.timer("fetch"):
+            response = self.request(url, headers, cookies)
+        if response is None:
+            metrics.error("fetch", "NoResponse")
+            return None
+        metrics.add_bytes("fetch", len(response.content))
+        try:
+            return response.json()
+        except ValueError as err_msg:
+            metrics.error("fetch", type(err_msg).__name__)
+            logging.warning(f"Некорректный JSON от {url}: {err_msg}")
+            return None
+
+    def request(
+        self, url: str, headers: dict[str, str], cookies: dict[str, str]
+    ) -> Optional[httpx.Response]:
         raise NotImplementedError(
-            "Метод fetch() должен быть реализован в подклассах."
+            "Метод request() должен быть реализован в подклассах."
         )
 
 
-class StandardScraper(BaseScraper):
-    """Прямой запрос без прокси."""
+class SyncScraper(BaseScraper):
+    """Синхронная обёртка над асинхронной стратегией.
 
-    def fetch(
+    Запросы выполняются на общем фоновом event loop, поэтому все потоки
+    используют один пул соединений асинхронной стратегии.
+    """
+
+    def __init__(self, async_strategy: AsyncBaseScraper) -> None:
+        self.async_strategy = async_strategy
+
+    def request(
         self, url: str, headers: dict[str, str], cookies: dict[str, str]
-    ) -> Optional[dict[str, Any]]:
-        try:
-            response = self.session.get(
-                url, headers=headers, cookies=cookies, timeout=DEFAULT_TIMEOUT
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as err_msg:
-            logging.warning(f"Ошибка запроса: {err_msg}")
-            return None
+    ) -> Optional[httpx.Response]:
+        return run_sync(self.async_strategy.request(url, headers, cookies))
 
+    def close(self) -> None:
+        run_sync(self.async_strategy.aclose())
 
-class ProxyScraper(BaseScraper):
-    """Скрапинг через проверенные прокси."""
+
+class StandardScraper(SyncScraper):
+    """Прямой запрос без прокси."""
 
     def __init__(self) -> None:
-        super().__init__()
-        self.proxy_manager = ProxyManager()
-        self.proxy_manager.fetch_proxies()
+        super().__init__(AsyncStandardScraper())
 
-    def fetch(
-        self, url: str, headers: dict[str, str], cookies: dict[str, str]
-    ) -> Optional[dict[str, Any]]:
-        proxy = self.proxy_manager.get_proxy()
-        if not proxy:
-            logging.error("Нет рабочих прокси!")
-            return None
-        try:
-            response = self.session.get(
-                url,
-                headers=headers,
-                cookies=cookies,
-                proxies={"http": proxy, "https": proxy},
-                timeout=PROXY_SCRAPER_TIME_OUT,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as err_msg:
-            logging.warning(f"Ошибка прокси ({proxy}): {err_msg}")
-            return None
 
+class ProxyScraper(SyncScraper):
+    """Скрапинг через проверенные прокси."""
 
-class ScraperAPIScraper(BaseScraper):
-    """Использование ScraperAPI."""
+    def __init__(self, proxy_manager: Optional[ProxyManager] = None) -> None:
+        async_strategy = AsyncProxyScraper(proxy_manager)
+        super().__init__(async_strategy)
+        self.proxy_manager = async_strategy.proxy_manager
 
-    BASE_URL: str = "http://api.scraperapi.com"
 
-    def fetch(
-        self, url: str, headers: dict[str, str], cookies: dict[str, str]
-    ) -> Optional[dict[str, Any]]:
-        params = {
-            "api_key": SCRAPER_API_KEY,
-            "url": url,
-            "keep_headers": "true",
-            "render": "true",
-        }
-        try:
-            response = self.session.get(
-                self.BASE_URL,
-                params=params,
-                headers=headers,
-                cookies=cookies,
-                timeout=SCRAPER_API_TIME_OUT,
-            )
-            response.raise_for_status()
-            logging.debug(f"Ответ ScraperAPI: {response.text[:200]}")
-            return response.json()
-        except requests.RequestException as err_msg:
-            logging.warning(f"Ошибка ScraperAPI: {err_msg}")
-            return None
+class ScraperAPIScraper(SyncScraper):
+    """Использование ScraperAPI."""
+
+    def __init__(self, render: str = SCRAPER_API_RENDER) -> None:
+        async_strategy = AsyncScraperAPIScraper(render=render)
+        super().__init__(async_strategy)
+        self.scraper_api = async_strategy
+
+    def stats(self) -> dict[str, int]:
+        return self.scraper_api.stats()
+
+    def log_stats(self) -> None:
+        self.scraper_api.log_stats()
+
+
+class FallbackScraper(SyncScraper):
+    """Цепочка standard -> proxy -> ScraperAPI с хедж-запросами."""
+
+    def __init__(
+        self,
+        tiers: Optional[list[AsyncBaseScraper]] = None,
+        render: str = SCRAPER_API_RENDER,
+    ) -> None:
+        if tiers is None:
+            tiers = [
+                AsyncStandardScraper(),
+                AsyncProxyScraper(),
+                AsyncScraperAPIScraper(render=render),
+            ]
+        async_strategy = AsyncFallbackScraper(tiers)
+        super().__init__(async_strategy)
+        self.fallback = async_strategy
+
+    def stats(self) -> dict[str, Any]:
+        return self.fallback.stats()
+
+    def log_stats(self) -> None:
+        self.fallback.log_stats()
+
+
+def build_strategy(name: str, render: str = SCRAPER_API_RENDER) -> BaseScraper:
+    """Создаёт стратегию по имени из CLI."""
+    if name == "proxy":
+        return ProxyScraper()
+    if name == "scraperapi":
+        return ScraperAPIScraper(render=render)
+    if name == "fallback":
+        return FallbackScraper(render=render)
+    if name == "standard":
+        return StandardScraper()
+    raise ValueError(f"Неизвестная стратегия: {name}")
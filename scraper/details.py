@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Callable, Optional
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
+from tqdm import tqdm
+
+from .core.browser import AsyncBrowserManager, RequestBlocker
+from .core.config import DEFAULT_WORKERS
+from .extraction import merge_details
+from .profiling import Profiler
+from .scraper import GoldScraper
+from .snapshots import SnapshotExtractor
+
+__all__ = ["DetailCrawler"]
+
+
+class DetailCrawler:
+    """Параллельный сбор деталей товаров пулом страниц Playwright.
+
+    С `snapshots` страницы только снимаются в HTML, а детали извлекаются
+    из снимков в пуле процессов; товар передаётся в `on_done` после
+    извлечения, пока воркер уже открывает следующую страницу. Вторым
+    аргументом `on_done` получает признак того, что детали получены.
+    """
+
+    def __init__(
+        self,
+        scraper: GoldScraper,
+        workers: int = DEFAULT_WORKERS,
+        headless: bool = True,
+        blocker: Optional[RequestBlocker] = None,
+        profiler: Optional[Profiler] = None,
+        snapshots: Optional[SnapshotExtractor] = None,
+    ) -> None:
+        self.scraper = scraper
+        self.workers: int = max(1, workers)
+        self.headless: bool = headless
+        self.blocker: Optional[RequestBlocker] = blocker
+        self.profiler: Optional[Profiler] = profiler
+        self.snapshots: Optional[SnapshotExtractor] = snapshots
+        self.errors: int = 0
+
+    def crawl(self, products: list[dict[str, str]]) -> list[dict[str, str]]:
+        """Дополняет товары деталями, запуская воркеры в event loop."""
+        return asyncio.run(self.crawl_async(products))
+
+    async def crawl_async(
+        self, products: list[dict[str, str]]
+    ) -> list[dict[str, str]]:
+        """Распределяет товары по воркерам через общую очередь."""
+        workers: int = min(self.workers, len(products))
+        if not workers:
+            return products
+
+        queue: asyncio.Queue[Optional[dict[str, str]]] = asyncio.Queue()
+        for product in products:
+            queue.put_nowait(product)
+        for _ in range(workers):
+            queue.put_nowait(None)
+
+        with tqdm(
+            total=len(products), desc="Парсинг деталей товаров"
+        ) as progress:
+            await self.run(
+                queue, lambda product, fetched: progress.update(1), workers
+            )
+        return products
+
+    def browser_manager(self) -> AsyncBrowserManager:
+        """Создаёт браузер с общей сессией скрапера."""
+        return AsyncBrowserManager(
+            headless=self.headless,
+            blocker=self.blocker,
+            session_store=self.scraper.headers_manager.session_store,
+        )
+
+    async def run(
+        self,
+        queue: asyncio.Queue[Optional[dict[str, str]]],
+        on_done: Callable[[dict[str, str], bool], None],
+        workers: Optional[int] = None,
+    ) -> None:
+        """Открывает браузер и запускает в нём воркеры."""
+        async with self.browser_manager() as browser:
+            await self.run_on(browser, queue, on_done, workers)
+
+    async def run_on(
+        self,
+        browser: AsyncBrowserManager,
+        queue: asyncio.Queue[Optional[dict[str, str]]],
+        on_done: Callable[[dict[str, str], bool], None],
+        workers: Optional[int] = None,
+    ) -> None:
+        """Запускает воркеры, читающие очередь до получения None.
+
+        Каждый воркер завершается на своём None, поэтому поставщик
+        должен положить в очередь по одному None на воркер.
+        """
+        workers = workers or self.workers
+        logging.info(f"Запуск {workers} воркеров для деталей товаров")
+        await asyncio.gather(
+            *(
+                self._worker(worker_id, browser, queue, on_done)
+                for worker_id in range(workers)
+            )
+        )
+        if self.snapshots is not None:
+            await self.snapshots.join()
+
+    async def _worker(
+        self,
+        worker_id: int,
+        browser: AsyncBrowserManager,
+        queue: asyncio.Queue[Optional[dict[str, str]]],
+        on_done: Callable[[dict[str, str], bool], None],
+    ) -> None:
+        """Обрабатывает товары из очереди на собственной странице.
+
+        При профилировании воркер работает в своём контексте браузера,
+        чтобы порции трассы Playwright не смешивались между воркерами.
+        """
+        context: Optional[AsyncBrowserContext] = None
+        if self.profiler is not None:
+            context = await browser.new_context()
+            await self.profiler.start_tracing(context)
+        page: AsyncPage = await self._new_page(browser, context)
+        try:
+            while (product := await queue.get()) is not None:
+                page = await self._process(
+                    worker_id, browser, page, product, on_done, context
+                )
+        finally:
+            if not page.is_closed():
+                await page.close()
+            if context is not None and self.profiler is not None:
+                await self.profiler.stop_tracing(context)
+                await context.close()
+
+    @staticmethod
+    async def _new_page(
+        browser: AsyncBrowserManager, context: Optional[AsyncBrowserContext]
+    ) -> AsyncPage:
+        if context is None:
+            return await browser.new_page()
+        return await context.new_page()
+
+    def _trace(
+        self,
+        context: Optional[AsyncBrowserContext],
+        worker_id: int,
+        product: dict[str, str],
+    ) -> AbstractAsyncContextManager[None]:
+        """Трасса страницы товара при профилировании, иначе заглушка."""
+        if context is None or self.profiler is None:
+            return nullcontext()
+        return self.profiler.trace(context, worker_id, product["link"])
+
+    async def _process(
+        self,
+        worker_id: int,
+        browser: AsyncBrowserManager,
+        page: AsyncPage,
+        product: dict[str, str],
+        on_done: Callable[[dict[str, str], bool], None],
+        context: Optional[AsyncBrowserContext] = None,
+    ) -> AsyncPage:
+        """Обрабатывает товар, изолируя ошибки внутри воркера."""
+        html: Optional[str] = None
+        fetched: bool = False
+        try:
+            async with self._trace(context, worker_id, product):
+                if self.snapshots is not None:
+                    html = await self.scraper.capture_product_html_async(
+                        product["link"], page
+                    )
+                else:
+                    merge_details(
+                        product,
+                        await self.scraper.fetch_product_details_async(
+                            product["link"], page
+                        ),
+                    )
+            fetched = True
+        except Exception as err_msg:
+            self.errors += 1
+            logging.error(
+                f"Воркер {worker_id}: ошибка на {product.get('link')}: "
+                f"{err_msg}"
+            )
+        if html is not None and self.snapshots is not None:
+            await self.snapshots.submit(
+                product,
+                html,
+                lambda details: self._finish(product, details, on_done),
+            )
+        else:
+            on_done(product, fetched)
+        if page.is_closed():
+            logging.warning(f"Воркер {worker_id}: страница закрыта, новая")
+            page = await self._new_page(browser, context)
+        return page
+
+    @staticmethod
+    def _finish(
+        product: dict[str, str],
+        details: dict[str, str],
+        on_done: Callable[[dict[str, str], bool], None],
+    ) -> None:
+        """Дополняет товар деталями из снимка и передаёт его дальше.
+
+        Пустые детали означают ошибку разбора снимка.
+        """
+        merge_details(product, details)
+        on_done(product, bool(details))
@@ -0,0 +1,385 @@
+import re
+from collections.abc import Mapping, MutableMapping
+from html.parser import HTMLParser
+from typing import Any, NamedTuple, Optional
+
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page
+
+from .core.config import EXTRACTION_TAB_TIMEOUT_MS, PRODUCT_READY_SELECTOR
+
+__all__ = [
+    "DetailExtractor",
+    "ExtractionSpec",
+    "FieldSpec",
+    "PRODUCT_DETAILS_SPEC",
+    "merge_details",
+]
+
+# Общие функции страницы для EXTRACT_JS и CAPTURE_JS: ожидание смены
+# панели через MutationObserver (без фиксированных пауз), поиск панелей
+# и проверка, что вкладка уже открыта (клик по ней панель не меняет).
+_JS_HELPERS: str = """
+  const visible = (el) => !!el && el.getClientRects().length > 0;
+  const active = (el) => el.getAttribute("aria-selected") === "true"
+    || /active|selected/i.test(el.className);
+  const panels = () => [...document.querySelectorAll(panelSelector)];
+  const shownPanel = () => panels().find(visible) || findPanel(null);
+  const snapshot = () => panels().map((el) => el.innerText).join("\\u0000");
+  const findPanel = (contains) => {
+    const re = contains ? new RegExp(contains, "i") : null;
+    return panels().find((el) => !re || re.test(el.innerText)) || null;
+  };
+  const waitFor = (check) => new Promise((resolve) => {
+    const ready = check();
+    if (ready) {
+      resolve(ready);
+      return;
+    }
+    const observer = new MutationObserver(() => {
+      const value = check();
+      if (value) {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(value);
+      }
+    });
+    const timer = setTimeout(() => {
+      observer.disconnect();
+      resolve(null);
+    }, timeout);
+    observer.observe(document.body, {
+      childList: true, subtree: true, characterData: true,
+    });
+  });
+  const byXPath = (xpath) => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null,
+  ).singleNodeValue;
+"""
+
+# Выполняется в странице целиком: находит вкладку, кликает (если она
+# ещё не открыта), ждёт смены панели и читает текст.
+# Возвращает {поле: [текст, получен_из_вкладки]}.
+EXTRACT_JS: str = (
+    "async ({ tabSelector, panelSelector, timeout, fields }) => {"
+    + _JS_HELPERS
+    + """
+  const result = {};
+  for (const field of fields) {
+    const label = new RegExp(field.tab, "i");
+    const tab = [...document.querySelectorAll(tabSelector)].find(
+      (el) => visible(el) && label.test(el.textContent),
+    );
+    if (tab) {
+      let panel = field.contains ? findPanel(field.contains) : null;
+      if (!panel && active(tab)) {
+        panel = field.contains ? null : shownPanel();
+      } else if (!panel) {
+        const before = snapshot();
+        tab.click();
+        panel = await waitFor(() => (
+          field.contains
+            ? findPanel(field.contains)
+            : snapshot() !== before && findPanel(null)
+        )) || findPanel(field.contains);
+      }
+      result[field.name] = [panel ? panel.innerText : null, true];
+      continue;
+    }
+    const element = field.fallback ? byXPath(field.fallback) : null;
+    result[field.name] = [
+      visible(element) ? element.innerText : null, false,
+    ];
+  }
+  return result;
+}
+"""
+)
+
+# Раскрывает все вкладки и возвращает HTML страницы без скриптов и стилей;
+# содержимое каждой вкладки дописывается в конец <body> элементом
+# <section data-snapshot-tab="подпись">, чтобы разбирать его офлайн.
+CAPTURE_JS: str = (
+    "async ({ tabSelector, panelSelector, timeout }) => {"
+    + _JS_HELPERS
+    + """
+  const captured = [];
+  const tabs = [...document.querySelectorAll(tabSelector)].filter(visible);
+  for (const tab of tabs) {
+    if (!active(tab)) {
+      const before = snapshot();
+      tab.click();
+      await waitFor(() => snapshot() !== before);
+    }
+    const panel = shownPanel();
+    captured.push([tab.textContent.trim(), panel ? panel.innerHTML : ""]);
+  }
+  const root = document.documentElement.cloneNode(true);
+  root.querySelectorAll(
+    "script, style, noscript, svg, link, iframe, template",
+  ).forEach((el) => el.remove());
+  const body = root.querySelector("body") || root;
+  for (const [label, html] of captured) {
+    const section = document.createElement("section");
+    section.setAttribute("data-snapshot-tab", label);
+    section.innerHTML = html;
+    body.appendChild(section);
+  }
+  return "<!DOCTYPE html>\\n" + root.outerHTML;
+}
+"""
+)
+
+SNAPSHOT_TAB_ATTRIBUTE: str = "data-snapshot-tab"
+BLOCK_TAGS: frozenset[str] = frozenset(
+    "article br dd div dl dt footer h1 h2 h3 h4 h5 h6 header hr li main "
+    "ol p section table td th tr ul".split()
+)
+SKIPPED_TAGS: frozenset[str] = frozenset({"script", "style", "noscript"})
+
+
+class _SnapshotHTMLParser(HTMLParser):
+    """Однопроходный разбор снимка страницы на тексты для извлечения.
+
+    Собирает текст вкладок (`section[data-snapshot-tab]`), панелей по
+    простому селектору `тег.класс` и построчный текст всей страницы;
+    переводы строк ставятся на границах блочных элементов, как в
+    `innerText`.
+    """
+
+    def __init__(self, panel_selector: str) -> None:
+        super().__init__()
+        tag, _, css_class = panel_selector.partition(".")
+        self.panel_tag: str = tag or "div"
+        self.panel_class: str = css_class
+        self.tabs: list[tuple[str, str]] = []
+        self.panels: list[str] = []
+        self.parts: list[str] = []
+        self._captures: list[list[Any]] = []
+        self._skip: int = 0
+
+    def handle_starttag(
+        self, tag: str, attrs: list[tuple[str, Optional[str]]]
+    ) -> None:
+        if tag in SKIPPED_TAGS:
+            self._skip += 1
+            return
+        for capture in self._captures:
+            if capture[0] == tag:
+                capture[1] += 1
+        attributes: dict[str, str] = {
+            name: value or "" for name, value in attrs
+        }
+        if tag == "section" and SNAPSHOT_TAB_ATTRIBUTE in attributes:
+            label: str = attributes[SNAPSHOT_TAB_ATTRIBUTE]
+            self._captures.append([tag, 1, [], label])
+        elif tag == self.panel_tag and (
+            self.panel_class in attributes.get("class", "").split()
+        ):
+            self._captures.append([tag, 1, [], None])
+        if tag in BLOCK_TAGS:
+            self._text("\n")
+
+    def handle_startendtag(
+        self, tag: str, attrs: list[tuple[str, Optional[str]]]
+    ) -> None:
+        if tag in BLOCK_TAGS:
+            self._text("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIPPED_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        if tag in BLOCK_TAGS:
+            self._text("\n")
+        for capture in list(self._captures):
+            if capture[0] != tag:
+                continue
+            capture[1] -= 1
+            if capture[1]:
+                continue
+            self._captures.remove(capture)
+            text: str = self.normalize("".join(capture[2]))
+            if capture[3] is None:
+                self.panels.append(text)
+            else:
+                self.tabs.append((capture[3], text))
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self._text(data)
+
+    def _text(self, data: str) -> None:
+        self.parts.append(data)
+        for capture in self._captures:
+            capture[2].append(data)
+
+    def lines(self) -> list[str]:
+        return self.normalize("".join(self.parts)).split("\n")
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Схлопывает пробелы в строках и убирает пустые строки."""
+        lines = (" ".join(line.split()) for line in text.split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+class FieldSpec(NamedTuple):
+    """Поле страницы товара.
+
+    `tab` - регулярное выражение подписи вкладки; `contains` - текст,
+    по которому выбирается панель (иначе - первая панель после смены);
+    `pattern` (группа 1) и `split` (берётся часть до совпадения)
+    применяются к тексту вкладки; `fallback` - XPath, если вкладки нет.
+    `tab` и `contains` проверяются в странице как RegExp JavaScript,
+    `pattern` и `split` - в Python модулем `re`.
+    """
+
+    name: str
+    tab: str
+    contains: Optional[str] = None
+    pattern: Optional[str] = None
+    split: Optional[str] = None
+    fallback: Optional[str] = None
+
+
+class ExtractionSpec(NamedTuple):
+    """Селекторы и поля, извлекаемые со страницы товара."""
+
+    fields: tuple[FieldSpec, ...]
+    tab_selector: str = "button.ga-tabs-tab"
+    panel_selector: str = "div.kDcPG"
+    ready_selector: str = PRODUCT_READY_SELECTOR
+    tab_timeout_ms: int = EXTRACTION_TAB_TIMEOUT_MS
+
+
+PRODUCT_DETAILS_SPEC = ExtractionSpec(
+    fields=(
+        FieldSpec(
+            name="country",
+            tab="Дополнительная информация",
+            contains="страна происхождения",
+            pattern=(
+                r"страна происхождения\s*[\n\r]*(.+?)"
+                r"(?:\s*изготовитель|<br>|$)"
+            ),
+            split=r"\s*(?:Продавец|изготовитель)",
+            fallback=(
+                "//div[contains(text(), 'страна происхождения')]"
+                "/following-sibling::div"
+            ),
+        ),
+        FieldSpec(
+            name="usage",
+            tab="Применение",
+            fallback="//div[contains(@class, 'kDcPG')]",
+        ),
+    )
+)
+
+
+class DetailExtractor:
+    """Извлекает все поля страницы товара одним вызовом `evaluate`.
+
+    Вкладки кликаются и читаются внутри страницы, поэтому на товар
+    приходится один обмен с браузером вместо десятков вызовов локаторов,
+    а ожидание панели длится ровно до её обновления. В режиме снимков
+    браузер только сохраняет HTML (`capture`), а поля извлекаются из него
+    позже и вне браузера (`extract_html`).
+    """
+
+    def __init__(self, spec: ExtractionSpec = PRODUCT_DETAILS_SPEC) -> None:
+        self.spec: ExtractionSpec = spec
+        self.payload: dict[str, Any] = {
+            "tabSelector": spec.tab_selector,
+            "panelSelector": spec.panel_selector,
+            "timeout": spec.tab_timeout_ms,
+            "fields": [field._asdict() for field in spec.fields],
+        }
+
+    def extract(self, page: Page) -> dict[str, str]:
+        """Извлекает поля со страницы синхронного Playwright."""
+        return self.postprocess(page.evaluate(EXTRACT_JS, self.payload))
+
+    async def extract_async(self, page: AsyncPage) -> dict[str, str]:
+        """Извлекает поля со страницы асинхронного Playwright."""
+        return self.postprocess(await page.evaluate(EXTRACT_JS, self.payload))
+
+    def capture(self, page: Page) -> str:
+        """Снимок HTML страницы с раскрытыми вкладками (синхронно)."""
+        return page.evaluate(CAPTURE_JS, self.payload)
+
+    async def capture_async(self, page: AsyncPage) -> str:
+        """Снимок HTML страницы с раскрытыми вкладками."""
+        return await page.evaluate(CAPTURE_JS, self.payload)
+
+    def extract_html(self, html: str) -> dict[str, str]:
+        """Извлекает поля из снимка `capture` без браузера.
+
+        Поле берётся из вкладки с подходящей подписью; если вкладки нет,
+        XPath-запасной вариант заменяется его офлайн-аналогом: строка
+        после строки с `contains` или первая панель.
+        """
+        parser = _SnapshotHTMLParser(self.spec.panel_selector)
+        parser.feed(html)
+        parser.close()
+        result: dict[str, str] = {}
+        for field in self.spec.fields:
+            text, from_tab = self._snapshot_text(field, parser)
+            result[field.name] = self.clean(field, text, from_tab)
+        return result
+
+    @staticmethod
+    def _snapshot_text(
+        field: FieldSpec, parser: _SnapshotHTMLParser
+    ) -> tuple[Optional[str], bool]:
+        tabs: list[str] = [
+            text
+            for label, text in parser.tabs
+            if re.search(field.tab, label, re.IGNORECASE)
+        ]
+        if tabs:
+            for text in tabs:
+                if not field.contains or re.search(
+                    field.contains, text, re.IGNORECASE
+                ):
+                    return text, True
+            return tabs[0], True
+        if field.contains:
+            lines: list[str] = parser.lines()
+            for index, line in enumerate(lines[:-1]):
+                if re.search(field.contains, line, re.IGNORECASE):
+                    return lines[index + 1], False
+            return None, False
+        return (parser.panels[0] if parser.panels else None), False
+
+    def postprocess(self, raw: Optional[dict[str, Any]]) -> dict[str, str]:
+        """Применяет регулярные выражения спецификации к текстам полей."""
+        result: dict[str, str] = {}
+        for field in self.spec.fields:
+            text, from_tab = (raw or {}).get(field.name) or (None, False)
+            result[field.name] = self.clean(field, text, from_tab)
+        return result
+
+    @staticmethod
+    def clean(field: FieldSpec, text: Optional[str], from_tab: bool) -> str:
+        if not text:
+            return "N/A"
+        value: str = text
+        if from_tab and field.pattern:
+            match = re.search(field.pattern, value, re.IGNORECASE | re.DOTALL)
+            if not match:
+                return "N/A"
+            value = match.group(1)
+        if from_tab and field.split:
+            value = re.split(field.split, value.strip())[0]
+        return value.strip() or "N/A"
+
+
+def merge_details(
+    product: MutableMapping[str, Any], details: Mapping[str, str]
+) -> None:
+    """Дополняет товар деталями, не затирая известные значения "N/A"."""
+    for key, value in details.items():
+        if value != "N/A" or key not in product:
+            product[key] = value
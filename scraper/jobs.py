@@ -0,0 +1,288 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Any, Callable, NamedTuple, Optional
+
+from tqdm import tqdm
+
+from .core.browser import RequestBlocker
+from .core.cache import CachedScraper
+from .core.config import (
+    DEFAULT_CITY_ID,
+    DEFAULT_WORKERS,
+    JOURNAL_FILE,
+    METRICS_JSON_FILE,
+    METRICS_PROM_FILE,
+    PROFILE_SLOW_SECONDS,
+    PROFILE_TRACE_SAMPLE,
+    SCRAPER_API_RENDER,
+    STATE_MAX_AGE_DAYS,
+)
+from .core.headers_manager import HeadersManager
+from .core.metrics import metrics
+from .core.strategies import build_strategy
+from .parser import GoldParser
+from .pipeline import CrawlPipeline
+from .profiling import Profiler
+from .scraper import GoldScraper
+from .utils.dedup import SharedKeySet
+from .utils.journal import Journal
+from .utils.state import ProductStateStore
+from .utils.writer import BaseWriter
+
+__all__ = [
+    "CrawlJob",
+    "JobScheduler",
+    "JobSettings",
+    "load_jobs",
+    "parse_job",
+    "run_job",
+]
+
+
+class CrawlJob(NamedTuple):
+    """Пара категория/город и число страниц каталога (None - все)."""
+
+    category_id: str
+    city_id: str = DEFAULT_CITY_ID
+    max_pages: Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.category_id}@{self.city_id}"
+
+    @property
+    def journal_file(self) -> str:
+        return self.file_for(JOURNAL_FILE)
+
+    def file_for(self, filename: str) -> str:
+        """Имя файла задания: категория и город перед расширением."""
+        stem, extension = os.path.splitext(filename)
+        return f"{stem}.{self.category_id}.{self.city_id}{extension}"
+
+
+class JobSettings(NamedTuple):
+    """Общие для всех заданий настройки запуска (из CLI)."""
+
+    scraper: str = "standard"
+    render: str = SCRAPER_API_RENDER
+    details: str = "api"
+    workers: int = DEFAULT_WORKERS
+    requests_per_second: float = 0
+    limit: Optional[int] = None
+    cache: bool = False
+    max_age_days: float = STATE_MAX_AGE_DAYS
+    block: bool = True
+    resume: bool = False
+    stop_early: bool = False
+    metrics_dir: str = "."
+    profile_dir: Optional[str] = None
+    trace_sample: float = PROFILE_TRACE_SAMPLE
+    trace_slow: float = PROFILE_SLOW_SECONDS
+
+
+def parse_job(value: str, max_pages: Optional[int] = None) -> CrawlJob:
+    """Разбирает задание вида `КАТЕГОРИЯ[:ГОРОД]`."""
+    category_id, _, city_id = value.partition(":")
+    if not category_id:
+        raise ValueError(f"Не указана категория в задании: {value}")
+    return CrawlJob(category_id, city_id or DEFAULT_CITY_ID, max_pages)
+
+
+def load_jobs(path: str, max_pages: Optional[int] = None) -> list[CrawlJob]:
+    """Читает JSON-список заданий.
+
+    Каждый элемент - объект с `category_id`, необязательными `city_id`
+    и `pages` (число или "all"); без `pages` берётся `max_pages`.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        specs: list[dict[str, Any]] = json.load(file)
+    jobs: list[CrawlJob] = []
+    for spec in specs:
+        pages = spec.get("pages", max_pages)
+        jobs.append(
+            CrawlJob(
+                str(spec["category_id"]),
+                str(spec.get("city_id", DEFAULT_CITY_ID)),
+                None if pages == "all" else pages,
+            )
+        )
+    return jobs
+
+
+class _QueueWriter(BaseWriter):
+    """Передаёт готовые товары задания в общий вывод родителя."""
+
+    def __init__(self, output: "queue.Queue[Any]", label: str) -> None:
+        self.filename: str = label
+        self.output = output
+        self.label: str = label
+
+    def open(self) -> None:
+        return None
+
+    def append(self, product: dict[str, str]) -> None:
+        self.output.put((self.label, product))
+
+    def close(self) -> None:
+        return None
+
+
+def run_job(
+    job: CrawlJob,
+    settings: JobSettings,
+    seen: SharedKeySet,
+    output: "queue.Queue[Any]",
+) -> int:
+    """Выполняет одно задание в процессе пула."""
+    metrics.reset({"job": job.label})
+    profiler: Optional[Profiler] = None
+    if settings.profile_dir is not None:
+        profiler = Profiler(
+            os.path.join(settings.profile_dir, job.label),
+            settings.trace_sample,
+            settings.trace_slow,
+        )
+    with profiler or nullcontext():
+        return _run_pipeline(job, settings, seen, output, profiler)
+
+
+def _run_pipeline(
+    job: CrawlJob,
+    settings: JobSettings,
+    seen: SharedKeySet,
+    output: "queue.Queue[Any]",
+    profiler: Optional[Profiler],
+) -> int:
+    strategy = build_strategy(settings.scraper, settings.render)
+    if settings.cache:
+        strategy = CachedScraper(strategy)
+    scraper = GoldScraper(
+        strategy=strategy,
+        category_id=job.category_id,
+        city_id=job.city_id,
+        max_pages=job.max_pages,
+        requests_per_second=settings.requests_per_second,
+        headers_manager=HeadersManager(launch_browser=False),
+        stop_early=settings.stop_early,
+    )
+    state = ProductStateStore(max_age_days=settings.max_age_days)
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        _QueueWriter(output, job.label),
+        details=settings.details,
+        workers=settings.workers,
+        limit=settings.limit,
+        journal=Journal(job.journal_file),
+        resume=settings.resume,
+        blocker=(
+            RequestBlocker()
+            if settings.block
+            else RequestBlocker(resource_types=(), blocked_domains=())
+        ),
+        state=state,
+        seen=seen,
+        progress=False,
+        profiler=profiler,
+    )
+    try:
+        with state:
+            return pipeline.run()
+    finally:
+        metrics.export(
+            settings.metrics_dir,
+            job.file_for(METRICS_PROM_FILE),
+            job.file_for(METRICS_JSON_FILE),
+        )
+
+
+class JobScheduler:
+    """Распределяет задания по пулу процессов с общим выводом.
+
+    Товары, встречающиеся в нескольких категориях одного города,
+    отсеиваются общим множеством ключей. Все процессы передают готовые
+    товары родителю, который пишет их в один файл и ведёт прогресс по
+    заданиям. Лимит запросов в секунду делится между процессами.
+    """
+
+    def __init__(
+        self,
+        jobs: list[CrawlJob],
+        settings: JobSettings,
+        writer: BaseWriter,
+        processes: Optional[int] = None,
+        runner: Callable[..., int] = run_job,
+    ) -> None:
+        self.jobs: list[CrawlJob] = jobs
+        self.processes: int = min(processes or os.cpu_count() or 1, len(jobs))
+        rate: float = settings.requests_per_second
+        self.settings: JobSettings = settings._replace(
+            requests_per_second=rate / self.processes
+        )
+        self.writer = writer
+        self.runner = runner
+        self.counts: Counter[str] = Counter()
+        # spawn: fork унаследовал бы блокировки потоков родителя (tqdm,
+        # логирование), захваченные в момент запуска процесса.
+        self.context = multiprocessing.get_context("spawn")
+
+    def run(self) -> dict[str, int]:
+        """Выполняет все задания и возвращает число товаров по каждому."""
+        results: dict[str, int] = {}
+        with self.context.Manager() as manager, self.writer:
+            seen = SharedKeySet(manager.dict())
+            output = manager.Queue(maxsize=1000)
+            consumer = threading.Thread(target=self._consume, args=(output,))
+            consumer.start()
+            try:
+                results = self._dispatch(seen, output)
+            finally:
+                output.put(None)
+                consumer.join()
+        logging.info(
+            f"Заданий выполнено: {len(results)}, "
+            f"товаров записано: {sum(self.counts.values())}"
+        )
+        return results
+
+    def _dispatch(
+        self, seen: SharedKeySet, output: "queue.Queue[Any]"
+    ) -> dict[str, int]:
+        results: dict[str, int] = {}
+        with ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=self.context
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self.runner, job, self.settings, seen, output
+                ): job
+                for job in self.jobs
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    results[job.label] = future.result()
+                    logging.info(
+                        f"Задание {job.label}: записано "
+                        f"{results[job.label]} товаров"
+                    )
+                except Exception as err_msg:
+                    logging.error(f"Задание {job.label} упало: {err_msg}")
+        return results
+
+    def _consume(self, output: "queue.Queue[Any]") -> None:
+        """Пишет товары всех заданий в общий вывод."""
+        with tqdm(desc="Товары", unit="шт") as progress:
+            while (item := output.get()) is not None:
+                label, product = item
+                self.writer.append(product)
+                self.counts[label] += 1
+                progress.update(1)
+                progress.set_postfix_str(f"{label}: {self.counts[label]}")
@@ -1,9 +1,14 @@
 import logging
+import math
 import re
-from typing import Any
+from typing import Any, Callable, Optional
 
 from playwright.sync_api import Page
 
+from scraper.core.config import PRODUCT_READY_TIMEOUT_MS, SITE_URL
+from scraper.extraction import DetailExtractor
+from scraper.record import ProductRecord
+
 __all__ = ["GoldParser"]
 
 
@@ -14,7 +19,8 @@ class GoldParser:
     def parse_product(product: dict[str, Any]) -> dict[str, str]:
         """Извлекает основные данные из списка товаров."""
         return {
-            "link": f"https://goldapple.ru{product.get('url', '')}",
+            "id": str(product.get("itemId", "")),
+            "link": f"{SITE_URL}{product.get('url', '')}",
             "name": (
                 f"{product.get('brand', '')} "
                 f"{product.get('name', '')}".strip()
@@ -29,51 +35,126 @@ class GoldParser:
         }
 
     @staticmethod
-    def parse_product_details(page: Page) -> dict[str, str]:
-        """Извлекает инструкцию по применению и страну производства."""
-        usage: str = "N/A"
-        country: str = "N/A"
+    def parse_page(products: list[dict[str, Any]]) -> list[ProductRecord]:
+        """Разбирает массив `products` страницы API в записи за один вызов.
 
-        try:
-            page.wait_for_selector(".bOhy3", timeout=10000)
-            extra_info_tab = page.locator(
-                "button.ga-tabs-tab",
-                has_text=re.compile(
-                    "Дополнительная информация", re.IGNORECASE
-                ),
+        В отличие от `parse_product` возвращает компактные записи с
+        числовыми ценой и рейтингом. Имена, нужные в цикле, связаны
+        локально, пустые вложенные объекты не создаются на каждый товар,
+        а уже числовые значения из JSON не проходят через `parse_number`.
+        """
+        site_url: str = SITE_URL
+        record = ProductRecord
+        number = GoldParser.parse_number
+        empty: dict[str, Any] = {}
+        records: list[ProductRecord] = []
+        append = records.append
+        for raw in products:
+            price = raw.get("price") or empty
+            amount = (price.get("actual") or empty).get("amount")
+            rating = (raw.get("reviews") or empty).get("rating")
+            append(
+                record(
+                    str(raw.get("itemId") or ""),
+                    site_url + raw.get("url", ""),
+                    f"{raw.get('brand', '')} {raw.get('name', '')}".strip(),
+                    amount if type(amount) is int else number(int, amount),
+                    (
+                        rating
+                        if type(rating) is float
+                        else number(float, rating)
+                    ),
+                    raw.get("productType"),
+                )
             )
-            if extra_info_tab.is_visible():
-                extra_info_tab.click()
-                page.wait_for_timeout(1000)
+        return records
 
-            country_locator = page.locator(
-                "div.kDcPG",
-                has_text=re.compile("страна происхождения", re.IGNORECASE),
-            )
-            if country_locator.count() > 0:
-                full_text = country_locator.inner_text()
-                country_match = re.search(
-                    r"страна происхождения\s*[\n\r]*(.+?)"
-                    r"(?:\s*изготовитель|<br>|$)",
-                    full_text,
-                    re.IGNORECASE | re.DOTALL,
+    @staticmethod
+    def parse_number(kind: Callable[[float], Any], value: Any) -> Any:
+        """Приводит число из API к `kind`, нечисловое значение - к None."""
+        if value is None:
+            return None
+        try:
+            return kind(float(value))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def parse_total_pages(
+        data: dict[str, Any], page_size: int
+    ) -> Optional[int]:
+        """Вычисляет число страниц каталога по первому ответу API."""
+        payload: dict[str, Any] = data.get("data") or {}
+        count = payload.get("count") or payload.get("totalCount")
+        if not count or not page_size:
+            return None
+        return math.ceil(int(count) / page_size)
+
+    @staticmethod
+    def parse_product_card(data: Optional[dict[str, Any]]) -> dict[str, str]:
+        """Извлекает применение и страну из JSON карточки товара."""
+        usage: str = "N/A"
+        country: str = "N/A"
+        card: dict[str, Any] = (data or {}).get("data") or {}
+        for section in card.get("productDescription") or []:
+            title: str = section.get("text") or ""
+            content: str = GoldParser.strip_html(section.get("content") or "")
+            if usage == "N/A" and re.search(
+                "Применение", title, re.IGNORECASE
+            ):
+                usage = content or "N/A"
+            if country == "N/A":
+                country = GoldParser.parse_section_country(
+                    section, title, content
                 )
-                if country_match:
-                    country = country_match.group(1).strip()
-                    country = re.split(
-                        r"\s*(?:Продавец|изготовитель)", country
-                    )[0].strip()
+        return {"usage": usage, "country": country}
+
+    @staticmethod
+    def parse_section_country(
+        section: dict[str, Any], title: str, content: str
+    ) -> str:
+        """Ищет страну в атрибутах или тексте раздела карточки."""
+        for attribute in section.get("attributes") or []:
+            if re.search(
+                "страна происхождения",
+                attribute.get("name") or "",
+                re.IGNORECASE,
+            ):
+                return str(attribute.get("value") or "").strip() or "N/A"
+        if re.search("Дополнительная информация", title, re.IGNORECASE):
+            return GoldParser.extract_country(content)
+        return "N/A"
+
+    @staticmethod
+    def extract_country(text: str) -> str:
+        """Извлекает страну происхождения из текста блока с атрибутами."""
+        country_match = re.search(
+            r"страна происхождения\s*[\n\r]*(.+?)"
+            r"(?:\s*изготовитель|<br>|$)",
+            text,
+            re.IGNORECASE | re.DOTALL,
+        )
+        if not country_match:
+            return "N/A"
+        country: str = country_match.group(1).strip()
+        return re.split(r"\s*(?:Продавец|изготовитель)", country)[0].strip()
 
-            usage_tab = page.locator(
-                "button.ga-tabs-tab",
-                has_text=re.compile("Применение", re.IGNORECASE),
+    @staticmethod
+    def strip_html(html: str) -> str:
+        """Удаляет HTML-теги и лишние пробелы."""
+        text: str = re.sub(r"<br\s*/?>", "\n", html, flags=re.IGNORECASE)
+        text = re.sub(r"<[^>]+>", "", text)
+        return re.sub(r"[ \t]+", " ", text).strip()
+
+    @staticmethod
+    def parse_product_details(page: Page) -> dict[str, str]:
+        """Извлекает инструкцию по применению и страну производства."""
+        extractor = DetailExtractor()
+        try:
+            page.wait_for_selector(
+                extractor.spec.ready_selector, timeout=PRODUCT_READY_TIMEOUT_MS
             )
-            if usage_tab.is_visible():
-                usage_tab.click()
-                page.wait_for_timeout(1000)
-                usage_locator = page.locator("div.kDcPG")
-                if usage_locator.count() > 0:
-                    usage = usage_locator.first.inner_text().strip()
+            return extractor.extract(page)
         except Exception as err_msg:
             logging.debug(f"Ошибка парсинга деталей: {err_msg}")
-        return {"usage": usage, "country": country}
+        return {"usage": "N/A", "country": "N/A"}
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional
+
+from tqdm import tqdm
+
+from .browser_pool import BrowserPool
+from .core.browser import AsyncBrowserManager, RequestBlocker
+from .core.config import DEFAULT_WORKERS
+from .core.metrics import metrics
+from .details import DetailCrawler
+from .parser import GoldParser
+from .profiling import Profiler
+from .record import ProductRecord
+from .scraper import GoldScraper
+from .snapshots import SnapshotExtractor
+from .utils.dedup import SharedKeySet
+from .utils.journal import Journal
+from .utils.state import ProductStateStore
+from .utils.writer import BaseWriter
+
+__all__ = ["CrawlPipeline"]
+
+
+class CrawlPipeline:
+    """Потоковый конвейер: каталог -> парсинг -> детали -> запись.
+
+    Товары проходят через стадии постранично и записываются по мере
+    готовности, а очереди между стадиями ограничены, поэтому память
+    не растёт вместе с размером каталога. Режим деталей `api-only`
+    обходится без браузера, если есть сохранённая сессия. Общий `seen`
+    отсеивает товары, уже взятые другими заданиями (товар встречается
+    в нескольких категориях).
+    С `snapshots` браузер только сохраняет снимки страниц, а детали
+    извлекаются из них в пуле процессов. С `pool` детали собираются в
+    пуле процессов, у каждого из которых свой браузер.
+    """
+
+    def __init__(
+        self,
+        scraper: GoldScraper,
+        parser: GoldParser,
+        writer: BaseWriter,
+        details: str = "api",
+        workers: int = DEFAULT_WORKERS,
+        limit: Optional[int] = None,
+        headless: bool = True,
+        journal: Optional[Journal] = None,
+        resume: bool = False,
+        blocker: Optional[RequestBlocker] = None,
+        state: Optional[ProductStateStore] = None,
+        seen: Optional[SharedKeySet] = None,
+        progress: bool = True,
+        profiler: Optional[Profiler] = None,
+        snapshots: Optional[SnapshotExtractor] = None,
+        pool: Optional[BrowserPool] = None,
+    ) -> None:
+        self.scraper = scraper
+        self.parser = parser
+        self.writer = writer
+        self.details: str = details
+        self.limit: Optional[int] = limit
+        self.journal: Journal = journal or Journal()
+        self.resume: bool = resume
+        self.done_keys: set[str] = set()
+        self.state: Optional[ProductStateStore] = state
+        self.seen: Optional[SharedKeySet] = seen
+        self.progress: bool = progress
+        self.crawler = DetailCrawler(
+            scraper, workers, headless, blocker, profiler, snapshots
+        )
+        self.pool: Optional[BrowserPool] = pool
+        self.written: int = 0
+        self._progress: Optional[tqdm] = None
+
+    def run(self) -> int:
+        """Запускает конвейер и возвращает число записанных товаров."""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> int:
+        """Связывает поставщика товаров и воркеры браузера очередью."""
+        workers: int = self.crawler.workers
+        queue: asyncio.Queue[Optional[ProductRecord]] = asyncio.Queue(
+            maxsize=workers * 2
+        )
+        if self.resume:
+            self.done_keys = self.journal.load_keys()
+            logging.info(
+                f"Возобновление: {len(self.done_keys)} товаров уже готово"
+            )
+        self.journal.open(resume=self.resume)
+        with (
+            self.journal,
+            self.writer,
+            tqdm(
+                desc="Товары", unit="шт", disable=not self.progress
+            ) as progress,
+        ):
+            self._progress = progress
+            if self.resume:
+                self._replay_journal()
+            if self.details == "api-only":
+                await self._ensure_saved_session()
+                await self._produce(queue, workers)
+            elif self.pool is not None:
+                await self._run_with_pool(queue)
+            else:
+                await self._run_with_browser(queue, workers)
+        self._progress = None
+        if self.state is not None:
+            self.state.commit()
+        errors: int = self.crawler.errors + (
+            self.pool.errors if self.pool is not None else 0
+        )
+        if errors:
+            logging.warning(f"Ошибок при парсинге деталей: {errors}")
+        return self.written
+
+    async def _run_with_browser(
+        self,
+        queue: asyncio.Queue[Optional[ProductRecord]],
+        workers: int,
+    ) -> None:
+        """Запускает каталог и воркеры браузера в общем браузере."""
+        async with self.crawler.browser_manager() as browser:
+            await self._ensure_session(browser)
+            await asyncio.gather(
+                self._produce(queue, workers),
+                self.crawler.run_on(browser, queue, self._emit, workers),
+            )
+
+    async def _run_with_pool(
+        self, queue: asyncio.Queue[Optional[ProductRecord]]
+    ) -> None:
+        """Запускает каталог и пул процессов браузера.
+
+        Куки для API и процессов пула берутся во временном браузере,
+        только если сохранённой сессии нет.
+        """
+        if self.pool is None:
+            raise RuntimeError("Пул браузеров не задан")
+        await self._ensure_saved_session()
+        await asyncio.gather(
+            self._produce(queue, 1),
+            self.pool.run(queue, self._emit),
+        )
+
+    async def _ensure_saved_session(self) -> None:
+        """Берёт куки во временном браузере, если сохранённой сессии нет.
+
+        Нужен режимам без общего браузера (`api-only` и пул): куки
+        берутся один раз на запуск и сохраняются в сессию.
+        """
+        if self.scraper.headers_manager.has_cookies:
+            return
+        async with self.crawler.browser_manager() as browser:
+            await self._ensure_session(browser)
+
+    async def _ensure_session(self, browser: AsyncBrowserManager) -> None:
+        """Берёт куки для API из общего браузера, если сессии нет."""
+        headers_manager = self.scraper.headers_manager
+        if not headers_manager.has_cookies:
+            headers_manager.set_cookies(await browser.refresh_session())
+
+    async def _produce(
+        self,
+        queue: asyncio.Queue[Optional[ProductRecord]],
+        workers: int,
+    ) -> None:
+        """Читает каталог постранично и раздаёт товары по стадиям."""
+        pages: Iterator[list[dict[str, Any]]] = self.scraper.iter_pages()
+        produced: int = 0
+        try:
+            while self.limit is None or produced < self.limit:
+                raw_page = await asyncio.to_thread(next, pages, None)
+                if raw_page is None:
+                    break
+                if self.limit is not None:
+                    raw_page = raw_page[: self.limit - produced]
+                produced += len(raw_page)
+                products: list[ProductRecord] = self.parser.parse_page(
+                    raw_page
+                )
+                products = self._select(products)
+                if self.details != "browser":
+                    await self._enrich_from_api(products)
+                for product in products:
+                    if self._is_complete(product):
+                        self._emit(product)
+                    else:
+                        await queue.put(product)
+        finally:
+            pages.close()
+            for _ in range(workers):
+                await queue.put(None)
+        logging.info(
+            f"Каталог обработан: {produced} товаров, "
+            f"дубликатов пропущено: {self.scraper.duplicates}"
+        )
+
+    async def _enrich_from_api(self, products: list[ProductRecord]) -> None:
+        """Параллельно запрашивает карточки товаров одной страницы."""
+        details = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self.scraper.fetch_product_details_api, product.id
+                )
+                for product in products
+            )
+        )
+        for product, product_details in zip(products, details):
+            product.update(product_details)
+
+    def _is_complete(self, product: ProductRecord) -> bool:
+        """Проверяет, нужны ли товару детали из браузера."""
+        if self.details == "api-only":
+            return True
+        if self.details == "browser":
+            return False
+        return "N/A" not in (product["usage"], product["country"])
+
+    def _select(self, products: list[ProductRecord]) -> list[ProductRecord]:
+        """Отбирает товары страницы, которым нужны детали.
+
+        Уже записанные и взятые другим заданием товары пропускаются,
+        товары с актуальными деталями из состояния сразу записываются.
+        """
+        to_fetch: list[ProductRecord] = []
+        for product in products:
+            if Journal.key(product) in self.done_keys:
+                continue
+            if not self._claim(product):
+                continue
+            if self.state is not None and self.state.reuse_details(product):
+                self._emit(product, fresh=False)
+                continue
+            to_fetch.append(product)
+        return to_fetch
+
+    def _replay_journal(self) -> None:
+        """Переносит товары из журнала в заново открытый вывод."""
+        for product in self.journal.iter_records():
+            if self._claim(product):
+                self.writer.append(product)
+
+    def _claim(self, product: Mapping[str, Any]) -> bool:
+        """Берёт товар в работу, если его не взяло другое задание."""
+        if self.seen is None:
+            return True
+        return self.seen.claim(
+            f"{self.scraper.city_id}:{Journal.key(product)}"
+        )
+
+    def _emit(self, product: ProductRecord, fresh: bool = True) -> None:
+        """Фиксирует готовый товар в журнале и записывает его."""
+        self.journal.record(product)
+        if self.state is not None:
+            self.state.update(product, fresh=fresh)
+        with metrics.timer("write"):
+            self.writer.append(product)
+        metrics.count("products")
+        self.written += 1
+        if self._progress is not None:
+            self._progress.update(1)
@@ -0,0 +1,153 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+
+from .core.config import PROFILE_SLOW_SECONDS, PROFILE_TRACE_SAMPLE
+from .core.metrics import metrics
+
+__all__ = ["Profiler"]
+
+# С 3.12 cProfile работает через общий слот sys.monitoring: один профиль
+# охватывает все потоки, а второй в потоке не включить (ValueError).
+PER_THREAD_PROFILES: bool = sys.version_info < (3, 12)
+
+
+class Profiler:
+    """Профилирование запуска в отдельный каталог.
+
+    Python-часть профилируется cProfile во всех потоках, запущенных после
+    входа в контекст (event loop, пул страниц каталога, фоновый HTTP):
+    до 3.12 - отдельным профилем на поток, с 3.12 - одним общим.
+    Страницы товаров трассируются Playwright в контексте каждого воркера
+    порциями (chunk) на товар; сохраняется случайная выборка страниц и все
+    страницы медленнее `slow_threshold`, остальные порции отбрасываются.
+    """
+
+    def __init__(
+        self,
+        run_dir: str,
+        sample_rate: float = PROFILE_TRACE_SAMPLE,
+        slow_threshold: float = PROFILE_SLOW_SECONDS,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.run_dir: str = run_dir
+        self.sample_rate: float = sample_rate
+        self.slow_threshold: float = slow_threshold
+        self.traces: list[dict[str, Any]] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._profile = cProfile.Profile()
+        self._thread_profiles: list[cProfile.Profile] = []
+
+    def __enter__(self) -> "Profiler":
+        os.makedirs(os.path.join(self.run_dir, "traces"), exist_ok=True)
+        if PER_THREAD_PROFILES:
+            threading.setprofile(self._profile_thread)
+        else:
+            logging.info(
+                "Python 3.12+: потоки профилируются общим профилем cProfile"
+            )
+        self._profile.enable()
+        logging.info(f"Профилирование включено, каталог: {self.run_dir}")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._profile.disable()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(None)  # type: ignore[arg-type]
+        self._dump_profile()
+        self._write_json("traces.json", self.traces)
+        metrics.export(self.run_dir)
+        logging.info(
+            f"Профиль сохранён в {self.run_dir}: python.prof, "
+            f"трасс Playwright: {len(self.traces)}"
+        )
+
+    def _profile_thread(self, *args: Any) -> None:
+        """Включает отдельный cProfile в каждом новом потоке."""
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_profiles.append(profile)
+        profile.enable()
+
+    def _dump_profile(self) -> None:
+        """Сводит профили потоков в python.prof и текстовый топ."""
+        stats = pstats.Stats(self._profile)
+        with self._lock:
+            thread_profiles = list(self._thread_profiles)
+        for profile in thread_profiles:
+            profile.create_stats()
+            if profile.stats:  # type: ignore[attr-defined]
+                stats.add(profile)
+        stats.dump_stats(os.path.join(self.run_dir, "python.prof"))
+        report = io.StringIO()
+        stats.stream = report  # type: ignore[attr-defined]
+        stats.sort_stats("cumulative").print_stats(50)
+        with open(
+            os.path.join(self.run_dir, "python_top.txt"), "w", encoding="utf-8"
+        ) as file:
+            file.write(report.getvalue())
+
+    def _write_json(self, filename: str, payload: Any) -> None:
+        with open(
+            os.path.join(self.run_dir, filename), "w", encoding="utf-8"
+        ) as file:
+            json.dump(payload, file, ensure_ascii=False, indent=2)
+
+    def keep_reason(self, elapsed: float) -> Optional[str]:
+        """Причина сохранить трассу страницы или None."""
+        if elapsed >= self.slow_threshold:
+            return "slow"
+        if self._random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def start_tracing(self, context: AsyncBrowserContext) -> None:
+        """Включает трассировку сети и таймингов в контексте воркера."""
+        await context.tracing.start(snapshots=True, screenshots=False)
+
+    async def stop_tracing(self, context: AsyncBrowserContext) -> None:
+        await context.tracing.stop()
+
+    @asynccontextmanager
+    async def trace(
+        self, context: AsyncBrowserContext, worker_id: int, label: str
+    ) -> AsyncIterator[None]:
+        """Трассирует блок порцией и сохраняет её по `keep_reason`."""
+        await context.tracing.start_chunk(title=label)
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed: float = time.perf_counter() - started
+            reason: Optional[str] = self.keep_reason(elapsed)
+            if reason is None:
+                await context.tracing.stop_chunk()
+            else:
+                with self._lock:
+                    index: int = len(self.traces)
+                    path: str = os.path.join(
+                        self.run_dir,
+                        "traces",
+                        f"{reason}-{index:05d}-w{worker_id}.zip",
+                    )
+                    self.traces.append(
+                        {
+                            "path": os.path.relpath(path, self.run_dir),
+                            "label": label,
+                            "reason": reason,
+                            "elapsed_s": elapsed,
+                        }
+                    )
+                await context.tracing.stop_chunk(path=path)
@@ -0,0 +1,96 @@
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Optional
+
+__all__ = ["ProductRecord"]
+
+
+class ProductRecord(MutableMapping[str, Any]):
+    """Компактная запись товара с типизированными полями.
+
+    Поля хранятся в слотах, без словаря на каждый товар: цена - целое
+    число, рейтинг - дробное, отсутствующие значения - None. Для стадий,
+    работающих со словарём товара (журнал, состояние, вывод), запись
+    поддерживает доступ по ключу, где None читается как "N/A".
+    """
+
+    __slots__ = (
+        "id",
+        "link",
+        "name",
+        "price",
+        "rating",
+        "description",
+        "usage",
+        "country",
+    )
+    FIELDS: tuple[str, ...] = __slots__
+    _FIELD_SET: frozenset[str] = frozenset(__slots__)
+
+    def __init__(
+        self,
+        id: str = "",
+        link: str = "",
+        name: str = "",
+        price: Optional[int] = None,
+        rating: Optional[float] = None,
+        description: Optional[str] = None,
+        usage: Optional[str] = None,
+        country: Optional[str] = None,
+    ) -> None:
+        self.id: str = id
+        self.link: str = link
+        self.name: str = name
+        self.price: Optional[int] = price
+        self.rating: Optional[float] = rating
+        self.description: Optional[str] = description
+        self.usage: Optional[str] = usage
+        self.country: Optional[str] = country
+
+    def __getitem__(self, field: str) -> Any:
+        if field not in self._FIELD_SET:
+            raise KeyError(field)
+        value = getattr(self, field)
+        return "N/A" if value is None else value
+
+    def __setitem__(self, field: str, value: Any) -> None:
+        if field not in self._FIELD_SET:
+            raise KeyError(field)
+        setattr(self, field, None if value == "N/A" else value)
+
+    def __delitem__(self, field: str) -> None:
+        self[field] = None
+
+    def __contains__(self, field: object) -> bool:
+        return field in self._FIELD_SET
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Значение поля, как `dict.get`, без исключения на каждый промах."""
+        if field not in self._FIELD_SET:
+            return default
+        value = getattr(self, field)
+        return "N/A" if value is None else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        fields: str = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self.FIELDS
+        )
+        return f"ProductRecord({fields})"
+
+    @classmethod
+    def from_dict(cls, product: dict[str, Any]) -> "ProductRecord":
+        """Создаёт запись из словаря товара (например, из журнала)."""
+        record = cls()
+        for field in cls.FIELDS:
+            if field in product:
+                record[field] = product[field]
+        return record
+
+    def as_dict(self) -> dict[str, Any]:
+        """Словарь товара в прежнем виде, с "N/A" вместо None."""
+        return {field: self[field] for field in self.FIELDS}
@@ -1,14 +1,31 @@
 import logging
-import random
-import re
 import time
-from typing import Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Any, Iterator, Optional
 
-from playwright.sync_api import Locator, Page
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page
 
 from .core.strategies import BaseScraper
-from scraper.core import DEFAULT_MAX_PAGES, HeadersManager
-from scraper.core.config import GOLD_APPLE_API_URL
+from .extraction import DetailExtractor
+from .parser import GoldParser
+from scraper.core import (
+    DEFAULT_MAX_PAGES,
+    HeadersManager,
+    RateLimiter,
+    metrics,
+)
+from scraper.core.config import (
+    DEFAULT_PAGE_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    GOLD_APPLE_API_URL,
+    PAGE_RETRIES,
+    PAGE_RETRY_BACKOFF,
+    PRODUCT_DETAILS_URL,
+    PRODUCT_READY_TIMEOUT_MS,
+)
 
 
 class GoldScraper:
@@ -19,31 +36,168 @@ class GoldScraper:
         strategy: BaseScraper,
         category_id: str,
         city_id: str,
-        max_pages: int = DEFAULT_MAX_PAGES,
+        max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        page_workers: int = DEFAULT_PAGE_WORKERS,
+        headers_manager: Optional[HeadersManager] = None,
+        stop_early: bool = False,
     ) -> None:
         self.scraper = strategy
         self.category_id: str = category_id
         self.city_id: str = city_id
-        self.max_pages: int = max_pages
-        self.headers_manager = HeadersManager()
+        self.max_pages: Optional[int] = max_pages
+        self.page_workers: int = max(1, page_workers)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.headers_manager = headers_manager or HeadersManager()
+        self.stop_early: bool = stop_early
+        self.seen_ids: set[str] = set()
+        self.duplicates: int = 0
+        self.extractor = DetailExtractor()
 
     def fetch_products(self) -> list[dict[str, Any]]:
         """Получение списка товаров с API."""
-        products: list[dict[str, Any]] = []
-        for page in range(1, self.max_pages + 1):
-            url: str = (
-                f"{GOLD_APPLE_API_URL}/catalog/products?categoryId="
-                f"{self.category_id}&pageNumber={page}&cityId={self.city_id}"
+        return list(chain.from_iterable(self.iter_pages()))
+
+    def iter_pages(self) -> Iterator[list[dict[str, Any]]]:
+        """Выдаёт товары постранично без повторов по `itemId`.
+
+        Товары, сдвинувшиеся между страницами во время обхода, попадают
+        в выдачу один раз. При `stop_early` обход прекращается на первой
+        странице, все товары которой уже встречались.
+        """
+        self.seen_ids = set()
+        self.duplicates = 0
+        pages = self.__iter_raw_pages()
+        try:
+            for products in pages:
+                unique: list[dict[str, Any]] = self.__drop_seen(products)
+                if unique:
+                    yield unique
+                elif products and self.stop_early:
+                    logging.info(
+                        "Страница содержит только известные товары, "
+                        "обход каталога остановлен"
+                    )
+                    break
+        finally:
+            pages.close()
+            if self.duplicates:
+                logging.info(
+                    f"Пропущено дубликатов в каталоге: {self.duplicates} "
+                    "(столько же запросов деталей не выполнено)"
+                )
+
+    def __drop_seen(
+        self, products: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Отбрасывает товары, уже выданные на предыдущих страницах."""
+        unique: list[dict[str, Any]] = []
+        for product in products:
+            product_id = product.get("itemId") or product.get("url")
+            if product_id is not None:
+                if str(product_id) in self.seen_ids:
+                    self.duplicates += 1
+                    continue
+                self.seen_ids.add(str(product_id))
+            unique.append(product)
+        return unique
+
+    def __iter_raw_pages(self) -> Iterator[list[dict[str, Any]]]:
+        """Выдаёт товары постранично в порядке номеров страниц.
+
+        Первая страница определяет общее число страниц, остальные
+        запрашиваются параллельно скользящим окном, чтобы в памяти
+        находилось не больше нескольких страниц одновременно.
+        """
+        first_page = self.fetch_page(1)
+        if first_page is None:
+            return
+        products: list[dict[str, Any]] = first_page["data"]["products"]
+        yield products
+        total_pages = GoldParser.parse_total_pages(first_page, len(products))
+        if total_pages is None:
+            yield from self.__walk_pages(start=2)
+            return
+
+        if self.max_pages is not None:
+            total_pages = min(total_pages, self.max_pages)
+        logging.info(f"Запланировано страниц каталога: {total_pages}")
+        pages: Iterator[int] = iter(range(2, total_pages + 1))
+        executor = ThreadPoolExecutor(max_workers=self.page_workers)
+        try:
+            pending: deque[tuple[int, Future]] = deque(
+                (page, executor.submit(self.fetch_page, page))
+                for page in islice(pages, self.page_workers * 2)
             )
-            logging.info(f"Запрос страницы {page}: {url}")
-            headers, cookies = self.headers_manager.get_headers_and_cookies()
-            data = self.scraper.fetch(url, headers=headers, cookies=cookies)
-            if not data or "products" not in data.get("data", {}):
-                logging.warning(f"Ошибка или пустой ответ на странице {page}")
+            while pending:
+                page, future = pending.popleft()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append(
+                        (
+                            next_page,
+                            executor.submit(self.fetch_page, next_page),
+                        )
+                    )
+                data = future.result()
+                if data is None:
+                    logging.error(f"Страница {page} пропущена после повторов")
+                    continue
+                yield data["data"]["products"]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __walk_pages(self, start: int) -> Iterator[list[dict[str, Any]]]:
+        """Последовательный обход, когда размер каталога неизвестен."""
+        page: int = start
+        while self.max_pages is None or page <= self.max_pages:
+            data = self.fetch_page(page)
+            if data is None or not data["data"]["products"]:
                 break
-            products.extend(data["data"]["products"])
-            time.sleep(random.uniform(5, 10))
-        return products
+            yield data["data"]["products"]
+            page += 1
+
+    def fetch_page(self, page: int) -> Optional[dict[str, Any]]:
+        """Запрашивает страницу каталога с повторами при ошибке."""
+        url: str = (
+            f"{GOLD_APPLE_API_URL}/catalog/products?categoryId="
+            f"{self.category_id}&pageNumber={page}&cityId={self.city_id}"
+        )
+        with metrics.timer("page"):
+            for attempt in range(1, PAGE_RETRIES + 1):
+                self.rate_limiter.acquire()
+                logging.info(f"Запрос страницы {page}: {url}")
+                headers, cookies = (
+                    self.headers_manager.get_headers_and_cookies()
+                )
+                data = self.scraper.fetch(
+                    url, headers=headers, cookies=cookies
+                )
+                if data and "products" in data.get("data", {}):
+                    return data
+                metrics.error("page", "EmptyResponse")
+                logging.warning(
+                    f"Ошибка или пустой ответ на странице {page} "
+                    f"(попытка {attempt}/{PAGE_RETRIES})"
+                )
+                if attempt < PAGE_RETRIES:
+                    time.sleep(PAGE_RETRY_BACKOFF * attempt)
+        metrics.error("page", "Skipped")
+        return None
+
+    def fetch_product_details_api(self, item_id: str) -> dict[str, str]:
+        """Получение деталей товара из JSON карточки товара."""
+        if not item_id:
+            return {"usage": "N/A", "country": "N/A"}
+        url: str = (
+            f"{PRODUCT_DETAILS_URL}?itemId={item_id}"
+            f"&cityId={self.city_id}&customerGroupId=0"
+        )
+        logging.debug(f"Запрос карточки товара: {url}")
+        self.rate_limiter.acquire()
+        headers, cookies = self.headers_manager.get_headers_and_cookies()
+        data = self.scraper.fetch(url, headers=headers, cookies=cookies)
+        return GoldParser.parse_product_card(data)
 
     def fetch_product_details(
         self, product_url: str, page: Page
@@ -53,9 +207,11 @@ class GoldScraper:
         usage: str = "N/A"
         country: str = "N/A"
         try:
-            self.__load_page(page, product_url)
-            country = self.__parse_country(page)
-            usage = self.__parse_usage(page)
+            with metrics.timer("load_page"):
+                self.__load_page(page, product_url)
+            with metrics.timer("extract"):
+                details = self.extractor.extract(page)
+            usage, country = details["usage"], details["country"]
         except Exception as err_msg:
             logging.error(
                 f"Ошибка при парсинге {product_url}: {err_msg}", exc_info=True
@@ -67,82 +223,65 @@ class GoldScraper:
         return {"usage": usage, "country": country}
 
     def __load_page(self, page: Page, product_url: str) -> None:
-        """Загружает страницу товара и ждёт основной контейнер."""
-        page.goto(product_url, timeout=60000)
-        page.wait_for_load_state("networkidle")
+        """Загружает страницу товара и ждёт вкладки с данными."""
+        page.goto(product_url, timeout=60000, wait_until="domcontentloaded")
         logging.debug(f"Страница {product_url} успешно загружена")
         try:
-            page.wait_for_selector(".bOhy3", timeout=15000)
+            page.wait_for_selector(
+                self.extractor.spec.ready_selector,
+                timeout=PRODUCT_READY_TIMEOUT_MS,
+            )
         except Exception as err_msg:
             logging.debug(
-                f"Элемент .bOhy3 не найден, продолжаю парсинг: {err_msg}"
+                f"Вкладки товара не найдены, продолжаю парсинг: {err_msg}"
             )
 
-    def __parse_country(self, page: Page) -> str:
-        """Извлекает страну происхождения из страницы товара."""
-        country: str = "N/A"
-        extra_info_tab: Locator = page.locator(
-            "button.ga-tabs-tab",
-            has_text=re.compile(
-                "Дополнительная информация",
-                re.IGNORECASE,
-            ),
+    async def fetch_product_details_async(
+        self, product_url: str, page: AsyncPage
+    ) -> dict[str, str]:
+        """Асинхронное получение деталей товара через браузер.
+
+        Ошибки загрузки и извлечения пробрасываются: их учитывает
+        вызывающий воркер, а не подменяют значения "N/A".
+        """
+        logging.info(f"Открываю страницу товара: {product_url}")
+        with metrics.timer("load_page"):
+            await self.__load_page_async(page, product_url)
+        with metrics.timer("extract"):
+            details = await self.extractor.extract_async(page)
+        logging.debug(
+            f"Результат для {product_url}: usage={details['usage']}, "
+            f"country={details['country']}"
         )
-        if extra_info_tab.count() > 0 and extra_info_tab.is_visible():
-            extra_info_tab.click()
-            page.wait_for_timeout(1000)
-            country_locator: Locator = page.locator(
-                "div.kDcPG",
-                has_text=re.compile(
-                    "страна происхождения",
-                    re.IGNORECASE,
-                ),
-            )
-            if country_locator.count() > 0:
-                full_text: str = country_locator.inner_text()
-                country_match = re.search(
-                    (
-                        r"страна происхождения\s*[\n\r]*(.+?)"
-                        r"(?:\s*изготовитель|<br>|$)"
-                    ),
-                    full_text,
-                    re.IGNORECASE | re.DOTALL,
-                )
-                if country_match:
-                    country = country_match.group(1).strip()
-                    country = re.split(
-                        r"\s*(?:Продавец|изготовитель)", country
-                    )[0].strip()
-                    logging.debug(f"Извлечённая страна: {country}")
-        else:
-            country_element: Locator = page.locator(
-                (
-                    "xpath=//div[contains(text(), 'страна происхождения')]"
-                    "/following-sibling::div"
-                )
-            )
-            if country_element.is_visible():
-                country = country_element.inner_text().strip()
-                logging.debug(f"Извлечённая страна (запасной): {country}")
-        return country
+        return details
 
-    def __parse_usage(self, page: Page) -> str:
-        """Извлекает инструкцию по применению из страницы товара."""
-        usage: str = "N/A"
-        usage_tab: Locator = page.locator(
-            "button.ga-tabs-tab",
-            has_text=re.compile("Применение", re.IGNORECASE),
+    async def capture_product_html_async(
+        self, product_url: str, page: AsyncPage
+    ) -> str:
+        """Снимок HTML страницы товара с раскрытыми вкладками.
+
+        Ошибки пробрасываются вызывающему воркеру, как и при извлечении.
+        """
+        logging.info(f"Снимаю страницу товара: {product_url}")
+        with metrics.timer("load_page"):
+            await self.__load_page_async(page, product_url)
+        with metrics.timer("capture"):
+            return await self.extractor.capture_async(page)
+
+    async def __load_page_async(
+        self, page: AsyncPage, product_url: str
+    ) -> None:
+        """Загружает страницу товара и ждёт вкладки с данными."""
+        await page.goto(
+            product_url, timeout=60000, wait_until="domcontentloaded"
         )
-        if usage_tab.count() > 0 and usage_tab.is_visible():
-            usage_tab.click()
-            page.wait_for_timeout(1000)
-            usage_locator: Locator = page.locator("div.kDcPG")
-            if usage_locator.count() > 0:
-                usage = usage_locator.first.inner_text().strip()
-        else:
-            usage_element: Locator = page.locator(
-                "xpath=//div[contains(@class, 'kDcPG')]"
-            ).nth(0)
-            if usage_element.is_visible():
-                usage = usage_element.inner_text().strip()
-        return usage
+        logging.debug(f"Страница {product_url} успешно загружена")
+        try:
+            await page.wait_for_selector(
+                self.extractor.spec.ready_selector,
+                timeout=PRODUCT_READY_TIMEOUT_MS,
+            )
+        except Exception as err_msg:
+            logging.debug(
+                f"Вкладки товара не найдены, продолжаю парсинг: {err_msg}"
+            )
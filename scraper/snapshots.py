@@ -0,0 +1,323 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+import zlib
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterator, Optional
+
+from tqdm import tqdm
+
+from .core.config import (
+    SNAPSHOT_BATCH_SIZE,
+    SNAPSHOT_COMMIT_EVERY,
+    SNAPSHOT_COMPRESSION_LEVEL,
+    SNAPSHOT_DB_FILE,
+    SNAPSHOT_PENDING_PER_PROCESS,
+    SQLITE_TIMEOUT,
+)
+from .core.metrics import metrics
+from .extraction import DetailExtractor, merge_details
+from .record import ProductRecord
+from .utils.journal import Journal
+from .utils.writer import BaseWriter
+
+__all__ = [
+    "SnapshotExtractor",
+    "SnapshotStore",
+    "capture_snapshot",
+    "extract_snapshot",
+]
+
+_extractor: Optional[DetailExtractor] = None
+
+
+def _get_extractor() -> DetailExtractor:
+    """Экстрактор процесса пула, создаётся один раз на процесс."""
+    global _extractor
+    if _extractor is None:
+        _extractor = DetailExtractor()
+    return _extractor
+
+
+def capture_snapshot(html: str) -> tuple[dict[str, str], bytes, float]:
+    """Извлекает поля из свежего снимка и сжимает его (в процессе пула).
+
+    Возвращает детали, сжатый снимок и время извлечения в секундах.
+    """
+    started: float = time.perf_counter()
+    details: dict[str, str] = _get_extractor().extract_html(html)
+    elapsed: float = time.perf_counter() - started
+    return details, SnapshotStore.compress(html), elapsed
+
+
+def extract_snapshot(blob: bytes) -> dict[str, str]:
+    """Извлекает поля из сохранённого снимка (в процессе пула)."""
+    return _get_extractor().extract_html(SnapshotStore.decompress(blob))
+
+
+def _extract_snapshot_safe(
+    blob: bytes,
+) -> tuple[Optional[dict[str, str]], Optional[tuple[str, str]]]:
+    """Извлекает поля, возвращая ошибку снимка вместо исключения.
+
+    Исключение в `Executor.map` прервало бы всю пачку, поэтому ошибка
+    передаётся родителю парой (тип, текст) вместо деталей.
+    """
+    try:
+        return extract_snapshot(blob), None
+    except Exception as err_msg:
+        return None, (type(err_msg).__name__, str(err_msg))
+
+
+class SnapshotStore:
+    """Сжатые снимки страниц товаров в SQLite.
+
+    Хранит HTML страницы с раскрытыми вкладками вместе с записью товара
+    из каталога, поэтому после исправления селекторов детали можно
+    извлечь заново без повторного обхода сайта.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_DB_FILE) -> None:
+        self.path: str = path
+        self.stored: int = 0
+        self.raw_bytes: int = 0
+        self.stored_bytes: int = 0
+        self._pending: int = 0
+        self._connection = sqlite3.connect(
+            path, timeout=SQLITE_TIMEOUT, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                key TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                html BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                captured_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM snapshots"
+        ).fetchone()
+        return count
+
+    @staticmethod
+    def compress(html: str, level: int = SNAPSHOT_COMPRESSION_LEVEL) -> bytes:
+        return zlib.compress(html.encode("utf-8"), level)
+
+    @staticmethod
+    def decompress(blob: bytes) -> str:
+        return zlib.decompress(blob).decode("utf-8")
+
+    def put(self, product: Mapping[str, Any], blob: bytes, size: int) -> None:
+        """Сохраняет сжатый снимок товара, заменяя предыдущий."""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+            (
+                Journal.key(product),
+                json.dumps(dict(product), ensure_ascii=False),
+                blob,
+                size,
+                time.time(),
+            ),
+        )
+        self.stored += 1
+        self.raw_bytes += size
+        self.stored_bytes += len(blob)
+        self._pending += 1
+        if self._pending >= SNAPSHOT_COMMIT_EVERY:
+            self.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """HTML снимка по ключу товара или None."""
+        row = self._connection.execute(
+            "SELECT html FROM snapshots WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else self.decompress(row[0])
+
+    def iter_snapshots(self) -> Iterator[tuple[dict[str, Any], bytes]]:
+        """Выдаёт записи товаров и сжатые снимки в порядке ключей."""
+        self.commit()
+        cursor = self._connection.execute(
+            "SELECT record, html FROM snapshots ORDER BY key"
+        )
+        for record, blob in cursor:
+            yield json.loads(record), blob
+
+    def commit(self) -> None:
+        self._connection.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Фиксирует изменения и закрывает базу."""
+        self.commit()
+        self._connection.close()
+        if self.stored:
+            logging.info(
+                f"Снимков сохранено: {self.stored}, "
+                f"{self.raw_bytes} -> {self.stored_bytes} байт"
+            )
+
+
+class SnapshotExtractor:
+    """Извлечение деталей из снимков страниц в пуле процессов.
+
+    Браузерные воркеры только снимают HTML и сразу берут следующий товар;
+    разбор и сжатие снимка идут в процессах пула. Число снимков, ждущих
+    обработки, ограничено `max_pending`, чтобы память не росла, если
+    извлечение отстаёт от браузеров.
+    """
+
+    def __init__(
+        self,
+        store: SnapshotStore,
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        self.store: SnapshotStore = store
+        self.processes: int = max(1, processes or os.cpu_count() or 1)
+        self.max_pending: int = max_pending or (
+            self.processes * SNAPSHOT_PENDING_PER_PROCESS
+        )
+        self.errors: int = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._failure: Optional[BaseException] = None
+
+    def __enter__(self) -> "SnapshotExtractor":
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logging.info(f"Пул извлечения из снимков: {self.processes} процессов")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self.store.close()
+        if self.errors:
+            logging.warning(f"Ошибок извлечения из снимков: {self.errors}")
+
+    async def submit(
+        self,
+        product: Mapping[str, Any],
+        html: str,
+        on_done: Callable[[dict[str, str]], None],
+    ) -> None:
+        """Ставит снимок в обработку; ждёт, если очередь заполнена.
+
+        `on_done` вызывается в event loop с извлечёнными деталями (пустыми
+        при ошибке разбора).
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        await self._slots.acquire()
+        task = asyncio.create_task(self._process(product, html, on_done))
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+
+    async def join(self) -> None:
+        """Дожидается всех снимков; ошибка `on_done` пробрасывается."""
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+        if self._failure is not None:
+            failure, self._failure = self._failure, None
+            raise failure
+
+    def _finished(self, task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self._failure = self._failure or task.exception()
+
+    async def _process(
+        self,
+        product: Mapping[str, Any],
+        html: str,
+        on_done: Callable[[dict[str, str]], None],
+    ) -> None:
+        details: dict[str, str] = {}
+        try:
+            with metrics.timer("snapshot"):
+                (
+                    details,
+                    blob,
+                    elapsed,
+                ) = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, capture_snapshot, html
+                )
+            metrics.observe("extract", elapsed)
+            metrics.add_bytes("snapshot", len(blob))
+            self.store.put(product, blob, len(html))
+        except Exception as err_msg:
+            self.errors += 1
+            logging.error(
+                f"Ошибка извлечения из снимка {product.get('link')}: "
+                f"{err_msg}"
+            )
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+        on_done(details)
+
+    def reextract(
+        self, writer: BaseWriter, batch_size: int = SNAPSHOT_BATCH_SIZE
+    ) -> int:
+        """Заново извлекает детали из всех снимков и записывает товары.
+
+        Работает без сети и браузера: снимки читаются из базы пачками и
+        разбираются процессами пула. Товар с повреждённым снимком
+        записывается с деталями "N/A", остальные обрабатываются дальше.
+        """
+        if self._executor is None:
+            raise RuntimeError("SnapshotExtractor используется вне with")
+        written: int = 0
+        snapshots = self.store.iter_snapshots()
+        chunksize: int = max(1, batch_size // (self.processes * 4))
+        with (
+            writer,
+            tqdm(total=len(self.store), desc="Снимки", unit="шт") as progress,
+        ):
+            while batch := list(islice(snapshots, batch_size)):
+                records = [record for record, _ in batch]
+                results = self._executor.map(
+                    _extract_snapshot_safe,
+                    [blob for _, blob in batch],
+                    chunksize=chunksize,
+                )
+                for record, (product_details, error) in zip(records, results):
+                    product = ProductRecord.from_dict(record)
+                    if error is not None:
+                        self.errors += 1
+                        metrics.error("snapshot", error[0])
+                        logging.error(
+                            f"Ошибка извлечения из снимка "
+                            f"{record.get('link')}: {error[1]}"
+                        )
+                        product_details = _get_extractor().postprocess(None)
+                    merge_details(product, product_details)
+                    with metrics.timer("write"):
+                        writer.append(product)
+                    metrics.count("products")
+                    written += 1
+                    progress.update(1)
+        return written
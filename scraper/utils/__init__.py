@@ -1 +1,4 @@
+from .dedup import *
+from .journal import *
+from .state import *
 from .writer import *
@@ -0,0 +1,24 @@
+import uuid
+from typing import MutableMapping
+
+__all__ = ["SharedKeySet"]
+
+
+class SharedKeySet:
+    """Множество уже взятых в работу товаров, общее для процессов.
+
+    Поверх словаря `multiprocessing.Manager().dict()` (или обычного
+    словаря в одном процессе). Проверка и отметка выполняются одним
+    вызовом `setdefault`, поэтому не требуют отдельной блокировки.
+    """
+
+    def __init__(self, keys: MutableMapping[str, str]) -> None:
+        self.keys = keys
+
+    def claim(self, key: str) -> bool:
+        """Отмечает ключ; False, если его уже взял другой обработчик."""
+        marker: str = uuid.uuid4().hex
+        return self.keys.setdefault(key, marker) == marker
+
+    def __len__(self) -> int:
+        return len(self.keys)
@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+from typing import IO, Any, Iterator, Optional
+
+from scraper.core.config import JOURNAL_FILE
+
+__all__ = ["Journal"]
+
+
+class Journal:
+    """Журнал готовых товаров в JSONL для возобновления после сбоя.
+
+    Каждая строка - один товар, записанный сразу после обработки.
+    Запись сбрасывается на диск через fsync, поэтому при падении
+    теряется не больше одной незавершённой строки.
+    """
+
+    def __init__(self, filename: str = JOURNAL_FILE) -> None:
+        self.filename: str = filename
+        self._file: Optional[IO[str]] = None
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def key(product: dict[str, str]) -> str:
+        """Ключ товара: идентификатор, а при его отсутствии ссылка."""
+        return product.get("id") or product["link"]
+
+    def open(self, resume: bool = False) -> None:
+        """Открывает журнал: дописывает при resume, иначе очищает."""
+        if not resume:
+            self._file = open(self.filename, "w", encoding="utf-8")
+            return
+        # Последняя строка может оборваться посреди многобайтного символа,
+        # поэтому хвост проверяется в двоичном режиме.
+        with open(self.filename, "ab+") as file:
+            if file.tell() > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    file.write(b"\n")
+        self._file = open(self.filename, "a", encoding="utf-8")
+
+    def record(self, product: dict[str, str]) -> None:
+        """Дописывает готовый товар и сбрасывает его на диск."""
+        if self._file is None:
+            raise RuntimeError("Журнал не открыт для записи")
+        self._file.write(json.dumps(dict(product), ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def iter_records(self) -> Iterator[dict[str, str]]:
+        """Читает записанные товары, пропуская повреждённые строки."""
+        if not os.path.exists(self.filename):
+            return
+        with open(
+            self.filename, "r", encoding="utf-8", errors="replace"
+        ) as file:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(
+                        f"Повреждённая строка {line_number} в {self.filename}"
+                    )
+
+    def load_keys(self) -> set[str]:
+        """Возвращает ключи уже обработанных товаров."""
+        return {self.key(product) for product in self.iter_records()}
+
+    def close(self) -> None:
+        """Закрывает журнал."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import sqlite3
+import time
+from typing import Any
+
+from scraper.core.config import (
+    SQLITE_TIMEOUT,
+    STATE_COMMIT_EVERY,
+    STATE_DB_FILE,
+    STATE_MAX_AGE_DAYS,
+)
+
+__all__ = ["ProductStateStore"]
+
+
+class ProductStateStore:
+    """Локальное состояние товаров для инкрементального пересбора.
+
+    Хранит последние поля API и детали каждого товара. Детали
+    запрашиваются заново только для новых, изменившихся или
+    устаревших товаров; цена и рейтинг изменением не считаются.
+    Отметка `details_at` ставится, только когда детали получены, поэтому
+    товар без страны или инструкции на сайте тоже берётся из состояния,
+    а товар, детали которого получить не удалось, запрашивается снова.
+    """
+
+    FINGERPRINT_FIELDS: tuple[str, ...] = ("link", "name", "description")
+
+    def __init__(
+        self,
+        path: str = STATE_DB_FILE,
+        max_age_days: float = STATE_MAX_AGE_DAYS,
+    ) -> None:
+        self.path: str = path
+        self.max_age: float = max_age_days * 24 * 60 * 60
+        self.reused: int = 0
+        self._pending: int = 0
+        self._connection = sqlite3.connect(
+            path, timeout=SQLITE_TIMEOUT, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                price TEXT,
+                rating TEXT,
+                usage TEXT,
+                country TEXT,
+                details_at REAL NOT NULL,
+                seen_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "ProductStateStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def key(product: dict[str, str]) -> str:
+        return product.get("id") or product["link"]
+
+    @classmethod
+    def fingerprint(cls, product: dict[str, str]) -> str:
+        """Хеш полей, изменение которых требует обновить детали."""
+        payload: str = "\x1f".join(
+            str(product.get(field, "")) for field in cls.FINGERPRINT_FIELDS
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def reuse_details(self, product: dict[str, str]) -> bool:
+        """Подставляет сохранённые детали, если их не нужно обновлять."""
+        row = self._connection.execute(
+            "SELECT fingerprint, usage, country, details_at "
+            "FROM products WHERE key = ?",
+            (self.key(product),),
+        ).fetchone()
+        if row is None:
+            return False
+        fingerprint, usage, country, details_at = row
+        if (
+            fingerprint != self.fingerprint(product)
+            or time.time() - details_at > self.max_age
+        ):
+            return False
+        product["usage"] = usage
+        product["country"] = country
+        self.reused += 1
+        return True
+
+    def update(self, product: dict[str, str], fresh: bool = True) -> None:
+        """Запоминает товар; `fresh` - детали только что получены.
+
+        Без `fresh` сохранённые детали и отпечаток не меняются, а новый
+        товар записывается без отметки о деталях.
+        """
+        now: float = time.time()
+        self._connection.execute(
+            """
+            INSERT INTO products VALUES (
+                :key, :fingerprint, :price, :rating, :usage, :country,
+                :details_at, :seen_at
+            )
+            ON CONFLICT(key) DO UPDATE SET
+                price = excluded.price,
+                rating = excluded.rating,
+                seen_at = excluded.seen_at,
+                fingerprint = CASE WHEN :fresh THEN excluded.fingerprint
+                                   ELSE products.fingerprint END,
+                usage = CASE WHEN :fresh THEN excluded.usage
+                             ELSE products.usage END,
+                country = CASE WHEN :fresh THEN excluded.country
+                               ELSE products.country END,
+                details_at = CASE WHEN :fresh THEN excluded.details_at
+                                  ELSE products.details_at END
+            """,
+            {
+                "key": self.key(product),
+                "fingerprint": self.fingerprint(product),
+                "price": str(product.get("price", "N/A")),
+                "rating": str(product.get("rating", "N/A")),
+                "usage": product.get("usage", "N/A"),
+                "country": product.get("country", "N/A"),
+                "details_at": now if fresh else 0.0,
+                "seen_at": now,
+                "fresh": fresh,
+            },
+        )
+        self._pending += 1
+        if self._pending >= STATE_COMMIT_EVERY:
+            self.commit()
+
+    def commit(self) -> None:
+        self._connection.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Фиксирует изменения и закрывает базу."""
+        self.commit()
+        self._connection.close()
+        if self.reused:
+            logging.info(f"Детали из состояния без запроса: {self.reused}")
@@ -1,11 +1,57 @@
 import csv
 import json
 import os
+import sqlite3
+import time
+from typing import IO, Any, Optional
 
-from scraper.core.config import TEMP_FILE
+from scraper.core.config import (
+    PARQUET_COMPRESSION,
+    PARQUET_ROW_GROUP_SIZE,
+    PRODUCTS_DB_BATCH_SIZE,
+    PRODUCTS_DB_FILE,
+    SQLITE_TIMEOUT,
+    TEMP_FILE,
+)
 
+__all__ = [
+    "BaseWriter",
+    "CSVWriter",
+    "ParquetWriter",
+    "SQLiteWriter",
+    "build_writer",
+]
 
-class CSVWriter:
+
+class BaseWriter:
+    """Базовый класс вывода товаров: построчная запись по мере готовности."""
+
+    filename: str
+
+    def __enter__(self) -> "BaseWriter":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def open(self) -> None:
+        raise NotImplementedError(
+            "Метод open() должен быть реализован в подклассах."
+        )
+
+    def append(self, product: dict[str, str]) -> None:
+        raise NotImplementedError(
+            "Метод append() должен быть реализован в подклассах."
+        )
+
+    def close(self) -> None:
+        raise NotImplementedError(
+            "Метод close() должен быть реализован в подклассах."
+        )
+
+
+class CSVWriter(BaseWriter):
     """Класс для сохранения данных в CSV-файл с защитой от потери данных."""
 
     HEADERS: dict[str, str] = {
@@ -20,6 +66,32 @@ class CSVWriter:
 
     def __init__(self, filename: str = "products.csv") -> None:
         self.filename: str = filename
+        self._file: Optional[IO[str]] = None
+        self._writer: Optional[csv.DictWriter] = None
+
+    def open(self) -> None:
+        """Открывает CSV для построчной записи и пишет заголовок."""
+        self._file = open(self.filename, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=self.HEADERS.keys()
+        )
+        self._writer.writerow(self.HEADERS)
+        self._file.flush()
+
+    def append(self, product: dict[str, str]) -> None:
+        """Дописывает готовый товар в открытый CSV и сбрасывает буфер."""
+        if self._writer is None or self._file is None:
+            raise RuntimeError("CSVWriter не открыт для записи")
+        self._writer.writerow({k: product.get(k, "N/A") for k in self.HEADERS})
+        self._file.flush()
+
+    def close(self) -> None:
+        """Закрывает CSV, открытый для построчной записи."""
+        if self._file is not None:
+            self._file.close()
+            print(f"Данные сохранены в {self.filename}")
+        self._file = None
+        self._writer = None
 
     def save_temp(self, products: list[dict[str, str]]) -> None:
         """Сохраняет данные во временный JSON-файл."""
@@ -47,3 +119,248 @@ class CSVWriter:
         print(f"Данные сохранены в {self.filename}")
 
         os.remove(TEMP_FILE)
+
+
+class _TypedWriter(BaseWriter):
+    """Вывод с типизированными полями: "N/A" и пустое хранятся как null."""
+
+    FIELDS: tuple[str, ...] = ("id", *CSVWriter.HEADERS)
+    INT_FIELDS: frozenset[str] = frozenset({"price"})
+    FLOAT_FIELDS: frozenset[str] = frozenset({"rating"})
+
+    @classmethod
+    def convert(cls, field: str, value: Any) -> Any:
+        """Приводит значение к типу колонки, "N/A" и пустое - в None."""
+        if value is None or str(value).strip() in ("", "N/A"):
+            return None
+        try:
+            if field in cls.INT_FIELDS:
+                return int(float(str(value).replace(" ", "")))
+            if field in cls.FLOAT_FIELDS:
+                return float(str(value).replace(",", "."))
+        except ValueError:
+            return None
+        return str(value)
+
+
+class ParquetWriter(_TypedWriter):
+    """Колоночный вывод в Parquet с типизированными колонками.
+
+    Цена хранится целым числом, рейтинг - дробным, а "N/A" - как null.
+    Строки копятся в памяти и пишутся группами по `row_group_size`;
+    незаписанная группа при сбое восстанавливается из журнала.
+    Требует необязательную зависимость `pyarrow`.
+    """
+
+    def __init__(
+        self,
+        filename: str = "products.parquet",
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+        compression: str = PARQUET_COMPRESSION,
+    ) -> None:
+        self.filename: str = filename
+        self.row_group_size: int = row_group_size
+        self.compression: str = compression
+        self._columns: dict[str, list[Any]] = self._empty_columns()
+        self._rows: int = 0
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def open(self) -> None:
+        """Создаёт файл Parquet со схемой товаров."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err_msg:
+            raise RuntimeError(
+                "Для вывода в Parquet установите pyarrow: pip install pyarrow"
+            ) from err_msg
+        self._schema = pa.schema(
+            [
+                (
+                    field,
+                    (
+                        pa.int64()
+                        if field in self.INT_FIELDS
+                        else (
+                            pa.float64()
+                            if field in self.FLOAT_FIELDS
+                            else pa.string()
+                        )
+                    ),
+                )
+                for field in self.FIELDS
+            ]
+        )
+        self._writer = pq.ParquetWriter(
+            self.filename, self._schema, compression=self.compression
+        )
+
+    def append(self, product: dict[str, str]) -> None:
+        """Добавляет товар в текущую группу строк."""
+        if self._writer is None:
+            raise RuntimeError("ParquetWriter не открыт для записи")
+        for field in self.FIELDS:
+            self._columns[field].append(
+                self.convert(field, product.get(field))
+            )
+        self._rows += 1
+        if self._rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Записывает накопленные строки отдельной группой."""
+        if self._writer is None or not self._rows:
+            return
+        import pyarrow as pa
+
+        table = pa.Table.from_pydict(self._columns, schema=self._schema)
+        self._writer.write_table(table)
+        self._columns = self._empty_columns()
+        self._rows = 0
+
+    def close(self) -> None:
+        """Дописывает последнюю группу и закрывает файл."""
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            print(f"Данные сохранены в {self.filename}")
+        self._writer = None
+
+    def _empty_columns(self) -> dict[str, list[Any]]:
+        return {field: [] for field in self.FIELDS}
+
+
+class SQLiteWriter(_TypedWriter):
+    """Накопительная база товаров в SQLite с историей цен.
+
+    Товары обновляются upsert'ом по ключу (id или ссылка), поэтому база
+    переживает запуски, а не перезаписывается. Строка в `price_history`
+    добавляется только при появлении товара или изменении его цены или
+    рейтинга. Запись идёт пачками по `batch_size` в одной транзакции.
+    """
+
+    HISTORY_SQL: str = """
+        INSERT INTO price_history (id, price, rating, recorded_at)
+        SELECT :id, :price, :rating, :seen_at
+        WHERE NOT EXISTS (
+            SELECT 1 FROM products
+            WHERE id = :id AND price IS :price AND rating IS :rating
+        )
+    """
+    UPSERT_SQL: str = """
+        INSERT INTO products (
+            id, link, name, price, rating, description, usage, country,
+            first_seen, last_seen
+        ) VALUES (
+            :id, :link, :name, :price, :rating, :description, :usage,
+            :country, :seen_at, :seen_at
+        )
+        ON CONFLICT(id) DO UPDATE SET
+            link = excluded.link,
+            name = excluded.name,
+            price = excluded.price,
+            rating = excluded.rating,
+            description = excluded.description,
+            usage = excluded.usage,
+            country = excluded.country,
+            last_seen = excluded.last_seen
+    """
+
+    def __init__(
+        self,
+        filename: str = PRODUCTS_DB_FILE,
+        batch_size: int = PRODUCTS_DB_BATCH_SIZE,
+    ) -> None:
+        self.filename: str = filename
+        self.batch_size: int = batch_size
+        self.history_rows: int = 0
+        self._batch: dict[str, dict[str, Any]] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def open(self) -> None:
+        """Открывает базу и создаёт таблицы и индексы."""
+        self._connection = sqlite3.connect(
+            self.filename, timeout=SQLITE_TIMEOUT, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                id TEXT PRIMARY KEY,
+                link TEXT,
+                name TEXT,
+                price INTEGER,
+                rating REAL,
+                description TEXT,
+                usage TEXT,
+                country TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS price_history (
+                id TEXT NOT NULL,
+                price INTEGER,
+                rating REAL,
+                recorded_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_products_last_seen
+                ON products (last_seen);
+            CREATE INDEX IF NOT EXISTS idx_price_history_id
+                ON price_history (id, recorded_at);
+            CREATE INDEX IF NOT EXISTS idx_price_history_recorded_at
+                ON price_history (recorded_at);
+            """
+        )
+
+    def append(self, product: dict[str, str]) -> None:
+        """Добавляет товар в текущую пачку."""
+        if self._connection is None:
+            raise RuntimeError("SQLiteWriter не открыт для записи")
+        row: dict[str, Any] = {
+            field: self.convert(field, product.get(field))
+            for field in self.FIELDS
+        }
+        row["id"] = row["id"] or row["link"]
+        row["seen_at"] = time.time()
+        # Повтор товара в пачке заменяет предыдущий: история сравнивается
+        # с состоянием до пачки.
+        self._batch[row["id"]] = row
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Записывает пачку: сначала история, затем upsert товаров."""
+        if self._connection is None or not self._batch:
+            return
+        rows: list[dict[str, Any]] = list(self._batch.values())
+        with self._connection:
+            before: int = self._connection.total_changes
+            self._connection.executemany(self.HISTORY_SQL, rows)
+            self.history_rows += self._connection.total_changes - before
+            self._connection.executemany(self.UPSERT_SQL, rows)
+        self._batch.clear()
+
+    def close(self) -> None:
+        """Дописывает последнюю пачку и закрывает базу."""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            print(
+                f"Данные сохранены в {self.filename}, "
+                f"изменений цен: {self.history_rows}"
+            )
+        self._connection = None
+
+
+def build_writer(
+    output_format: str = "csv", compression: str = PARQUET_COMPRESSION
+) -> BaseWriter:
+    """Создаёт вывод по формату: csv, parquet или sqlite."""
+    if output_format == "csv":
+        return CSVWriter()
+    if output_format == "parquet":
+        return ParquetWriter(compression=compression)
+    if output_format == "sqlite":
+        return SQLiteWriter()
+    raise ValueError(f"Неизвестный формат вывода: {output_format}")
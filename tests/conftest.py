@@ -0,0 +1,31 @@
+import pytest
+
+
+class FakeBrowser:
+    """Заглушка AsyncBrowserManager без запуска Chromium."""
+
+    def __init__(self, mocker):
+        self.mocker = mocker
+        self.pages = []
+        self.refresh_session = mocker.AsyncMock(return_value={"sid": "1"})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def new_page(self):
+        page = self.mocker.MagicMock()
+        page.is_closed.return_value = False
+        page.close = self.mocker.AsyncMock()
+        self.pages.append(page)
+        return page
+
+
+@pytest.fixture
+def fake_browser(mocker):
+    """Подменяет AsyncBrowserManager в стадии деталей."""
+    browser = FakeBrowser(mocker)
+    mocker.patch("scraper.details.AsyncBrowserManager", return_value=browser)
+    return browser
@@ -0,0 +1,336 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from scraper.core.async_strategies import (
+    AsyncBaseScraper,
+    AsyncFallbackScraper,
+    AsyncProxyScraper,
+    AsyncScraperAPIScraper,
+    AsyncStandardScraper,
+)
+from scraper.core.config import GOLD_APPLE_API_URL, SITE_URL
+from scraper.core.proxy_manager import ProxyManager
+from scraper.core.strategies import (
+    STRATEGY_NAMES,
+    BaseScraper,
+    StandardScraper,
+    build_strategy,
+)
+
+
+def with_transport(strategy, handler, proxy=None):
+    strategy._clients[proxy] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    return strategy
+
+
+def test_async_fetch_sends_cookies_and_parses_json():
+    """Тест асинхронного запроса: cookies в заголовке и разбор JSON."""
+    seen = {}
+
+    def handler(request):
+        seen["cookie"] = request.headers["Cookie"]
+        return httpx.Response(200, json={"data": 1})
+
+    async def scenario():
+        async with with_transport(AsyncStandardScraper(), handler) as scraper:
+            return await scraper.fetch(
+                "http://api/x", {"Accept": "json"}, {"a": "1", "b": "2"}
+            )
+
+    assert asyncio.run(scenario()) == {"data": 1}
+    assert seen["cookie"] == "a=1; b=2"
+
+
+def test_async_request_errors_return_none():
+    """Тест: HTTP-ошибка возвращает None, а 304 отдаётся вызывающему."""
+    statuses = iter([503, 304])
+
+    def handler(request):
+        return httpx.Response(next(statuses))
+
+    async def scenario():
+        scraper = with_transport(AsyncStandardScraper(), handler)
+        failed = await scraper.request("http://api/x", {}, {})
+        not_modified = await scraper.request("http://api/x", {}, {})
+        await scraper.aclose()
+        return failed, not_modified
+
+    failed, not_modified = asyncio.run(scenario())
+    assert failed is None
+    assert not_modified.status_code == 304
+
+
+def test_async_request_follows_redirects(mocker):
+    """Тест: ответ после редиректа отдаётся, а не считается ошибкой."""
+
+    def handler(request):
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"Location": "/new"})
+        return httpx.Response(200, json={"moved": True})
+
+    client_class = httpx.AsyncClient
+    mocker.patch(
+        "httpx.AsyncClient",
+        side_effect=lambda **kwargs: client_class(
+            transport=httpx.MockTransport(handler), **kwargs
+        ),
+    )
+
+    async def scenario():
+        async with AsyncStandardScraper() as scraper:
+            return await scraper.fetch("http://api/old", {}, {})
+
+    assert asyncio.run(scenario()) == {"moved": True}
+
+
+def test_async_per_host_limit():
+    """Тест ограничения одновременных запросов к одному хосту."""
+    active = {"now": 0, "max": 0}
+
+    async def handler(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        scraper = with_transport(
+            AsyncStandardScraper(max_connections_per_host=2), handler
+        )
+        await asyncio.gather(
+            *(scraper.fetch(f"http://api/{i}", {}, {}) for i in range(6))
+        )
+        await scraper.aclose()
+
+    asyncio.run(scenario())
+    assert active["max"] == 2
+
+
+def test_async_proxy_uses_client_per_proxy():
+    """Тест: запрос через прокси идёт через пул этого прокси."""
+    manager = ProxyManager()
+    manager.proxies = ["10.0.0.1:8080"]
+    scraper = with_transport(
+        AsyncProxyScraper(manager),
+        lambda request: httpx.Response(200, json={"ok": True}),
+        proxy="http://10.0.0.1:8080",
+    )
+    assert asyncio.run(scraper.fetch("http://api/x", {}, {})) == {"ok": True}
+
+
+def test_sync_wrapper_shares_background_loop():
+    """Тест синхронной обёртки, вызываемой из нескольких потоков."""
+    scraper = StandardScraper()
+    with_transport(
+        scraper.async_strategy,
+        lambda request: httpx.Response(200, json={"url": str(request.url)}),
+    )
+    urls = [f"http://api/{i}" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(lambda url: scraper.fetch(url, {}, {}), urls)
+        )
+    assert [result["url"] for result in results] == urls
+    scraper.close()
+
+
+def test_async_proxy_retries_and_reports(mocker):
+    """Тест повтора через другой прокси и учёта результатов."""
+    mocker.patch(
+        "scraper.core.proxy_manager.random.choices",
+        side_effect=lambda candidates, weights: candidates[:1],
+    )
+    manager = ProxyManager(failure_threshold=1)
+    manager.add_proxies(["bad:1", "good:1"])
+    manager.report("good:1", True, 10.0)
+    scraper = AsyncProxyScraper(manager)
+    with_transport(
+        scraper, lambda request: httpx.Response(502), proxy="http://bad:1"
+    )
+    with_transport(
+        scraper,
+        lambda request: httpx.Response(200, json={"ok": True}),
+        proxy="http://good:1",
+    )
+
+    async def scenario():
+        return [await scraper.fetch("http://api/x", {}, {}) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [{"ok": True}] * 3
+    assert manager.healthy_proxies() == ["good:1"]
+    assert manager.stats["good:1"].latency < 10.0
+
+
+def test_async_proxy_off_loop_and_prunes_clients(mocker):
+    """Тест выбора прокси вне event loop и закрытия пулов удалённых прокси."""
+    manager = ProxyManager()
+    manager.add_proxies(["gone:1", "live:1"])
+    threads = []
+    get_proxy = manager.get_proxy
+
+    def pick():
+        threads.append(threading.current_thread())
+        return get_proxy()
+
+    mocker.patch.object(manager, "get_proxy", side_effect=pick)
+    scraper = AsyncProxyScraper(manager)
+    for proxy in manager.proxies:
+        with_transport(
+            scraper,
+            lambda request: httpx.Response(200, json={"ok": True}),
+            proxy=scraper.proxy_url(proxy),
+        )
+    gone = scraper._clients["http://gone:1"]
+
+    async def scenario():
+        with manager._lock:
+            manager._eject("gone:1")
+        return await scraper.fetch("http://api/x", {}, {})
+
+    assert asyncio.run(scenario()) == {"ok": True}
+    assert threads and threading.main_thread() not in threads
+    assert list(scraper._clients) == ["http://live:1"]
+    assert gone.is_closed
+
+
+class FakeTier(AsyncBaseScraper):
+    def __init__(self, delay, result="ok", status=200):
+        super().__init__()
+        self.delay = delay
+        self.result = result
+        self.status = status
+        self.calls = 0
+        self.cancelled = 0
+
+    async def send(self, url, headers, cookies):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.result is None:
+            raise httpx.ConnectError("недоступен")
+        response = httpx.Response(
+            self.status, text=self.result, request=httpx.Request("GET", url)
+        )
+        response.raise_for_status()
+        return response
+
+
+def fallback_text(scraper):
+    response = asyncio.run(scraper.request("http://api/u", {}, {}))
+    return None if response is None else response.text
+
+
+def test_fallback_moves_to_next_tier_on_error():
+    """Тест перехода к следующему уровню при ошибке без ожидания."""
+    failing, backup = FakeTier(0, result=None), FakeTier(0, "backup")
+    scraper = AsyncFallbackScraper([failing, backup], budgets=(10, 10))
+    assert fallback_text(scraper) == "backup"
+    assert scraper.stats() == {"wins": [0, 1], "hedged": 0}
+
+
+def test_fallback_escalates_only_proxy_failures():
+    """Тест: 5xx и блокировка прокси ведут дальше, а 404 - окончательна."""
+    blocked, broken = FakeTier(0, "", 403), FakeTier(0, "", 502)
+    missing, paid = FakeTier(0, "", 404), FakeTier(0, "paid")
+    scraper = AsyncFallbackScraper(
+        [blocked, broken, missing, paid], budgets=(10,)
+    )
+
+    assert fallback_text(scraper) is None
+    assert [blocked.calls, broken.calls, missing.calls] == [1, 1, 1]
+    assert paid.calls == 0
+    assert scraper.stats() == {"wins": [0, 0, 1, 0], "hedged": 0}
+
+
+def test_fallback_hedges_slow_primary():
+    """Тест хедж-запроса, когда основной уровень не уложился в порог."""
+    slow, fast = FakeTier(1.0), FakeTier(0, "hedge")
+    scraper = AsyncFallbackScraper([slow, fast], budgets=(0.05, 10))
+    assert fallback_text(scraper) == "hedge"
+    assert scraper.stats() == {"wins": [0, 1], "hedged": 1}
+    assert slow.cancelled == 1
+
+
+def test_fallback_hedge_delay_uses_percentile():
+    """Тест порога хеджирования по перцентилю задержек уровня."""
+    scraper = AsyncFallbackScraper(
+        [FakeTier(0), FakeTier(0)], budgets=(5, 5), min_samples=10
+    )
+    assert scraper.hedge_delay(0) == 5
+    scraper.latencies[0].extend(i / 100 for i in range(1, 101))
+    assert scraper.hedge_delay(0) == 0.95
+
+
+def test_fallback_primary_wins_without_hedging():
+    """Тест: быстрый основной уровень не вызывает остальные."""
+    primary, backup = FakeTier(0, "primary"), FakeTier(0, "backup")
+    scraper = AsyncFallbackScraper([primary, backup], budgets=(1, 1))
+    assert fallback_text(scraper) == "primary"
+    assert backup.calls == 0
+    assert len(scraper.latencies[0]) == 1
+
+
+def test_scraperapi_auto_render_per_endpoint():
+    """Тест: JSON API без рендеринга, HTML-страницы с рендерингом."""
+    renders = []
+
+    def handler(request):
+        renders.append(request.url.params["render"])
+        return httpx.Response(200, json={})
+
+    scraper = with_transport(AsyncScraperAPIScraper(render="auto"), handler)
+
+    async def scenario():
+        await scraper.request(f"{GOLD_APPLE_API_URL}/catalog/products", {}, {})
+        await scraper.request(f"{SITE_URL}/19000001-parfum", {}, {})
+        await scraper.aclose()
+
+    asyncio.run(scenario())
+    assert renders == ["false", "true"]
+    assert scraper.stats() == {"requests": 2, "rendered": 1, "credits": 11}
+
+
+def test_scraperapi_concurrency_and_credits():
+    """Тест ограничения параллельности и учёта кредитов за 200 и 404."""
+    active = {"now": 0, "max": 0}
+    statuses = iter([200, 404, 500, 200])
+
+    async def handler(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return httpx.Response(next(statuses), json={})
+
+    scraper = with_transport(
+        AsyncScraperAPIScraper(render="never", concurrency=1), handler
+    )
+
+    async def scenario():
+        await asyncio.gather(
+            *(scraper.request(f"{SITE_URL}/{i}", {}, {}) for i in range(4))
+        )
+        await scraper.aclose()
+
+    asyncio.run(scenario())
+    assert active["max"] == 1
+    assert scraper.stats() == {"requests": 3, "rendered": 0, "credits": 3}
+
+
+def test_build_strategy_accepts_every_cli_name(mocker):
+    """Тест создания каждой стратегии, доступной в CLI."""
+    mocker.patch("scraper.core.async_strategies.ProxyManager")
+    for name in STRATEGY_NAMES:
+        strategy = build_strategy(name, render="never")
+        assert isinstance(strategy, BaseScraper)
+    fallback = build_strategy("fallback", render="never")
+    assert fallback.fallback.tiers[-1].render == "never"
@@ -0,0 +1,55 @@
+import asyncio
+
+from scraper.core.browser import RequestBlocker
+
+
+def test_blocks_heavy_resources_and_trackers():
+    """Тест блокировки тяжёлых ресурсов и трекеров."""
+    blocker = RequestBlocker()
+    assert blocker.should_block("image", "https://goldapple.ru/a.jpg")
+    assert blocker.should_block("font", "https://goldapple.ru/a.woff2")
+    assert blocker.should_block("script", "https://mc.yandex.ru/metrika.js")
+    assert blocker.should_block(
+        "script", "https://www.googletagmanager.com/gtm.js"
+    )
+    assert not blocker.should_block("script", "https://goldapple.ru/app.js")
+    assert not blocker.should_block("fetch", "https://goldapple.ru/front/api")
+
+
+def test_allowed_domains_and_document():
+    """Тест списка разрешённых доменов; документ не блокируется."""
+    blocker = RequestBlocker(
+        resource_types=(),
+        blocked_domains=(),
+        allowed_domains=("goldapple.ru",),
+    )
+    assert not blocker.should_block("script", "https://static.goldapple.ru/a")
+    assert blocker.should_block("script", "https://cdn.other.com/a.js")
+    assert not blocker.should_block("document", "https://other.com/")
+
+
+def test_disabled_blocker():
+    """Тест отключённой блокировки."""
+    blocker = RequestBlocker(resource_types=(), blocked_domains=())
+    assert not blocker.enabled
+    assert not blocker.should_block("image", "https://goldapple.ru/a.jpg")
+
+
+def test_handle_async_aborts_and_continues(mocker):
+    """Тест обработчика маршрутов асинхронного Playwright."""
+    blocker = RequestBlocker()
+    image = mocker.MagicMock()
+    image.request.resource_type = "image"
+    image.request.url = "https://goldapple.ru/a.jpg"
+    image.abort = mocker.AsyncMock()
+    script = mocker.MagicMock()
+    script.request.resource_type = "script"
+    script.request.url = "https://goldapple.ru/app.js"
+    script.continue_ = mocker.AsyncMock()
+
+    asyncio.run(blocker.handle_async(image))
+    asyncio.run(blocker.handle_async(script))
+
+    image.abort.assert_awaited_once()
+    script.continue_.assert_awaited_once()
+    assert blocker.blocked == 1
@@ -0,0 +1,183 @@
+import asyncio
+import os
+import queue
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from scraper.browser_pool import (
+    CONTEXT,
+    CRASHED,
+    DONE,
+    RESTART,
+    BrowserPool,
+    BrowserPoolSettings,
+    _serve,
+    tree_rss,
+)
+from scraper.parser import GoldParser
+from scraper.pipeline import CrawlPipeline
+from scraper.utils.journal import Journal
+from scraper.utils.writer import CSVWriter
+
+
+def fake_worker(worker_id, inbox, results, settings):
+    """Воркер без браузера: падает один раз на ссылках с маркером."""
+    while (task := inbox.get()) is not None:
+        token, link = task
+        kind, _, marker = link.partition("#")
+        if marker and not os.path.exists(marker):
+            open(marker, "w").close()
+            if kind == "/die":
+                os._exit(1)
+            results.put(
+                ("crashed", worker_id, token, "Target closed", "context")
+            )
+            continue
+        details = {"usage": f"usage {kind}", "country": "Франция"}
+        results.put(
+            ("done", worker_id, token, details, {"load_page": 0.01}, None)
+        )
+
+
+def broken_worker(worker_id, inbox, results, settings):
+    """Воркер, у которого не запускается браузер."""
+    os._exit(1)
+
+
+def run_pool(pool, products):
+    async def scenario():
+        queue = asyncio.Queue()
+        for product in products:
+            queue.put_nowait(product)
+        queue.put_nowait(None)
+        done = []
+        await pool.run(queue, lambda product, fetched: done.append(product))
+        return done
+
+    return asyncio.run(scenario())
+
+
+def test_tree_rss_counts_current_process():
+    """Тест подсчёта памяти дерева процессов."""
+    rss = tree_rss(os.getpid())
+    if rss is None:
+        pytest.skip("нет /proc")
+    assert rss > 1024 * 1024
+
+
+def test_pool_processes_all_products():
+    """Тест раздачи товаров процессам через очередь."""
+    products = [{"link": f"/p{index}"} for index in range(6)]
+    pool = BrowserPool(2, worker=fake_worker)
+
+    done = run_pool(pool, products)
+
+    assert sorted(product["link"] for product in done) == [
+        f"/p{index}" for index in range(6)
+    ]
+    assert all(product["country"] == "Франция" for product in products)
+    assert pool.errors == 0
+
+
+def test_pool_requeues_after_crash(tmp_path):
+    """Тест повтора товара после падения браузера и процесса."""
+    products = [
+        {"link": f"/crash#{tmp_path / 'crash'}"},
+        {"link": f"/die#{tmp_path / 'die'}"},
+        {"link": "/ok", "usage": "из API"},
+    ]
+    pool = BrowserPool(2, worker=fake_worker)
+
+    done = run_pool(pool, products)
+
+    assert len(done) == 3
+    assert products[0]["usage"] == "usage /crash"
+    assert products[1]["usage"] == "usage /die"
+    assert products[2]["usage"] == "usage /ok"
+    assert pool.requeued == 2
+    assert pool.restarts == 1
+    assert pool.context_resets == 1
+
+
+def test_serve_reports_crash_during_extraction(mocker):
+    """Тест падения страницы во время извлечения деталей."""
+    browser = mocker.MagicMock(is_connected=True)
+    page = browser.new_page.return_value
+    page.wait_for_selector.side_effect = [
+        None,
+        None,
+        PlaywrightTimeoutError("нет вкладок"),
+    ]
+    page.evaluate.side_effect = [
+        Exception("Target crashed"),
+        {"country": ["Франция", False], "usage": ["Нанести", False]},
+    ]
+    inbox = queue.Queue()
+    for token, link in enumerate(["/crash", "/ok", "/empty"]):
+        inbox.put((token, link))
+    inbox.put(None)
+    results = queue.Queue()
+
+    _serve(0, browser, inbox, results, BrowserPoolSettings())
+
+    crashed = results.get_nowait()
+    assert crashed[:3] == (CRASHED, 0, 0)
+    assert "Target crashed" in crashed[3]
+    assert crashed[4] == CONTEXT
+    browser.recycle_context.assert_called_once()
+    done = results.get_nowait()
+    assert done[:4] == (
+        DONE,
+        0,
+        1,
+        {"country": "Франция", "usage": "Нанести"},
+    )
+    empty = results.get_nowait()
+    assert empty[:4] == (DONE, 0, 2, {"country": "N/A", "usage": "N/A"})
+    assert empty[5] is None
+
+
+def test_serve_restarts_disconnected_browser(mocker):
+    """Тест: упавший браузер перезапускается, а не пересоздаёт контекст."""
+    browser = mocker.MagicMock(is_connected=False)
+    browser.new_page.return_value.goto.side_effect = Exception("closed")
+    inbox = queue.Queue()
+    inbox.put((1, "/p1"))
+    results = queue.Queue()
+
+    assert _serve(0, browser, inbox, results, BrowserPoolSettings()) == (
+        RESTART
+    )
+    assert results.get_nowait()[4] == RESTART
+    browser.recycle_context.assert_not_called()
+
+
+def test_pool_gives_up_when_browser_never_starts():
+    """Тест остановки, если процессы падают, не обработав товаров."""
+    pool = BrowserPool(1, max_attempts=2, worker=broken_worker)
+    with pytest.raises(RuntimeError):
+        run_pool(pool, [{"link": "/p1"}])
+
+
+def test_pipeline_uses_pool(mocker, tmp_path):
+    """Тест конвейера, собирающего детали в пуле процессов."""
+    scraper = mocker.MagicMock()
+
+    def iter_pages():
+        yield [{"itemId": index, "url": f"/p{index}"} for index in range(3)]
+
+    scraper.iter_pages.side_effect = iter_pages
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(tmp_path / "out.csv")),
+        details="browser",
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+        progress=False,
+        pool=BrowserPool(2, worker=fake_worker),
+    )
+
+    assert pipeline.run() == 3
+    scraper.fetch_product_details_async.assert_not_called()
+    assert "Франция" in (tmp_path / "out.csv").read_text(encoding="utf-8")
@@ -0,0 +1,95 @@
+import requests
+
+from scraper.core.cache import CachedScraper, ResponseCache
+from scraper.core.strategies import BaseScraper
+
+
+def make_response(status, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+def make_cached(mocker, tmp_path, responses, ttls=None, max_bytes=10**6):
+    strategy = mocker.MagicMock(spec=BaseScraper)
+    strategy.request.side_effect = responses
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes)
+    return CachedScraper(strategy, cache, ttls), strategy
+
+
+def test_fresh_entry_served_from_cache(mocker, tmp_path):
+    """Тест ответа из кеша без повторного запроса."""
+    scraper, strategy = make_cached(
+        mocker, tmp_path, [make_response(200, b'{"data": 1}')]
+    )
+    assert scraper.fetch("http://api/x", {}, {}) == {"data": 1}
+    assert scraper.fetch("http://api/x", {}, {}) == {"data": 1}
+    assert strategy.request.call_count == 1
+    assert scraper.stats() == {"hits": 1, "misses": 1, "revalidated": 0}
+
+
+def test_stale_entry_revalidated_with_etag(mocker, tmp_path):
+    """Тест условного запроса по ETag и ответа 304."""
+    scraper, strategy = make_cached(
+        mocker,
+        tmp_path,
+        [
+            make_response(200, b'{"v": 1}', {"ETag": '"abc"'}),
+            make_response(304),
+        ],
+        ttls={"http://api": 0},
+    )
+    scraper.fetch("http://api/x", {"Accept": "json"}, {})
+    assert scraper.fetch("http://api/x", {"Accept": "json"}, {}) == {"v": 1}
+    headers = strategy.request.call_args_list[1].args[1]
+    assert headers["If-None-Match"] == '"abc"'
+    assert scraper.revalidated == 1
+
+
+def test_failed_request_not_cached(mocker, tmp_path):
+    """Тест: ошибки сети не попадают в кеш."""
+    scraper, _ = make_cached(
+        mocker, tmp_path, [None, make_response(200, b"{}")]
+    )
+    assert scraper.fetch("http://api/x", {}, {}) is None
+    assert scraper.fetch("http://api/x", {}, {}) == {}
+    assert scraper.misses == 2
+
+
+def test_non_json_response_not_cached(mocker, tmp_path):
+    """Тест: HTML-заглушка с кодом 200 не сохраняется в кеш."""
+    scraper, strategy = make_cached(
+        mocker,
+        tmp_path,
+        [
+            make_response(200, b"<html>captcha</html>"),
+            make_response(200, b'{"data": 1}'),
+        ],
+    )
+    assert scraper.fetch("http://api/x", {}, {}) is None
+    assert scraper.fetch("http://api/x", {}, {}) == {"data": 1}
+    assert scraper.fetch("http://api/x", {}, {}) == {"data": 1}
+    assert strategy.request.call_count == 2
+
+
+def test_lru_eviction(tmp_path):
+    """Тест вытеснения давно неиспользованных записей по размеру."""
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.size() == 10
+
+
+def test_ttl_longest_prefix(mocker, tmp_path):
+    """Тест выбора TTL по самому длинному префиксу."""
+    scraper, _ = make_cached(
+        mocker, tmp_path, [], ttls={"http://api": 10, "http://api/card": 99}
+    )
+    assert scraper.ttl_for("http://api/card?id=1") == 99
+    assert scraper.ttl_for("http://api/list") == 10
@@ -0,0 +1,72 @@
+import asyncio
+
+from scraper.details import DetailCrawler
+from scraper.scraper import GoldScraper
+
+
+def make_crawler(mocker, details, workers=2):
+    scraper = mocker.MagicMock()
+    scraper.fetch_product_details_async = mocker.AsyncMock(side_effect=details)
+    return DetailCrawler(scraper, workers=workers)
+
+
+def test_crawl_updates_products(mocker, fake_browser):
+    """Тест обогащения товаров деталями несколькими воркерами."""
+
+    async def details(link, page):
+        await asyncio.sleep(0)
+        return {"usage": f"usage {link}", "country": "Франция"}
+
+    crawler = make_crawler(mocker, details, workers=3)
+    products = [{"link": f"/p{i}"} for i in range(5)]
+    result = crawler.crawl(products)
+
+    assert result is products
+    assert all(p["country"] == "Франция" for p in products)
+    assert products[4]["usage"] == "usage /p4"
+    assert len(fake_browser.pages) == 3
+    assert all(page.close.await_count == 1 for page in fake_browser.pages)
+
+
+def test_crawl_isolates_worker_errors(mocker, fake_browser):
+    """Тест изоляции ошибки одного товара от остальных."""
+
+    async def details(link, page):
+        if link == "/bad":
+            raise RuntimeError("boom")
+        return {"usage": "ok", "country": "Италия"}
+
+    crawler = make_crawler(mocker, details, workers=1)
+    products = [{"link": "/bad", "usage": "N/A"}, {"link": "/good"}]
+    crawler.crawl(products)
+
+    assert crawler.errors == 1
+    assert products[0]["usage"] == "N/A"
+    assert products[1]["country"] == "Италия"
+
+
+def test_crawl_counts_page_failures(mocker, fake_browser):
+    """Тест учёта ошибок загрузки страницы в счётчике воркеров."""
+    scraper = GoldScraper(
+        mocker.MagicMock(), "1", "2", headers_manager=mocker.MagicMock()
+    )
+    fake_browser.new_page = mocker.AsyncMock(
+        return_value=mocker.MagicMock(
+            goto=mocker.AsyncMock(side_effect=RuntimeError("net::ERR")),
+            is_closed=mocker.MagicMock(return_value=False),
+            close=mocker.AsyncMock(),
+        )
+    )
+    crawler = DetailCrawler(scraper, workers=1)
+    products = [{"link": "/p1"}, {"link": "/p2"}]
+
+    assert crawler.crawl(products) is products
+    assert crawler.errors == 2
+    assert "usage" not in products[0]
+
+
+def test_crawl_empty(mocker, fake_browser):
+    """Тест пустого списка товаров без запуска браузера."""
+    crawler = make_crawler(mocker, None)
+    assert crawler.crawl([]) == []
+    assert fake_browser.pages == []
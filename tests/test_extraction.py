@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+from playwright.sync_api import sync_playwright
+
+from scraper.core.config import EXTRACTION_TAB_TIMEOUT_MS
+from scraper.extraction import (
+    CAPTURE_JS,
+    EXTRACT_JS,
+    PRODUCT_DETAILS_SPEC,
+    DetailExtractor,
+    ExtractionSpec,
+    FieldSpec,
+)
+
+
+def test_extract_uses_single_evaluate(mocker):
+    """Тест извлечения всех полей одним вызовом evaluate."""
+    page = mocker.MagicMock()
+    page.evaluate.return_value = {
+        "country": [
+            "страна происхождения\nФранция\nизготовитель: Chanel",
+            True,
+        ],
+        "usage": ["  Нанести на кожу.  ", True],
+    }
+    extractor = DetailExtractor()
+
+    assert extractor.extract(page) == {
+        "country": "Франция",
+        "usage": "Нанести на кожу.",
+    }
+    page.evaluate.assert_called_once_with(EXTRACT_JS, extractor.payload)
+    fields = extractor.payload["fields"]
+    assert [field["name"] for field in fields] == ["country", "usage"]
+    assert extractor.payload["panelSelector"] == (
+        PRODUCT_DETAILS_SPEC.panel_selector
+    )
+
+
+def test_extract_async(mocker):
+    """Тест асинхронного извлечения полей."""
+    page = mocker.MagicMock()
+    page.evaluate = mocker.AsyncMock(
+        return_value={"country": ["Италия", False], "usage": [None, False]}
+    )
+
+    result = asyncio.run(DetailExtractor().extract_async(page))
+
+    assert result == {"country": "Италия", "usage": "N/A"}
+    page.evaluate.assert_awaited_once()
+
+
+def test_postprocess_missing_and_unmatched():
+    """Тест значений N/A для пустых полей и текста без совпадения."""
+    extractor = DetailExtractor()
+    assert extractor.postprocess(None) == {"country": "N/A", "usage": "N/A"}
+    assert extractor.postprocess(
+        {"country": ["Состав: вода", True], "usage": ["   ", True]}
+    ) == {"country": "N/A", "usage": "N/A"}
+
+
+def test_custom_spec_split():
+    """Тест обрезки значения по `split` в пользовательской спецификации."""
+    extractor = DetailExtractor(
+        ExtractionSpec(
+            fields=(FieldSpec(name="volume", tab="Объём", split=r"\s*мл"),)
+        )
+    )
+    assert extractor.postprocess({"volume": ["50 мл, флакон", True]}) == {
+        "volume": "50"
+    }
+    assert extractor.postprocess({"volume": ["50 мл", False]}) == {
+        "volume": "50 мл"
+    }
+
+
+SNAPSHOT = """<!DOCTYPE html><html><head><style>.kDcPG{}</style></head>
+<body><button class="ga-tabs-tab">Описание</button>
+<div class="kDcPG">Описание товара</div>
+<script>var tab = "<div>страна происхождения</div>";</script>
+<section data-snapshot-tab="Применение">
+  <p>Нанести&nbsp;на   кожу.</p><p>Не глотать.</p>
+</section>
+<section data-snapshot-tab="Дополнительная информация"><div>
+  <div>страна происхождения</div><div>Франция</div>
+  <div>изготовитель</div><div>Chanel</div>
+</div></section></body></html>"""
+
+
+def test_extract_html_from_tabs():
+    """Тест офлайн-извлечения полей из вкладок снимка."""
+    assert DetailExtractor().extract_html(SNAPSHOT) == {
+        "country": "Франция",
+        "usage": "Нанести на кожу.\nНе глотать.",
+    }
+
+
+def test_extract_html_fallbacks():
+    """Тест офлайн-аналогов XPath, когда вкладок в снимке нет."""
+    html = (
+        '<div class="kDcPG wide">Use <b>it</b></div>'
+        "<div>страна происхождения</div><div>Италия</div>"
+    )
+    assert DetailExtractor().extract_html(html) == {
+        "country": "Италия",
+        "usage": "Use it",
+    }
+    assert DetailExtractor().extract_html("") == {
+        "country": "N/A",
+        "usage": "N/A",
+    }
+
+
+def test_capture_async(mocker):
+    """Тест снимка страницы одним вызовом evaluate."""
+    page = mocker.MagicMock()
+    page.evaluate = mocker.AsyncMock(return_value=SNAPSHOT)
+    extractor = DetailExtractor()
+
+    assert asyncio.run(extractor.capture_async(page)) == SNAPSHOT
+    page.evaluate.assert_awaited_once_with(CAPTURE_JS, extractor.payload)
+
+
+def test_extract_active_tab_without_waiting():
+    """Тест: открытая вкладка читается без клика и ожидания смены панели."""
+    html = (
+        '<button class="ga-tabs-tab">Дополнительная информация</button>'
+        '<button class="ga-tabs-tab ga-tabs-tab_active" '
+        'aria-selected="true">Применение</button>'
+        '<div class="kDcPG" style="display: none">'
+        "<div>страна происхождения</div><div>Франция</div></div>"
+        '<div class="kDcPG">Нанести на кожу.</div>'
+    )
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        page = browser.new_page()
+        page.set_content(html)
+        started = time.perf_counter()
+        details = DetailExtractor().extract(page)
+        elapsed = time.perf_counter() - started
+        browser.close()
+
+    assert details == {"country": "Франция", "usage": "Нанести на кожу."}
+    assert elapsed < EXTRACTION_TAB_TIMEOUT_MS / 1000
@@ -0,0 +1,82 @@
+import csv
+import json
+
+import pytest
+
+from scraper.core.config import DEFAULT_CITY_ID
+from scraper.jobs import (
+    CrawlJob,
+    JobScheduler,
+    JobSettings,
+    load_jobs,
+    parse_job,
+)
+from scraper.utils.dedup import SharedKeySet
+from scraper.utils.writer import CSVWriter
+
+
+def fake_job(job, settings, seen, output):
+    """Задание-заглушка: товары 1-3 пересекаются между категориями."""
+    written = 0
+    for index in range(1, 4):
+        if seen.claim(f"{job.city_id}:{index}"):
+            output.put((job.label, {"link": f"{job.city_id}/{index}"}))
+            written += 1
+    return written
+
+
+def test_parse_job_and_load_jobs(tmp_path):
+    """Тест разбора заданий из CLI и из JSON-файла."""
+    assert parse_job("100:msk", 3) == CrawlJob("100", "msk", 3)
+    assert parse_job("100") == CrawlJob("100", DEFAULT_CITY_ID, None)
+    with pytest.raises(ValueError):
+        parse_job(":msk")
+
+    path = tmp_path / "jobs.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"category_id": 100, "city_id": "msk"},
+                {"category_id": "200", "pages": "all"},
+            ]
+        )
+    )
+    assert load_jobs(str(path), max_pages=5) == [
+        CrawlJob("100", "msk", 5),
+        CrawlJob("200", DEFAULT_CITY_ID, None),
+    ]
+
+
+def test_shared_key_set_claims_once():
+    """Тест: ключ достаётся только первому обработчику."""
+    seen = SharedKeySet({})
+    assert seen.claim("a") is True
+    assert seen.claim("a") is False
+    assert len(seen) == 1
+
+
+def test_scheduler_combines_output_without_duplicates(tmp_path):
+    """Тест пула процессов: общий вывод и дедупликация между заданиями."""
+    jobs = [
+        CrawlJob("100", "msk"),
+        CrawlJob("200", "msk"),
+        CrawlJob("100", "spb"),
+    ]
+    path = tmp_path / "out.csv"
+    scheduler = JobScheduler(
+        jobs,
+        JobSettings(requests_per_second=4),
+        CSVWriter(str(path)),
+        processes=2,
+        runner=fake_job,
+    )
+
+    results = scheduler.run()
+
+    with open(path, encoding="utf-8") as file:
+        links = sorted(row["Ссылка"] for row in csv.DictReader(file))
+    assert links == [
+        f"{city}/{i}" for city in ("msk", "spb") for i in (1, 2, 3)
+    ]
+    assert sum(results.values()) == 6
+    assert scheduler.settings.requests_per_second == 2
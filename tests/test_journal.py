@@ -0,0 +1,50 @@
+from scraper.utils.journal import Journal
+
+
+def test_record_and_load_keys(tmp_path):
+    """Тест записи товаров и чтения их ключей."""
+    journal = Journal(str(tmp_path / "journal.jsonl"))
+    journal.open()
+    journal.record({"id": "1", "link": "http://a.com", "name": "А"})
+    journal.record({"id": "", "link": "http://b.com"})
+    journal.close()
+
+    assert journal.load_keys() == {"1", "http://b.com"}
+    assert list(journal.iter_records())[0]["name"] == "А"
+
+
+def test_resume_after_truncated_line(tmp_path):
+    """Тест продолжения журнала после оборванной при сбое строки."""
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"id": "1", "link": "a"}\n{"id": "2", "li', "utf-8")
+
+    journal = Journal(str(path))
+    journal.open(resume=True)
+    journal.record({"id": "3", "link": "c"})
+    journal.close()
+
+    assert journal.load_keys() == {"1", "3"}
+
+
+def test_resume_after_truncated_multibyte_line(tmp_path):
+    """Тест продолжения журнала, оборванного посреди кириллицы."""
+    path = tmp_path / "journal.jsonl"
+    tail = '{"id": "2", "name": "Духи"'.encode("utf-8")[:-2]
+    path.write_bytes(b'{"id": "1", "link": "a"}\n' + tail)
+
+    journal = Journal(str(path))
+    journal.open(resume=True)
+    journal.record({"id": "3", "link": "c", "name": "Крем"})
+    journal.close()
+
+    assert journal.load_keys() == {"1", "3"}
+    assert list(journal.iter_records())[-1]["name"] == "Крем"
+
+
+def test_open_without_resume_truncates(tmp_path):
+    """Тест очистки журнала при новом запуске."""
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"id": "1", "link": "a"}\n', "utf-8")
+    with Journal(str(path)) as journal:
+        journal.open()
+    assert journal.load_keys() == set()
@@ -0,0 +1,96 @@
+import json
+
+import httpx
+import pytest
+
+from scraper.core.metrics import Histogram, Metrics, metrics
+from scraper.core.strategies import BaseScraper
+
+
+class FakeScraper(BaseScraper):
+    def __init__(self, response):
+        self.response = response
+
+    def request(self, url, headers, cookies):
+        return self.response
+
+
+def test_histogram_quantiles_and_reservoir():
+    """Тест квантилей и ограниченной выборки гистограммы."""
+    histogram = Histogram(size=50)
+    for value in range(1, 1001):
+        histogram.observe(value / 1000)
+    assert histogram.count == 1000
+    assert len(histogram.samples) == 50
+    assert histogram.total == pytest.approx(500.5)
+    quantiles = histogram.quantiles()
+    assert set(quantiles) == {0.5, 0.95, 0.99}
+    assert quantiles[0.5] <= quantiles[0.95] <= quantiles[0.99]
+
+
+def test_timer_counts_errors_by_type():
+    """Тест учёта исключений стадии по имени типа."""
+    registry = Metrics()
+    with registry.timer("load_page"):
+        pass
+    with pytest.raises(TimeoutError):
+        with registry.timer("load_page"):
+            raise TimeoutError
+    summary = registry.summary()
+    assert summary["stages"]["load_page"]["count"] == 2
+    assert summary["errors"] == {"load_page:TimeoutError": 1}
+
+
+def test_prometheus_format():
+    """Тест текстового формата Prometheus с общими метками."""
+    registry = Metrics({"job": "1@msk"})
+    registry.observe("fetch", 0.25)
+    registry.add_bytes("fetch", 1024)
+    registry.error("fetch", "NoResponse")
+    registry.count("products", 4)
+    text = registry.prometheus()
+    assert "# TYPE goldscraper_stage_seconds summary" in text
+    assert (
+        'goldscraper_stage_seconds{job="1@msk",stage="fetch",'
+        'quantile="0.99"} 0.250000'
+    ) in text
+    assert 'goldscraper_stage_seconds_count{job="1@msk",stage="fetch"} 1' in (
+        text
+    )
+    assert (
+        'goldscraper_errors_total{job="1@msk",stage="fetch",'
+        'type="NoResponse"} 1'
+    ) in text
+    assert 'goldscraper_bytes_total{job="1@msk",stage="fetch"} 1024' in text
+    assert 'goldscraper_products_total{job="1@msk"} 4' in text
+    assert "goldscraper_seconds_per_product" in text
+
+
+def test_export_writes_files(tmp_path):
+    """Тест выгрузки метрик в файл Prometheus и JSON."""
+    registry = Metrics()
+    registry.observe("write", 0.001)
+    registry.export(str(tmp_path / "out"))
+
+    assert (tmp_path / "out" / "metrics.prom").read_text(encoding="utf-8")
+    summary = json.loads(
+        (tmp_path / "out" / "metrics.json").read_text(encoding="utf-8")
+    )
+    assert summary["stages"]["write"]["p50_ms"] == pytest.approx(1.0)
+    assert not list((tmp_path / "out").glob("*.tmp"))
+
+
+def test_fetch_records_bytes_and_errors():
+    """Тест метрик запроса: время, байты и пустой ответ."""
+    metrics.reset()
+    request = httpx.Request("GET", "http://api/x")
+    ok = httpx.Response(200, json={"data": 1}, request=request)
+
+    assert FakeScraper(ok).fetch("http://api/x", {}, {}) == {"data": 1}
+    assert FakeScraper(None).fetch("http://api/x", {}, {}) is None
+
+    summary = metrics.summary()
+    assert summary["stages"]["fetch"]["count"] == 2
+    assert summary["bytes"]["fetch"] == len(ok.content)
+    assert summary["errors"] == {"fetch:NoResponse": 1}
+    metrics.reset()
@@ -37,6 +37,35 @@ def test_parse_product_missing_fields():
     assert result["description"] == "N/A"
 
 
+def test_parse_page():
+    """Тест пакетного разбора страницы в типизированные записи."""
+    products = [
+        {
+            "itemId": 7,
+            "url": "/test-product",
+            "brand": "TestBrand",
+            "name": "TestName",
+            "price": {"actual": {"amount": "1000"}},
+            "reviews": {"rating": 4.5},
+            "productType": "Perfume",
+        },
+        {"url": "/empty", "price": None, "reviews": {"rating": "нет"}},
+    ]
+    first, second = GoldParser.parse_page(products)
+    assert first.id == "7"
+    assert first.link == "https://goldapple.ru/test-product"
+    assert first.name == "TestBrand TestName"
+    assert first.price == 1000
+    assert first.rating == 4.5
+    assert first.description == "Perfume"
+    assert first.usage is None
+    assert second.id == ""
+    assert second.price is None
+    assert second.rating is None
+    assert second["price"] == "N/A"
+    assert second.get("description") == "N/A"
+
+
 @pytest.mark.playwright
 def test_parse_product_details(mocker):
     """Тест парсинга деталей продукта с Playwright."""
@@ -64,3 +93,55 @@ def test_parse_product_details(mocker):
         assert result["country"].strip(string.punctuation + " ") == "Франция"
 
         browser.close()
+
+
+def test_parse_product_card():
+    """Тест извлечения деталей из JSON карточки товара."""
+    data = {
+        "data": {
+            "productDescription": [
+                {"text": "описание", "content": "Аромат"},
+                {
+                    "text": "применение",
+                    "content": "Нанести на кожу.<br>Не распылять в глаза.",
+                },
+                {
+                    "text": "Дополнительная информация",
+                    "attributes": [
+                        {"name": "страна происхождения", "value": "Франция"}
+                    ],
+                },
+            ]
+        }
+    }
+    result = GoldParser.parse_product_card(data)
+    assert result["usage"] == "Нанести на кожу.\nНе распылять в глаза."
+    assert result["country"] == "Франция"
+
+
+def test_parse_product_card_country_from_text():
+    """Тест извлечения страны из HTML-текста раздела."""
+    data = {
+        "data": {
+            "productDescription": [
+                {
+                    "text": "Дополнительная информация",
+                    "content": (
+                        "<div>страна происхождения</div><div>Италия</div>"
+                        "<div>изготовитель</div><div>ООО Тест</div>"
+                    ),
+                }
+            ]
+        }
+    }
+    result = GoldParser.parse_product_card(data)
+    assert result["country"] == "Италия"
+    assert result["usage"] == "N/A"
+
+
+def test_parse_product_card_empty():
+    """Тест пустого ответа карточки товара."""
+    assert GoldParser.parse_product_card(None) == {
+        "usage": "N/A",
+        "country": "N/A",
+    }
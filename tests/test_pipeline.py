@@ -0,0 +1,243 @@
+import csv
+
+from scraper.parser import GoldParser
+from scraper.pipeline import CrawlPipeline
+from scraper.utils.dedup import SharedKeySet
+from scraper.utils.journal import Journal
+from scraper.utils.state import ProductStateStore
+from scraper.utils.writer import CSVWriter
+
+
+def raw_product(item_id):
+    return {"itemId": item_id, "url": f"/{item_id}", "name": f"P{item_id}"}
+
+
+def make_scraper(mocker, pages, api_details):
+    scraper = mocker.MagicMock()
+
+    def iter_pages():
+        yield from pages
+
+    scraper.iter_pages.side_effect = iter_pages
+    scraper.fetch_product_details_api.side_effect = api_details
+
+    async def browser_details(link, page):
+        return {"usage": "из браузера", "country": "Франция"}
+
+    scraper.fetch_product_details_async = mocker.AsyncMock(
+        side_effect=browser_details
+    )
+    return scraper
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def test_pipeline_streams_api_and_browser(mocker, fake_browser, tmp_path):
+    """Тест потоковой записи товаров из API и из браузера."""
+
+    def api_details(item_id):
+        if item_id == "2":
+            return {"usage": "N/A", "country": "N/A"}
+        return {"usage": "из API", "country": "Италия"}
+
+    pages = [[raw_product(1), raw_product(2)], [raw_product(3)]]
+    scraper = make_scraper(mocker, pages, api_details)
+    path = tmp_path / "out.csv"
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(path)),
+        workers=2,
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+    )
+
+    assert pipeline.run() == 3
+    rows = {row["Ссылка"]: row for row in read_rows(path)}
+    assert rows["https://goldapple.ru/1"]["Инструкция"] == "из API"
+    assert rows["https://goldapple.ru/2"]["Инструкция"] == "из браузера"
+    assert rows["https://goldapple.ru/2"]["Страна"] == "Франция"
+    assert scraper.fetch_product_details_async.await_count == 1
+
+
+def test_pipeline_limit_stops_catalog(mocker, fake_browser, tmp_path):
+    """Тест ограничения числа товаров без чтения лишних страниц."""
+    pages = [[raw_product(1), raw_product(2)], [raw_product(3)]]
+    scraper = make_scraper(mocker, pages, None)
+    path = tmp_path / "out.csv"
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(path)),
+        details="browser",
+        workers=1,
+        limit=1,
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+    )
+
+    assert pipeline.run() == 1
+    assert len(read_rows(path)) == 1
+    scraper.fetch_product_details_api.assert_not_called()
+
+
+def test_pipeline_resume_skips_journaled(mocker, fake_browser, tmp_path):
+    """Тест возобновления: товары из журнала не запрашиваются снова."""
+    journal = Journal(str(tmp_path / "journal.jsonl"))
+    journal.open()
+    journal.record(
+        {"id": "1", "link": "https://goldapple.ru/1", "usage": "старое"}
+    )
+    journal.close()
+
+    def api_details(item_id):
+        return {"usage": "из API", "country": "Италия"}
+
+    pages = [[raw_product(1), raw_product(2)]]
+    scraper = make_scraper(mocker, pages, api_details)
+    path = tmp_path / "out.csv"
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(path)),
+        journal=journal,
+        resume=True,
+    )
+
+    assert pipeline.run() == 1
+    scraper.fetch_product_details_api.assert_called_once_with("2")
+    rows = [row["Инструкция"] for row in read_rows(path)]
+    assert rows == ["старое", "из API"]
+    assert journal.load_keys() == {"1", "2"}
+
+
+def test_pipeline_takes_cookies_from_shared_browser(
+    mocker, fake_browser, tmp_path
+):
+    """Тест получения кук из общего браузера при отсутствии сессии."""
+    scraper = make_scraper(mocker, [], None)
+    scraper.headers_manager.has_cookies = False
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(tmp_path / "out.csv")),
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+    )
+
+    assert pipeline.run() == 0
+    fake_browser.refresh_session.assert_awaited_once()
+    scraper.headers_manager.set_cookies.assert_called_once_with({"sid": "1"})
+
+
+def test_pipeline_api_only_takes_cookies_without_session(
+    mocker, fake_browser, tmp_path
+):
+    """Тест: режим api-only берёт куки во временном браузере."""
+
+    def api_details(item_id):
+        return {"usage": "из API", "country": "Италия"}
+
+    scraper = make_scraper(mocker, [[raw_product(1)]], api_details)
+    scraper.headers_manager.has_cookies = False
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(tmp_path / "out.csv")),
+        details="api-only",
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+    )
+
+    assert pipeline.run() == 1
+    fake_browser.refresh_session.assert_awaited_once()
+    scraper.headers_manager.set_cookies.assert_called_once_with({"sid": "1"})
+    assert fake_browser.pages == []
+
+
+def test_pipeline_reuses_state_details(mocker, fake_browser, tmp_path):
+    """Тест инкрементального сбора: детали неизменных товаров из базы."""
+    state = ProductStateStore(str(tmp_path / "state.db"))
+    known = GoldParser.parse_product(raw_product(1))
+    known.update({"usage": "сохранено", "country": "Франция"})
+    state.update(known)
+
+    def api_details(item_id):
+        return {"usage": "из API", "country": "Италия"}
+
+    scraper = make_scraper(
+        mocker, [[raw_product(1), raw_product(2)]], api_details
+    )
+    path = tmp_path / "out.csv"
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(path)),
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+        state=state,
+    )
+
+    assert pipeline.run() == 2
+    scraper.fetch_product_details_api.assert_called_once_with("2")
+    rows = {row["Ссылка"]: row["Инструкция"] for row in read_rows(path)}
+    assert rows["https://goldapple.ru/1"] == "сохранено"
+    assert state.reuse_details(GoldParser.parse_product(raw_product(2)))
+    state.close()
+
+
+def test_pipeline_failed_details_not_marked_in_state(
+    mocker, fake_browser, tmp_path
+):
+    """Тест: товар, детали которого не получены, запросится снова."""
+    state = ProductStateStore(str(tmp_path / "state.db"))
+    scraper = make_scraper(
+        mocker,
+        [[raw_product(1), raw_product(2)]],
+        lambda item_id: {"usage": "N/A", "country": "N/A"},
+    )
+
+    async def browser_details(link, page):
+        if link.endswith("/2"):
+            raise RuntimeError("Target closed")
+        return {"usage": "N/A", "country": "N/A"}
+
+    scraper.fetch_product_details_async.side_effect = browser_details
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(tmp_path / "out.csv")),
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+        state=state,
+    )
+
+    assert pipeline.run() == 2
+    assert state.reuse_details(GoldParser.parse_product(raw_product(1)))
+    assert not state.reuse_details(GoldParser.parse_product(raw_product(2)))
+    state.close()
+
+
+def test_pipeline_skips_products_claimed_by_other_jobs(mocker, tmp_path):
+    """Тест: товар, взятый другим заданием, не запрашивается и не пишется."""
+    scraper = make_scraper(
+        mocker,
+        [[raw_product(1), raw_product(2)]],
+        lambda item_id: {"usage": "из API", "country": "Италия"},
+    )
+    scraper.city_id = "msk"
+    seen = SharedKeySet({"msk:1": "other-job"})
+    path = tmp_path / "out.csv"
+    pipeline = CrawlPipeline(
+        scraper,
+        GoldParser(),
+        CSVWriter(str(path)),
+        details="api-only",
+        journal=Journal(str(tmp_path / "journal.jsonl")),
+        seen=seen,
+        progress=False,
+    )
+
+    assert pipeline.run() == 1
+    assert [row["Ссылка"] for row in read_rows(path)] == [
+        "https://goldapple.ru/2"
+    ]
+    scraper.fetch_product_details_api.assert_called_once_with("2")
+    assert "msk:2" in seen.keys
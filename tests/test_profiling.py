@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pstats
+import threading
+
+from scraper.profiling import Profiler
+
+
+def fake_context(mocker):
+    context = mocker.MagicMock()
+    context.tracing.start_chunk = mocker.AsyncMock()
+    context.tracing.stop_chunk = mocker.AsyncMock()
+    return context
+
+
+def busy_work():
+    return sum(i * i for i in range(10000))
+
+
+def test_profile_covers_new_threads(tmp_path):
+    """Тест профиля основного потока и потоков, запущенных в контексте."""
+    with Profiler(str(tmp_path / "run")):
+        busy_work()
+        thread = threading.Thread(target=busy_work)
+        thread.start()
+        thread.join()
+
+    stats = pstats.Stats(str(tmp_path / "run" / "python.prof"))
+    calls = {name: values[0] for (_, _, name), values in stats.stats.items()}
+    assert calls["busy_work"] == 2
+    assert "busy_work" in (tmp_path / "run" / "python_top.txt").read_text(
+        encoding="utf-8"
+    )
+    assert (tmp_path / "run" / "metrics.json").exists()
+    assert threading.getprofile() is None
+
+
+def test_threads_run_under_profiler(tmp_path):
+    """Тест: потоки, запущенные при профилировании, выполняют свою цель."""
+    results = []
+
+    async def in_thread():
+        return await asyncio.to_thread(busy_work)
+
+    with Profiler(str(tmp_path / "run")):
+        thread = threading.Thread(target=lambda: results.append(busy_work()))
+        thread.start()
+        thread.join(5)
+        results.append(asyncio.run(in_thread()))
+
+    assert results == [busy_work(), busy_work()]
+
+
+def test_keep_reason():
+    """Тест выбора трасс: медленные всегда, остальные по выборке."""
+    profiler = Profiler("unused", sample_rate=0.0, slow_threshold=1.0)
+    assert profiler.keep_reason(1.5) == "slow"
+    assert profiler.keep_reason(0.1) is None
+    profiler.sample_rate = 1.0
+    assert profiler.keep_reason(0.1) == "sample"
+
+
+def test_trace_saves_slow_chunk(mocker, tmp_path):
+    """Тест сохранения порции трассы медленной страницы."""
+    profiler = Profiler(str(tmp_path), sample_rate=0.0, slow_threshold=0.01)
+    context = fake_context(mocker)
+
+    async def scenario():
+        async with profiler.trace(context, 0, "/fast"):
+            pass
+        async with profiler.trace(context, 1, "/slow"):
+            await asyncio.sleep(0.02)
+
+    asyncio.run(scenario())
+
+    assert context.tracing.start_chunk.await_count == 2
+    discarded, saved = context.tracing.stop_chunk.await_args_list
+    assert discarded.kwargs == {}
+    assert saved.kwargs["path"].endswith("slow-00000-w1.zip")
+    assert profiler.traces[0]["label"] == "/slow"
+    assert profiler.traces[0]["reason"] == "slow"
+    assert json.loads(json.dumps(profiler.traces)) == profiler.traces
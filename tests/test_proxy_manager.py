@@ -0,0 +1,188 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scraper.core.proxy_manager import ProxyManager, ProxyValidationCache
+
+
+def make_manager(proxies, **kwargs):
+    manager = ProxyManager(max_proxies=len(proxies), **kwargs)
+    manager.add_proxies(proxies)
+    return manager
+
+
+def test_get_proxy_prefers_fast_and_reliable(mocker):
+    """Тест выбора прокси с весом по задержке и доле успехов."""
+    manager = make_manager(["fast:1", "slow:1"])
+    manager.report("fast:1", True, 0.1)
+    manager.report("slow:1", True, 5.0)
+    choices = mocker.patch(
+        "scraper.core.proxy_manager.random.choices",
+        side_effect=lambda items, weights: [items[0]],
+    )
+    assert manager.get_proxy() == "fast:1"
+    candidates = choices.call_args.args[0]
+    weights = dict(zip(candidates, choices.call_args.kwargs["weights"]))
+    assert weights["fast:1"] > weights["slow:1"]
+
+
+def test_circuit_breaker_excludes_failing_proxy():
+    """Тест срабатывания предохранителя после ошибок подряд."""
+    manager = make_manager(["bad:1", "good:1"], failure_threshold=2)
+    manager.report("bad:1", False)
+    assert manager.healthy_proxies() == ["bad:1", "good:1"]
+    manager.report("bad:1", False)
+    assert manager.healthy_proxies() == ["good:1"]
+    assert all(manager.get_proxy() == "good:1" for _ in range(10))
+
+
+def test_success_resets_failure_streak():
+    """Тест сброса серии ошибок после успешного запроса."""
+    manager = make_manager(["p:1"], failure_threshold=2)
+    manager.report("p:1", False)
+    manager.report("p:1", True, 0.2)
+    manager.report("p:1", False)
+    assert manager.healthy_proxies() == ["p:1"]
+    assert manager.stats["p:1"].success_rate < 1.0
+
+
+def test_revalidate_restores_or_ejects(mocker):
+    """Тест фоновой перепроверки: живые возвращаются, мёртвые удаляются."""
+    manager = make_manager(
+        ["alive:1", "dead:1"], failure_threshold=1, cooldown=0
+    )
+    manager.report("alive:1", False)
+    manager.report("dead:1", False)
+    mocker.patch.object(
+        manager,
+        "validate_proxy",
+        side_effect=lambda proxy: proxy if proxy == "alive:1" else None,
+    )
+    fetch = mocker.patch.object(manager, "fetch_proxies")
+    manager.revalidate()
+    assert manager.proxies == ["alive:1"]
+    assert manager.healthy_proxies() == ["alive:1"]
+    fetch.assert_not_called()
+
+
+def test_revalidate_refills_small_pool(mocker):
+    """Тест пополнения пула, когда рабочих прокси меньше половины."""
+    manager = ProxyManager(max_proxies=4)
+    manager.add_proxies(["p:1"])
+    fetch = mocker.patch.object(manager, "fetch_proxies")
+    manager.revalidate()
+    fetch.assert_called_once()
+
+
+def test_refill_replaces_tripped_proxies(mocker):
+    """Тест пополнения пула, занятого отключёнными прокси до перепроверки."""
+    manager = make_manager(
+        ["bad:1", "bad:2", "bad:3", "good:1"],
+        failure_threshold=1,
+        cooldown=3600,
+    )
+    for proxy in ("bad:1", "bad:2", "bad:3"):
+        manager.report(proxy, False)
+    source = mocker.MagicMock(text="new:1\nnew:2\nnew:3\n")
+    mocker.patch(
+        "scraper.core.proxy_manager.requests.get", return_value=source
+    )
+    mocker.patch.object(
+        manager, "validate_proxy", side_effect=lambda proxy: proxy
+    )
+
+    manager.revalidate()
+
+    assert len(manager.proxies) == 4
+    assert sorted(manager.healthy_proxies()) == [
+        "good:1",
+        "new:1",
+        "new:2",
+        "new:3",
+    ]
+
+
+def test_validate_proxies_stops_early(mocker):
+    """Тест досрочного завершения проверки при наборе нужного числа."""
+    manager = ProxyManager(max_proxies=2, validation_workers=1)
+    checked = []
+
+    def validate(proxy):
+        checked.append(proxy)
+        time.sleep(0.01)
+        return proxy
+
+    mocker.patch.object(manager, "validate_proxy", side_effect=validate)
+    candidates = {f"p:{i}" for i in range(50)}
+    valid = manager.validate_proxies(candidates)
+    assert len(valid) == 2
+    assert len(checked) < len(candidates)
+
+
+def test_validation_cache_persists_results(tmp_path):
+    """Тест сохранения результатов проверки и их срока годности."""
+    path = str(tmp_path / "proxies.json")
+    cache = ProxyValidationCache(path, ttl=60)
+    cache.record("good:1", True)
+    cache.record("bad:1", False)
+    cache.save()
+
+    restored = ProxyValidationCache(path, ttl=60)
+    assert restored.known(ok=True) == ["good:1"]
+    assert restored.known(ok=False) == ["bad:1"]
+    assert ProxyValidationCache(path, ttl=-1).known() == []
+
+
+def test_validation_cache_save_is_atomic(mocker, tmp_path):
+    """Тест: параллельные сохранения не портят кеш, сбой не обрезает его."""
+    path = tmp_path / "proxies.json"
+    cache = ProxyValidationCache(str(path), ttl=60)
+
+    def save(index):
+        cache.record(f"p:{index}", True)
+        cache.save()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(save, range(40)))
+    assert len(ProxyValidationCache(str(path), ttl=60).known()) == 40
+    assert [item.name for item in tmp_path.iterdir()] == ["proxies.json"]
+
+    mocker.patch("scraper.core.proxy_manager.os.replace", side_effect=OSError)
+    cache.record("late:1", True)
+    with pytest.raises(OSError):
+        cache.save()
+    assert len(ProxyValidationCache(str(path), ttl=60).known()) == 40
+    assert sorted(item.name for item in tmp_path.iterdir()) == [
+        "proxies.json",
+        "proxies.json.tmp",
+    ]
+
+
+def test_fetch_proxies_reuses_cache(mocker, tmp_path):
+    """Тест: при достаточном числе проверенных прокси источники не нужны."""
+    cache = ProxyValidationCache(str(tmp_path / "proxies.json"))
+    cache.record("cached:1", True)
+    cache.record("cached:2", True)
+    get = mocker.patch("scraper.core.proxy_manager.requests.get")
+    manager = ProxyManager(max_proxies=2, cache=cache)
+    manager.fetch_proxies()
+    assert sorted(manager.proxies) == ["cached:1", "cached:2"]
+    get.assert_not_called()
+
+
+def test_fetch_proxies_skips_recent_failures(mocker, tmp_path):
+    """Тест: недавно не прошедшие проверку прокси не проверяются снова."""
+    cache = ProxyValidationCache(str(tmp_path / "proxies.json"))
+    cache.record("bad:1", False)
+    response = mocker.Mock(text="bad:1\nnew:1\n")
+    mocker.patch(
+        "scraper.core.proxy_manager.requests.get", return_value=response
+    )
+    manager = ProxyManager(max_proxies=2, cache=cache)
+    validate = mocker.patch.object(
+        manager, "validate_proxies", return_value=["new:1"]
+    )
+    manager.fetch_proxies()
+    assert validate.call_args.args == ({"new:1"}, 2)
+    assert manager.proxies == ["new:1"]
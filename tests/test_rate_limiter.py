@@ -0,0 +1,23 @@
+from scraper.core.rate_limiter import RateLimiter
+
+
+def test_rate_limiter_spaces_requests(mocker):
+    """Тест равномерного распределения запросов по времени."""
+    mocker.patch(
+        "scraper.core.rate_limiter.time.monotonic", return_value=100.0
+    )
+    sleep = mocker.patch("scraper.core.rate_limiter.time.sleep")
+    limiter = RateLimiter(rate=4)
+    for _ in range(3):
+        limiter.acquire()
+    waits = [call.args[0] for call in sleep.call_args_list]
+    assert waits == [0.25, 0.5]
+
+
+def test_rate_limiter_unlimited(mocker):
+    """Тест отключённого ограничения при нулевой частоте."""
+    sleep = mocker.patch("scraper.core.rate_limiter.time.sleep")
+    limiter = RateLimiter(rate=0)
+    limiter.acquire()
+    limiter.acquire()
+    sleep.assert_not_called()
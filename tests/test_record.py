@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from scraper.record import ProductRecord
+
+
+def test_record_has_no_dict():
+    """Тест компактности записи: поля только в слотах."""
+    record = ProductRecord("1", "http://a.com")
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = "x"
+
+
+def test_record_mapping_access():
+    """Тест доступа к записи как к словарю товара."""
+    record = ProductRecord("1", "http://a.com", "A", price=100)
+    assert record["price"] == 100
+    assert record["usage"] == "N/A"
+    assert record.get("country") == "N/A"
+    assert record.get("missing", "x") == "x"
+    assert "usage" in record
+    assert "get" not in record
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(KeyError):
+        record["missing"] = "x"
+
+
+def test_record_update():
+    """Тест обновления деталей записи, "N/A" хранится как None."""
+    record = ProductRecord("1", "http://a.com", usage="старое")
+    record.update({"usage": "N/A", "country": "Франция"})
+    assert record.usage is None
+    assert record.country == "Франция"
+    del record["country"]
+    assert record.country is None
+
+
+def test_record_dict_roundtrip():
+    """Тест преобразования записи в словарь и обратно."""
+    record = ProductRecord("1", "http://a.com", "A", 100, 4.5)
+    data = json.loads(json.dumps(dict(record)))
+    assert data == record.as_dict()
+    assert data["usage"] == "N/A"
+    assert ProductRecord.from_dict(data) == record
+    assert ProductRecord.from_dict(data).usage is None
@@ -34,3 +34,121 @@ def test_fetch_products(mocker):
     products = scraper.fetch_products()
     assert len(products) == 2
     assert products[0]["id"] == 1
+
+
+def test_fetch_product_details_api(mocker):
+    """Тест получения деталей через JSON карточки товара."""
+    mocker.patch("scraper.scraper.HeadersManager")
+    mocker.patch(
+        "scraper.scraper.HeadersManager.return_value"
+        ".get_headers_and_cookies",
+        return_value=({}, {}),
+    )
+    mock_fetch = mocker.patch.object(StandardScraper, "fetch")
+    mock_fetch.return_value = {
+        "data": {
+            "productDescription": [
+                {"text": "применение", "content": "Нанести"},
+            ]
+        }
+    }
+    scraper = GoldScraper(
+        strategy=StandardScraper(), category_id="test", city_id="city"
+    )
+    details = scraper.fetch_product_details_api("42")
+    assert details == {"usage": "Нанести", "country": "N/A"}
+    assert "itemId=42" in mock_fetch.call_args.args[0]
+    assert "cityId=city" in mock_fetch.call_args.args[0]
+    assert scraper.fetch_product_details_api("") == {
+        "usage": "N/A",
+        "country": "N/A",
+    }
+
+
+def make_paged_scraper(mocker, responses, max_pages=None):
+    """Создаёт GoldScraper, отдающий ответы по номеру страницы."""
+    mocker.patch("scraper.scraper.HeadersManager")
+    mocker.patch(
+        "scraper.scraper.HeadersManager.return_value"
+        ".get_headers_and_cookies",
+        return_value=({}, {}),
+    )
+    mocker.patch("scraper.scraper.time.sleep")
+
+    def fetch(url, headers, cookies):
+        page = int(url.split("pageNumber=")[1].split("&")[0])
+        queue = responses[page]
+        return queue.pop(0) if isinstance(queue, list) else queue
+
+    mocker.patch.object(StandardScraper, "fetch", side_effect=fetch)
+    return GoldScraper(
+        strategy=StandardScraper(),
+        category_id="test",
+        city_id="test",
+        max_pages=max_pages,
+        requests_per_second=0,
+    )
+
+
+def test_fetch_products_all_pages_in_order(mocker):
+    """Тест планирования страниц и сборки в порядке номеров."""
+    responses = {
+        1: {"data": {"count": 5, "products": [{"id": 1}, {"id": 2}]}},
+        2: [None, {"data": {"products": [{"id": 3}, {"id": 4}]}}],
+        3: {"data": {"products": [{"id": 5}]}},
+    }
+    scraper = make_paged_scraper(mocker, responses)
+    products = scraper.fetch_products()
+    assert [p["id"] for p in products] == [1, 2, 3, 4, 5]
+
+
+def test_fetch_products_skips_failed_page(mocker):
+    """Тест: неудачная страница не обрезает остальной каталог."""
+    responses = {
+        1: {"data": {"count": 6, "products": [{"id": 1}, {"id": 2}]}},
+        2: None,
+        3: {"data": {"products": [{"id": 5}, {"id": 6}]}},
+    }
+    scraper = make_paged_scraper(mocker, responses)
+    products = scraper.fetch_products()
+    assert [p["id"] for p in products] == [1, 2, 5, 6]
+
+
+def test_fetch_products_respects_max_pages(mocker):
+    """Тест ограничения числа страниц и обхода без общего счётчика."""
+    responses = {
+        1: {"data": {"products": [{"id": 1}]}},
+        2: {"data": {"products": [{"id": 2}]}},
+        3: {"data": {"products": [{"id": 3}]}},
+    }
+    scraper = make_paged_scraper(mocker, responses, max_pages=2)
+    assert [p["id"] for p in scraper.fetch_products()] == [1, 2]
+
+
+def test_fetch_products_drops_shifted_duplicates(mocker):
+    """Тест: товар, сдвинувшийся на следующую страницу, выдаётся один раз."""
+    responses = {
+        1: {"data": {"count": 6, "products": [{"itemId": 1}, {"itemId": 2}]}},
+        2: {"data": {"products": [{"itemId": 2}, {"itemId": 3}]}},
+        3: {"data": {"products": [{"itemId": 4}, {"itemId": 1}]}},
+    }
+    scraper = make_paged_scraper(mocker, responses)
+    products = scraper.fetch_products()
+    assert [p["itemId"] for p in products] == [1, 2, 3, 4]
+    assert scraper.duplicates == 2
+
+
+def test_iter_pages_stop_early(mocker):
+    """Тест остановки обхода на странице только из известных товаров."""
+    responses = {
+        1: {"data": {"products": [{"itemId": 1}, {"itemId": 2}]}},
+        2: {"data": {"products": [{"itemId": 2}, {"itemId": 1}]}},
+        3: {"data": {"products": [{"itemId": 3}]}},
+        4: {"data": {"products": []}},
+    }
+    scraper = make_paged_scraper(mocker, responses)
+    scraper.stop_early = True
+    assert [p["itemId"] for p in scraper.fetch_products()] == [1, 2]
+
+    scraper.stop_early = False
+    assert [p["itemId"] for p in scraper.fetch_products()] == [1, 2, 3]
@@ -0,0 +1,57 @@
+import json
+import time
+
+from scraper.core.headers_manager import HeadersManager
+from scraper.core.session import SessionStore
+
+
+def cookie(name, value, expires=-1):
+    return {"name": name, "value": value, "expires": expires}
+
+
+def test_save_and_load(tmp_path):
+    """Тест сохранения и чтения действующей сессии."""
+    store = SessionStore(str(tmp_path / "state.json"))
+    store.save({"cookies": [cookie("a", "1")], "origins": []})
+    assert store.load() == {"cookies": [cookie("a", "1")], "origins": []}
+    assert store.cookies() == {"a": "1"}
+
+
+def test_expired_session_and_cookies(tmp_path):
+    """Тест устаревшей сессии и истёкших кук."""
+    path = tmp_path / "state.json"
+    store = SessionStore(str(path), ttl=60)
+    state = {
+        "cookies": [cookie("old", "1", time.time() - 10)],
+        "saved_at": time.time(),
+    }
+    path.write_text(json.dumps(state), "utf-8")
+    assert store.load() is None
+
+    state["cookies"].append(cookie("new", "2", time.time() + 100))
+    state["saved_at"] = time.time() - 120
+    path.write_text(json.dumps(state), "utf-8")
+    assert store.load() is None
+
+
+def test_headers_manager_uses_saved_session(mocker, tmp_path):
+    """Тест: при действующей сессии отдельный браузер не запускается."""
+    get_cookies = mocker.patch("scraper.core.headers_manager.get_cookies")
+    store = SessionStore(str(tmp_path / "state.json"))
+    store.save({"cookies": [cookie("sid", "42")], "origins": []})
+
+    manager = HeadersManager(session_store=store)
+    assert manager.cookies == {"sid": "42"}
+    get_cookies.assert_not_called()
+
+
+def test_headers_manager_without_browser(mocker, tmp_path):
+    """Тест отложенного получения кук из общего браузера."""
+    get_cookies = mocker.patch("scraper.core.headers_manager.get_cookies")
+    store = SessionStore(str(tmp_path / "state.json"))
+
+    manager = HeadersManager(session_store=store, launch_browser=False)
+    assert not manager.has_cookies
+    manager.set_cookies({"sid": "1"})
+    assert manager.has_cookies
+    get_cookies.assert_not_called()
@@ -0,0 +1,134 @@
+import asyncio
+import csv
+
+from scraper.core.metrics import metrics
+from scraper.details import DetailCrawler
+from scraper.record import ProductRecord
+from scraper.snapshots import (
+    SnapshotExtractor,
+    SnapshotStore,
+    capture_snapshot,
+    extract_snapshot,
+)
+from scraper.utils.writer import CSVWriter
+
+HTML = (
+    '<section data-snapshot-tab="Применение">Наносить утром</section>'
+    '<section data-snapshot-tab="Дополнительная информация">'
+    "<div>страна происхождения</div><div>Италия</div></section>"
+)
+
+
+def test_store_roundtrip(tmp_path):
+    """Тест сохранения и чтения сжатого снимка."""
+    product = ProductRecord(id="7", link="/p7", name="P7", price=100)
+    with SnapshotStore(str(tmp_path / "snapshots.sqlite3")) as store:
+        blob = SnapshotStore.compress(HTML * 20)
+        store.put(product, blob, len(HTML * 20))
+        store.put(product, blob, len(HTML * 20))
+
+        assert len(blob) < len((HTML * 20).encode("utf-8"))
+        assert len(store) == 1
+        assert store.get("7") == HTML * 20
+        assert store.get("8") is None
+        [(record, stored)] = list(store.iter_snapshots())
+        assert record["price"] == 100
+        assert stored == blob
+
+
+def test_pool_functions():
+    """Тест функций процесса пула: извлечение и сжатие снимка."""
+    details, blob, elapsed = capture_snapshot(HTML)
+    assert details == {"country": "Италия", "usage": "Наносить утром"}
+    assert elapsed >= 0
+    assert extract_snapshot(blob) == details
+
+
+def test_reextract_writes_products(tmp_path):
+    """Тест повторного извлечения из базы снимков в пуле процессов."""
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    for index in range(3):
+        product = ProductRecord(id=str(index), link=f"/p{index}")
+        store.put(product, SnapshotStore.compress(HTML), len(HTML))
+    path = tmp_path / "out.csv"
+
+    with SnapshotExtractor(store, processes=1) as snapshots:
+        assert snapshots.reextract(CSVWriter(str(path)), batch_size=2) == 3
+
+    with open(path, encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["Ссылка"] for row in rows] == ["/p0", "/p1", "/p2"]
+    assert {row["Страна"] for row in rows} == {"Италия"}
+
+
+def test_reextract_skips_corrupt_snapshot(tmp_path):
+    """Тест: повреждённый снимок не прерывает повторное извлечение."""
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    for index in range(3):
+        product = ProductRecord(
+            id=str(index), link=f"/p{index}", usage="из API"
+        )
+        blob = b"not zlib" if index == 1 else SnapshotStore.compress(HTML)
+        store.put(product, blob, len(HTML))
+    path = tmp_path / "out.csv"
+    metrics.reset()
+
+    with SnapshotExtractor(store, processes=1) as snapshots:
+        assert snapshots.reextract(CSVWriter(str(path)), batch_size=3) == 3
+        assert snapshots.errors == 1
+
+    with open(path, encoding="utf-8") as file:
+        rows = {row["Ссылка"]: row for row in csv.DictReader(file)}
+    assert rows["/p0"]["Страна"] == rows["/p2"]["Страна"] == "Италия"
+    assert rows["/p1"]["Страна"] == "N/A"
+    assert rows["/p1"]["Инструкция"] == "из API"
+    assert metrics.summary()["errors"] == {"snapshot:error": 1}
+
+
+def test_crawler_snapshot_mode(mocker, fake_browser, tmp_path):
+    """Тест стадии деталей, которая только снимает страницы."""
+    scraper = mocker.MagicMock()
+
+    async def capture(link, page):
+        if link == "/bad":
+            raise RuntimeError("Target closed")
+        return HTML
+
+    scraper.capture_product_html_async = mocker.AsyncMock(side_effect=capture)
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    products = [
+        {"id": "1", "link": "/p1"},
+        {"id": "2", "link": "/bad", "usage": "N/A"},
+        {"id": "3", "link": "/p3", "usage": "из API"},
+    ]
+
+    with SnapshotExtractor(store, processes=1, max_pending=1) as snapshots:
+        crawler = DetailCrawler(scraper, workers=2, snapshots=snapshots)
+        crawler.crawl(products)
+        assert len(store) == 2
+    assert crawler.errors == 1
+
+    scraper.fetch_product_details_async.assert_not_called()
+    assert products[0]["country"] == "Италия"
+    assert products[1]["usage"] == "N/A"
+    assert products[2]["usage"] == "Наносить утром"
+
+
+def test_join_raises_callback_error(mocker, tmp_path):
+    """Тест проброса ошибки обработчика готового товара из join."""
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+
+    def on_done(details):
+        raise ValueError("writer")
+
+    async def scenario():
+        await snapshots.submit({"id": "1", "link": "/p1"}, HTML, on_done)
+        await snapshots.join()
+
+    with SnapshotExtractor(store, processes=1) as snapshots:
+        try:
+            asyncio.run(scenario())
+        except ValueError as err_msg:
+            assert str(err_msg) == "writer"
+        else:
+            raise AssertionError("ошибка не проброшена")
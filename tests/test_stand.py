@@ -0,0 +1,39 @@
+from benchmarks.stand import StandServer
+
+from scraper.core.strategies import StandardScraper
+from scraper.parser import GoldParser
+
+
+def test_stand_serves_catalog_and_cards():
+    """Тест стенда: каталог с числом товаров и карточка товара."""
+    with StandServer(products=30, latency=0) as stand:
+        scraper = StandardScraper()
+        page = scraper.fetch(
+            f"{stand.url}/front/api/catalog/products?pageNumber=2", {}, {}
+        )
+        assert page["data"]["count"] == 30
+        assert len(page["data"]["products"]) == 6
+
+        item_id = page["data"]["products"][0]["itemId"]
+        card = scraper.fetch(
+            f"{stand.url}/front/api/catalog/product-card/base"
+            f"?itemId={item_id}",
+            {},
+            {},
+        )
+        details = GoldParser.parse_product_card(card)
+        assert details["country"] in ("Франция", "Италия", "Испания", "ОАЭ")
+        assert details["usage"].startswith("Нанести")
+
+
+def test_stand_errors_and_product_html():
+    """Тест ошибок стенда и HTML-страницы товара с вкладками."""
+    with StandServer(products=5, latency=0, error_rate=1.0) as stand:
+        assert (
+            StandardScraper().request(f"{stand.url}/19000001", {}, {}) is None
+        )
+
+    with StandServer(products=5, latency=0) as stand:
+        status, _, body = stand.respond("/19000001-stand-product-1")
+    assert status == 200
+    assert b"ga-tabs-tab" in body and b"kDcPG" in body
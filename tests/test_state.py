@@ -0,0 +1,67 @@
+import time
+
+from scraper.utils.state import ProductStateStore
+
+
+def product(**fields):
+    base = {
+        "id": "1",
+        "link": "https://goldapple.ru/1",
+        "name": "Духи",
+        "description": "парфюмерная вода",
+        "price": "1000",
+        "rating": "4.5",
+        "usage": "N/A",
+        "country": "N/A",
+    }
+    base.update(fields)
+    return base
+
+
+def test_new_product_needs_details(tmp_path):
+    """Тест: новый товар требует запроса деталей."""
+    with ProductStateStore(str(tmp_path / "state.db")) as state:
+        assert not state.reuse_details(product())
+
+
+def test_unchanged_product_reuses_details(tmp_path):
+    """Тест: изменение цены и рейтинга не требует новых деталей."""
+    with ProductStateStore(str(tmp_path / "state.db")) as state:
+        state.update(product(usage="Нанести", country="Франция"))
+        fresh = product(price="900", rating="4.9")
+        assert state.reuse_details(fresh)
+        assert fresh["usage"] == "Нанести"
+        assert fresh["country"] == "Франция"
+        assert state.reused == 1
+
+
+def test_changed_or_failed_product_refetched(tmp_path):
+    """Тест: изменённый товар и товар без полученных деталей запрашиваются."""
+    with ProductStateStore(str(tmp_path / "state.db")) as state:
+        state.update(product(usage="Нанести", country="Франция"))
+        assert not state.reuse_details(product(name="Новое имя"))
+        state.update(product(name="Новое имя"), False)
+        assert not state.reuse_details(product(name="Новое имя"))
+        state.update(product(id="2"), False)
+        assert not state.reuse_details(product(id="2"))
+
+
+def test_product_without_details_on_site_reused(tmp_path):
+    """Тест: товар с полученными деталями "N/A" берётся из состояния."""
+    with ProductStateStore(str(tmp_path / "state.db")) as state:
+        state.update(product(usage="Нанести"))
+        fresh = product(price="900")
+        assert state.reuse_details(fresh)
+        assert fresh["usage"] == "Нанести"
+        assert fresh["country"] == "N/A"
+
+
+def test_stale_details_refetched(mocker, tmp_path):
+    """Тест устаревания деталей по max_age и сохранения даты."""
+    path = str(tmp_path / "state.db")
+    with ProductStateStore(path, max_age_days=1) as state:
+        state.update(product(usage="Нанести", country="Франция"))
+        later = time.time() + 2 * 24 * 60 * 60
+        mocker.patch("scraper.utils.state.time.time", return_value=later)
+        state.update(product(usage="Нанести", country="Франция"), False)
+        assert not state.reuse_details(product())
@@ -1,6 +1,15 @@
 import os
+import sqlite3
 
-from scraper.utils.writer import CSVWriter
+import pytest
+
+from scraper.utils.writer import (
+    BaseWriter,
+    CSVWriter,
+    ParquetWriter,
+    SQLiteWriter,
+    build_writer,
+)
 
 
 def test_writer_init():
@@ -48,3 +57,121 @@ def test_write(tmp_path):
     assert "100" in content
     assert "N/A" in content
     assert not os.path.exists("products_temp.json")
+
+
+def test_streaming_append(tmp_path):
+    """Тест построчной записи в открытый CSV."""
+    path = tmp_path / "stream.csv"
+    writer = CSVWriter(filename=str(path))
+    with writer:
+        writer.append({"link": "http://a.com", "name": "A"})
+        with open(path, "r", encoding="UTF-8") as f:
+            assert "http://a.com" in f.read()
+        writer.append({"link": "http://b.com"})
+
+    with open(path, "r", encoding="UTF-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith("Ссылка")
+
+
+def test_build_writer():
+    """Тест выбора вывода по формату."""
+    assert isinstance(build_writer("csv"), CSVWriter)
+    writer = build_writer("parquet", compression="snappy")
+    assert isinstance(writer, ParquetWriter)
+    assert isinstance(writer, BaseWriter)
+    assert writer.compression == "snappy"
+    assert isinstance(build_writer("sqlite"), SQLiteWriter)
+    with pytest.raises(ValueError):
+        build_writer("xlsx")
+
+
+def test_parquet_convert():
+    """Тест приведения значений к типам колонок Parquet."""
+    assert ParquetWriter.convert("price", "1 990") == 1990
+    assert ParquetWriter.convert("price", 1990.0) == 1990
+    assert ParquetWriter.convert("price", "N/A") is None
+    assert ParquetWriter.convert("rating", "4,5") == 4.5
+    assert ParquetWriter.convert("rating", "нет") is None
+    assert ParquetWriter.convert("country", "N/A") is None
+    assert ParquetWriter.convert("name", 12) == "12"
+
+
+def test_parquet_row_groups(tmp_path):
+    """Тест записи Parquet группами строк с типизированной схемой."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "products.parquet"
+    with ParquetWriter(str(path), row_group_size=2) as writer:
+        for index in range(5):
+            writer.append(
+                {
+                    "id": str(index),
+                    "link": f"http://test.com/{index}",
+                    "name": f"Товар {index}",
+                    "price": str(100 * index),
+                    "rating": "N/A" if index == 0 else "4.5",
+                    "country": "N/A",
+                }
+            )
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert str(table.schema.field("price").type) == "int64"
+    assert str(table.schema.field("rating").type) == "double"
+    assert table.column("price").to_pylist() == [0, 100, 200, 300, 400]
+    assert table.column("rating").to_pylist()[:2] == [None, 4.5]
+    assert table.column("country").null_count == 5
+    assert table.column("usage").null_count == 5
+
+
+def test_parquet_append_closed():
+    """Тест записи в неоткрытый ParquetWriter."""
+    with pytest.raises(RuntimeError):
+        ParquetWriter().append({"id": "1"})
+
+
+def test_sqlite_upsert_and_history(tmp_path):
+    """Тест upsert товаров и истории цен только при изменении."""
+    path = str(tmp_path / "products.sqlite3")
+    product = {"id": "1", "link": "http://a.com", "name": "Товар"}
+
+    with SQLiteWriter(path, batch_size=1) as writer:
+        writer.append({**product, "price": "100", "rating": "4.5"})
+        writer.append({**product, "price": "100", "rating": "4.5"})
+        writer.append({"link": "http://b.com", "price": "N/A"})
+    assert writer.history_rows == 2
+
+    with SQLiteWriter(path) as writer:
+        writer.append({**product, "price": "90", "rating": "4.5"})
+        writer.append({**product, "price": "80", "rating": "4.5"})
+    assert writer.history_rows == 1
+
+    connection = sqlite3.connect(path)
+    rows = connection.execute(
+        "SELECT id, name, price, rating FROM products ORDER BY id"
+    ).fetchall()
+    history = connection.execute(
+        "SELECT id, price FROM price_history ORDER BY recorded_at"
+    ).fetchall()
+    indexes = {
+        row[0]
+        for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    connection.close()
+
+    assert rows == [
+        ("1", "Товар", 80, 4.5),
+        ("http://b.com", None, None, None),
+    ]
+    assert history == [("1", 100), ("http://b.com", None), ("1", 80)]
+    assert {"idx_price_history_id", "idx_price_history_recorded_at"} <= indexes
+
+
+def test_sqlite_append_closed():
+    """Тест записи в неоткрытый SQLiteWriter."""
+    with pytest.raises(RuntimeError):
+        SQLiteWriter().append({"id": "1"})